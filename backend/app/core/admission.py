@@ -0,0 +1,210 @@
+"""Admission control for requests to a rate-limited remote API.
+
+Requests are admitted while fewer than ``max_in_flight`` are running and the
+request and token budgets per minute allow it. Others wait in a bounded
+queue, most urgent first; when the queue is full, or a request waits too
+long, it is rejected at once so the caller can degrade instead of piling up.
+A waiting request's ``Priority`` may change, for example when nobody waits
+for its answer any more.
+"""
+
+import asyncio
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted in time."""
+
+
+class Priority:
+    """Admission priority of requests, which may change while they wait.
+
+    Args:
+        value: Queue position; lower values are admitted first
+    """
+
+    def __init__(self, value: int = 0):
+        self.value = value
+
+
+class SharedPriority(Priority):
+    """The most urgent of several priorities, for a request serving them all."""
+
+    def __init__(self, priorities: Iterable[Priority]):
+        self.priorities = list(priorities)
+
+    @property
+    def value(self) -> int:
+        """The most urgent of the shared priorities."""
+        return min(priority.value for priority in self.priorities)
+
+
+class TokenBucket:
+    """Budget refilled continuously at ``per_minute`` units per minute.
+
+    Args:
+        per_minute: Refill rate; 0 means unlimited
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self._clock = clock
+        self._level = per_minute
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._level = min(
+            self.capacity, self._level + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Return the seconds until ``amount`` units are available."""
+        if not self.capacity:
+            return 0.0
+        self._refill()
+        # A request larger than the bucket waits for a full bucket
+        missing = min(amount, self.capacity) - self._level
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        """Spend ``amount`` units; call once ``wait_time`` is zero."""
+        if self.capacity:
+            self._refill()
+            self._level -= min(amount, self.capacity)
+
+
+class AdmissionController:
+    """Concurrency limit, rate limits and a priority queue for outbound calls.
+
+    Args:
+        max_in_flight: Requests running at once
+        requests_per_minute: Request budget; 0 means unlimited
+        tokens_per_minute: Token budget; 0 means unlimited
+        max_queue: Requests allowed to wait; more are rejected
+        queue_timeout: Seconds a request may wait before being rejected
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 8,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_queue: int = 64,
+        queue_timeout: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.requests = TokenBucket(requests_per_minute, clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock)
+        self.in_flight = 0
+        self.rejected = 0
+        # (priority, arrival, tokens, future): lowest priority value first.
+        # Priorities can change, so the most urgent waiter is found on dispatch
+        self._queue: List[Tuple[Priority, int, float, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for admission."""
+        return sum(not waiter[3].done() for waiter in self._queue)
+
+    @asynccontextmanager
+    async def admit(
+        self, tokens: float, priority: Union[int, Priority] = 0
+    ) -> AsyncIterator[None]:
+        """Hold an admission for the duration of the block.
+
+        Args:
+            tokens: Estimated tokens the request consumes
+            priority: Queue position; lower values are admitted first. A
+                ``Priority`` changed while the request waits takes effect
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait times out
+        """
+        await self._acquire(tokens, priority)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._dispatch()
+
+    async def _acquire(self, tokens: float, priority: Union[int, Priority]) -> None:
+        if not self._queue and self._ready(tokens):
+            self._start(tokens)
+            return
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected("Outbound request queue is full")
+
+        if not isinstance(priority, Priority):
+            priority = Priority(priority)
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((priority, next(self._arrivals), tokens, future))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if not future.done():
+                future.cancel()
+                self.rejected += 1
+                raise AdmissionRejected("Timed out waiting for admission") from None
+        except asyncio.CancelledError:
+            if not future.cancel():
+                # Admitted just as the caller gave up: hand the slot on
+                self.in_flight -= 1
+                self._dispatch()
+            raise
+
+    def _ready(self, tokens: float) -> bool:
+        return (
+            self.in_flight < self.max_in_flight
+            and self.requests.wait_time(1) == 0
+            and self.tokens.wait_time(tokens) == 0
+        )
+
+    def _start(self, tokens: float) -> None:
+        self.in_flight += 1
+        self.requests.take(1)
+        self.tokens.take(tokens)
+
+    def _dispatch(self) -> None:
+        """Admit queued requests in order while capacity allows."""
+        self._queue = [waiter for waiter in self._queue if not waiter[3].done()]
+        while self._queue and self.in_flight < self.max_in_flight:
+            waiter = min(self._queue, key=lambda w: (w[0].value, w[1]))
+            _, _, tokens, future = waiter
+            wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+            if wait > 0:
+                # Come back once the budget has refilled
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(
+                        wait, self._on_timer
+                    )
+                return
+            self._queue.remove(waiter)
+            self._start(tokens)
+            future.set_result(None)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def stats(self) -> Dict[str, int]:
+        """Return the running, queued and rejected request counts."""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "rejected": self.rejected,
+        }
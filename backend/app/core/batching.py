@@ -0,0 +1,95 @@
+"""Micro-batching of concurrent calls.
+
+Items submitted within a short window of each other are handed to one call
+of a batch handler, and each caller gets its own entry of the results. A
+remote API charged per request and per token can then be called once for a
+burst of requests, sharing whatever parts of them are common.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collects concurrent submissions into batches for one handler call.
+
+    A batch is handed over ``window`` seconds after its first item arrives,
+    or as soon as it holds ``max_size`` items.
+
+    Args:
+        handler: Called with the items of a batch; returns one result per
+            item, in order
+        window: Seconds a batch stays open for more items
+        max_size: Most items in one batch
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[T]], Awaitable[List[R]]],
+        window: float,
+        max_size: int,
+    ):
+        self.handler = handler
+        self.window = window
+        self.max_size = max_size
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Future] = set()
+
+    async def submit(self, item: T) -> R:
+        """Return the result for ``item``, computed as part of a batch.
+
+        Raises:
+            Exception: Whatever the handler raised for the batch
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        # A caller that gives up leaves the rest of its batch running
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch = [(item, future) for item, future in self._pending if not future.done()]
+        self._pending = []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await self.handler([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled, for example at shutdown
+            for _, future in batch:
+                future.cancel()
+            raise
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def close(self) -> None:
+        """Cancel the open batch and the batches being handled."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for _, future in self._pending:
+            future.cancel()
+        self._pending = []
+        for task in list(self._running):
+            task.cancel()
@@ -14,6 +14,34 @@ class Settings(BaseSettings):
 
     # External Services
     GROQ_API_KEY: str = ""
+    # Connection pool of the shared Groq client
+    GROQ_MAX_CONNECTIONS: int = 20
+    GROQ_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    # Seconds an idle pooled connection is kept open
+    GROQ_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    # Negotiate HTTP/2 with Groq; requires the optional h2 package
+    GROQ_HTTP2: bool = False
+    GROQ_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    # Bounds of the read timeout, which follows observed Groq latencies
+    GROQ_READ_TIMEOUT_SECONDS: float = 30.0
+    GROQ_MIN_READ_TIMEOUT_SECONDS: float = 2.0
+    # Read timeout = multiplier * this percentile of recent latencies
+    GROQ_TIMEOUT_PERCENTILE: float = 99.0
+    GROQ_TIMEOUT_MULTIPLIER: float = 2.0
+    # Consecutive failures (timeouts included) that open the circuit breaker
+    GROQ_BREAKER_FAILURES: int = 5
+    # Seconds the breaker stays open before letting probe requests through
+    GROQ_BREAKER_RESET_SECONDS: float = 30.0
+    GROQ_BREAKER_HALF_OPEN_CALLS: int = 1
+    # Groq requests running at once across all searches
+    GROQ_MAX_IN_FLIGHT: int = 8
+    # Plan rate limits of the Groq model; 0 disables a limit
+    GROQ_REQUESTS_PER_MINUTE: int = 30
+    GROQ_TOKENS_PER_MINUTE: int = 6000
+    # Groq requests allowed to wait for admission, and for how long, before
+    # searches fall back to local ranking
+    GROQ_MAX_QUEUE: int = 32
+    GROQ_QUEUE_TIMEOUT_SECONDS: float = 5.0
 
     # Backend API Keys
     BACKEND_API_KEY: str = (
@@ -21,6 +49,66 @@ class Settings(BaseSettings):
     )
     BACKEND_API_URL: str = "http://localhost:8000"
 
+    # Profile Storage
+    # Storage backend for profiles: "json" or "sqlite"
+    PROFILE_STORE_BACKEND: str = "json"
+    # Directory holding the profile data files; defaults to backend/data
+    PROFILE_DATA_DIR: str = ""
+    # Size in bytes at which the profile mutation log is folded into the snapshot
+    PROFILE_LOG_COMPACT_BYTES: int = 1_048_576
+    # Group commit: flush queued profile writes every N records or after a delay
+    PROFILE_WRITE_BATCH_SIZE: int = 256
+    PROFILE_WRITE_BATCH_DELAY_MS: float = 2.0
+    # Number of records committed per store write during bulk imports
+    PROFILE_IMPORT_BATCH_SIZE: int = 5000
+    # Number of individual profile responses kept pre-serialized
+    PROFILE_RESPONSE_CACHE_SIZE: int = 1024
+
+    # Search
+    # Fold plurals and -ing/-ed forms together in the lexical index
+    LEXICAL_STEMMING: bool = True
+    # Maximum number of matches returned by local (lexical or vector) search
+    LOCAL_SEARCH_LIMIT: int = 100
+    # Size of the latent space of the local vector search
+    VECTOR_DIMENSIONS: int = 128
+    # Minimum cosine similarity for a vector search match
+    VECTOR_MIN_SIMILARITY: float = 0.1
+    # Vector search turns approximate (IVF) once this many profiles are indexed
+    VECTOR_ANN_MIN_PROFILES: int = 50000
+    # Number of IVF lists; 0 scales them with the corpus (4 * sqrt(profiles))
+    VECTOR_ANN_LISTS: int = 0
+    # IVF lists probed per query: more raises recall and latency
+    VECTOR_ANN_NPROBE: int = 16
+    # Compress stored vectors: "none", "int8" (4x smaller) or "pq" (16x smaller)
+    VECTOR_QUANTIZATION: str = "none"
+    # Bytes per vector with product quantization
+    VECTOR_PQ_SUBSPACES: int = 32
+    # With quantization, re-score this many times the result limit exactly
+    VECTOR_RERANK_FACTOR: int = 2
+    # Profiles pre-selected locally and sent to Groq for re-ranking
+    SEMANTIC_CANDIDATES: int = 30
+    # Upper bound on the candidates a request may ask for
+    SEMANTIC_MAX_CANDIDATES: int = 100
+    # Local retriever picking the candidates: "lexical", "vector" or "hybrid"
+    SEMANTIC_RETRIEVER: str = "hybrid"
+    # Estimated profile tokens per LLM prompt; larger shortlists are chunked
+    LLM_CHUNK_TOKENS: int = 4000
+    # Chunks scored by Groq at the same time
+    LLM_MAX_CONCURRENCY: int = 4
+    # Milliseconds concurrent searches wait to share one Groq prompt;
+    # 0 disables batching
+    LLM_BATCH_WINDOW_MS: float = 0
+    # Most searches combined into one Groq prompt
+    LLM_BATCH_MAX_QUERIES: int = 8
+    # Largest latency budget a search request may ask for with deadline_ms
+    SEARCH_MAX_DEADLINE_MS: int = 60000
+    # LLM search results cached in memory, and how long they stay valid
+    SEARCH_CACHE_SIZE: int = 1024
+    SEARCH_CACHE_TTL_SECONDS: float = 3600.0
+    # Second cache tier on disk, surviving restarts; 0 entries disables it
+    SEARCH_CACHE_DISK_ENTRIES: int = 100_000
+    SEARCH_CACHE_DISK_TTL_SECONDS: float = 86400.0
+
     class Config:
         """Pydantic configuration."""
 
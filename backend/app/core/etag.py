@@ -0,0 +1,62 @@
+"""Entity tags for conditional GET requests.
+
+Tags are validators built from whatever identifies a representation, such
+as a store generation or a profile's ``updated_at``. They are strong unless
+the representation may differ between two responses under the same tag, in
+which case they are weak. Matching requests are answered with
+``304 Not Modified`` and an empty body.
+"""
+
+import hashlib
+from typing import Dict, Optional
+
+from fastapi import Response, status
+
+
+def make_etag(*parts: object, weak: bool = False) -> str:
+    """Build a quoted ETag from the parts identifying a representation.
+
+    Args:
+        *parts: Values identifying the representation
+        weak: Mark the tag ``W/``, for representations that are only
+            equivalent, not byte-identical, under the same parts
+
+    Returns:
+        The quoted tag
+    """
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=12
+    )
+    return f'{"W/" if weak else ""}"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True if an ``If-None-Match`` header matches ``etag``.
+
+    ``If-None-Match`` uses weak comparison, so a ``W/`` prefix is ignored on
+    either tag.
+    """
+    if not if_none_match:
+        return False
+    etag = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """Headers that make clients revalidate ``etag`` before reusing a response."""
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    """Build the ``304 Not Modified`` response for ``etag``."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag)
+    )
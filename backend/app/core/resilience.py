@@ -0,0 +1,148 @@
+"""Protection against a slow or failing remote dependency.
+
+``CircuitBreaker`` stops calls to a dependency after consecutive failures, so
+callers fail fast instead of each waiting for a timeout, and lets a few probe
+calls through once a cool-down has passed to detect recovery.
+
+``AdaptiveTimeout`` derives a timeout from the latencies observed recently,
+so a call that takes far longer than usual is abandoned, and counted as a
+failure, long before a fixed worst-case timeout would expire.
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from typing import Callable, Deque
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Closed, open and half-open states around calls to one dependency.
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds the circuit stays open before probing
+        half_open_calls: Probe calls allowed at once while half-open
+        clock: Monotonic clock, replaceable in tests
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """The current state; an open circuit turns half-open after a while."""
+        if (
+            self._state == self.OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may be made now.
+
+        Every allowed call must be followed by ``record_success``,
+        ``record_failure`` or, if it was abandoned, ``release``.
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and self._probes < self.half_open_calls:
+            self._probes += 1
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful call, closing a half-open circuit."""
+        if self._state == self.HALF_OPEN:
+            logger.info("Circuit closed: dependency recovered")
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probes = 0
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if it is one too many."""
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != self.OPEN:
+                logger.warning(
+                    "Circuit opened after %d consecutive failures", self._failures
+                )
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+            self._probes = 0
+
+    def release(self) -> None:
+        """Give back an allowed call that ended without an outcome."""
+        if self._state == self.HALF_OPEN and self._probes:
+            self._probes -= 1
+
+
+class AdaptiveTimeout:
+    """A timeout following a high percentile of recent latencies.
+
+    Until ``min_samples`` latencies are observed, ``maximum`` is used.
+
+    Args:
+        minimum: Lower bound of the timeout, in seconds
+        maximum: Upper bound of the timeout, in seconds
+        percentile: Percentile of recent latencies the timeout follows
+        multiplier: Headroom applied to that percentile
+        window: Number of recent latencies kept
+        min_samples: Latencies needed before the timeout adapts
+    """
+
+    def __init__(
+        self,
+        minimum: float = 2.0,
+        maximum: float = 30.0,
+        percentile: float = 99.0,
+        multiplier: float = 2.0,
+        window: int = 200,
+        min_samples: int = 20,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+
+    def observe(self, latency: float) -> None:
+        """Record the latency of a successful call, in seconds."""
+        self._latencies.append(latency)
+
+    @property
+    def value(self) -> float:
+        """The timeout to apply to the next call, in seconds."""
+        if len(self._latencies) < self.min_samples:
+            return self.maximum
+        ordered = sorted(self._latencies)
+        rank = math.ceil(len(ordered) * self.percentile / 100) - 1
+        timeout = self.multiplier * ordered[max(0, rank)]
+        return min(self.maximum, max(self.minimum, timeout))
@@ -0,0 +1,40 @@
+"""Coalescing of concurrent identical calls.
+
+While a call for a key is in flight, later calls for the same key wait for
+its result instead of starting their own, so the work done is bounded by the
+number of distinct keys rather than the number of callers.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task"] = {}
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._calls)
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Return the result of ``func()``, shared with concurrent callers.
+
+        The first caller for ``key`` starts ``func()``; callers arriving before
+        it finishes get the same result, or the same exception. A caller that
+        is cancelled stops waiting without cancelling the call for the others.
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Task") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
@@ -0,0 +1,41 @@
+"""Command-line export of the profile corpus.
+
+Streams every stored profile as NDJSON, optionally gzip-compressed, using the
+storage backend configured for the API::
+
+    python -m app.export -o profiles.ndjson.gz --gzip
+"""
+
+import argparse
+import asyncio
+import sys
+from typing import BinaryIO, List, Optional
+
+from app.services.profile_service import profile_service
+
+
+async def export_profiles(output: BinaryIO, compress: bool = False) -> None:
+    """Write every profile to ``output`` as NDJSON."""
+    async for chunk in profile_service.export_ndjson(compress=compress):
+        output.write(chunk)
+    output.flush()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the export command."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-o", "--output", help="File to write to (default: standard output)"
+    )
+    parser.add_argument("--gzip", action="store_true", help="Compress with gzip")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "wb") as output:
+            asyncio.run(export_profiles(output, compress=args.gzip))
+    else:
+        asyncio.run(export_profiles(sys.stdout.buffer, compress=args.gzip))
+
+
+if __name__ == "__main__":
+    main()
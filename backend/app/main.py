@@ -4,15 +4,33 @@ This module initializes the FastAPI application with routes for profile manageme
 and semantic search powered by Groq's LLM API.
 """
 
+from contextlib import asynccontextmanager
+
 from app.core.config import settings
 from app.routers import profiles, search
+from app.services.profile_service import profile_service
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Open the shared Groq client at startup and close it at shutdown.
+
+    Profile writes still queued are committed and the store is closed at
+    shutdown too.
+    """
+    await search.groq_service.start()
+    yield
+    await search.groq_service.close()
+    await profile_service.close()
+
+
 app = FastAPI(
     title="100X Discovery API",
     description="Backend API for 100X Discovery Platform with semantic search capabilities",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
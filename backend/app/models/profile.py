@@ -58,3 +58,18 @@ class Profile(ProfileBase):
                 "linkedin_url": "https://linkedin.com/in/johndoe",
             }
         }
+
+
+class BulkImportError(BaseModel):
+    """A record of a bulk upload that was rejected."""
+
+    index: int = Field(..., description="Zero-based position of the record")
+    error: str = Field(..., description="Why the record was rejected")
+
+
+class BulkImportResult(BaseModel):
+    """Outcome of a bulk profile upload."""
+
+    created: int = Field(..., description="Number of profiles created")
+    failed: int = Field(..., description="Number of records rejected")
+    errors: List[BulkImportError] = Field(default_factory=list)
@@ -1,31 +1,143 @@
+import json
 import uuid
-from typing import List
+from typing import AsyncIterable, Dict, List, Optional
 
-from app.models.profile import Profile, ProfileCreate
-from app.services.profile_service import ProfileService
-from fastapi import APIRouter, HTTPException, status
+from app.core.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.models.profile import BulkImportResult, Profile, ProfileCreate
+from app.services.bulk_import import iter_upload_records
+from app.services.profile_service import CachedBody, profile_service
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
 router = APIRouter()
-profile_service = ProfileService()
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    if cursor is None:
+        return 0
+    # str.isdigit() also accepts digits int() cannot parse, such as "²"
+    if not (cursor.isascii() and cursor.isdigit()):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return int(cursor)
+
+
+async def _ndjson(profiles: AsyncIterable[Dict]) -> AsyncIterable[str]:
+    async for profile in profiles:
+        yield json.dumps(profile) + "\n"
+
+
+async def _iterate(profiles: List[Dict]) -> AsyncIterable[Dict]:
+    for profile in profiles:
+        yield profile
+
+
+def _cached_response(request: Request, cached: CachedBody) -> Response:
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return not_modified(cached.etag)
+    return Response(
+        cached.body, media_type="application/json", headers=etag_headers(cached.etag)
+    )
 
 
 @router.post("/", response_model=Profile, status_code=status.HTTP_201_CREATED)
 async def create_profile(profile: ProfileCreate):
-    profile_dict = profile.dict()
+    profile_dict = profile.model_dump()
     profile_dict["id"] = str(uuid.uuid4())
-    return await profile_service.create_profile(profile_dict)
+    # Stored profiles are already validated; skip response_model re-validation
+    return JSONResponse(
+        await profile_service.create_profile(profile_dict),
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+@router.post("/bulk", response_model=BulkImportResult)
+async def bulk_import_profiles(request: Request):
+    """Create many profiles from one NDJSON or JSON-array upload.
+
+    The body is parsed and validated as it streams in, and valid records are
+    committed in large batches. Rejected records are listed in ``errors`` by
+    their zero-based position in the upload; the rest are still created.
+    """
+    return await profile_service.import_profiles(iter_upload_records(request.stream()))
+
+
+@router.get("/export")
+async def export_profiles(
+    gzip: bool = Query(False, description="Compress the export with gzip"),
+):
+    """Stream every profile as NDJSON, straight from storage.
+
+    Intended for backups and offline analysis; see also ``python -m app.export``.
+    """
+    filename = "profiles.ndjson.gz" if gzip else "profiles.ndjson"
+    return StreamingResponse(
+        profile_service.export_ndjson(compress=gzip),
+        media_type="application/gzip" if gzip else NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.get("/{profile_id}", response_model=Profile)
-async def get_profile(profile_id: str):
-    profile = await profile_service.get_profile(profile_id)
-    if not profile:
+async def get_profile(profile_id: str, request: Request):
+    cached = await profile_service.get_profile_json(profile_id)
+    if cached is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found"
         )
-    return profile
+    return _cached_response(request, cached)
 
 
 @router.get("/", response_model=List[Profile])
-async def list_profiles():
-    return await profile_service.list_profiles()
+async def list_profiles(
+    request: Request,
+    limit: Optional[int] = Query(
+        None, ge=1, le=1000, description="Maximum number of profiles to return"
+    ),
+    cursor: Optional[str] = Query(
+        None, description=f"Cursor from the {NEXT_CURSOR_HEADER} response header"
+    ),
+):
+    """List profiles, optionally one page at a time.
+
+    Without ``limit`` or ``cursor`` every profile is returned. With either, a
+    page is returned and the cursor of the next page, if any, is sent in the
+    ``X-Next-Cursor`` header. Requests accepting ``application/x-ndjson`` get
+    one profile per line, streamed as they are read; without ``limit`` the
+    stream runs to the end of the store.
+
+    Responses other than the unbounded stream carry an ``ETag`` derived from
+    the store generation, and ``If-None-Match`` is answered with 304.
+    """
+    after = _decode_cursor(cursor)
+    ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+    if ndjson and limit is None:
+        return StreamingResponse(
+            _ndjson(profile_service.iter_profiles(after)), media_type=NDJSON_MEDIA_TYPE
+        )
+    if limit is None and cursor is None:
+        return _cached_response(request, await profile_service.list_profiles_json())
+
+    limit = limit or DEFAULT_PAGE_SIZE
+    # Taken before the page is read, so the tag is never newer than the data
+    etag = make_etag(
+        "profiles", await profile_service.generation(), after, limit, ndjson
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+
+    profiles, next_cursor = await profile_service.list_profiles_page(after, limit)
+    headers = etag_headers(etag)
+    if next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = str(next_cursor)
+    if ndjson:
+        return StreamingResponse(
+            _ndjson(_iterate(profiles)), media_type=NDJSON_MEDIA_TYPE, headers=headers
+        )
+    return JSONResponse(profiles, headers=headers)
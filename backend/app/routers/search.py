@@ -3,39 +3,102 @@
 This module provides endpoints for searching profiles using semantic search via Groq API.
 """
 
+import asyncio
+import json
 import logging
-from typing import Any, Dict, List
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+from app.core.config import settings
+from app.core.etag import etag_headers, etag_matches, make_etag, not_modified
+from app.core.singleflight import SingleFlight
 from app.services.groq_service import GroqService
-from app.services.profile_service import ProfileService
-from fastapi import APIRouter, Body, HTTPException, Query
+from app.services.profile_service import profile_service
+from app.services.search_cache import normalize_query
+from fastapi import APIRouter, Body, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-profile_service = ProfileService()
 groq_service = GroqService()
+# Concurrent identical searches share one profile read and one ranking
+_searches = SingleFlight()
+
+
+class SearchMode(str, Enum):
+    """How profiles are ranked against a query."""
+
+    LLM = "llm"  # Groq re-ranking, falling back to lexical search
+    LEXICAL = "lexical"  # Local BM25 keyword search
+    VECTOR = "vector"  # Local LSA embedding search, no network access
 
 
 @router.get("/")
 async def search_profiles_get(
-    query: str = Query(..., description="Search query for matching profiles")
-) -> Dict[str, List[Dict[str, Any]]]:
+    request: Request,
+    response: Response,
+    query: str = Query(..., description="Search query for matching profiles"),
+    mode: SearchMode = Query(SearchMode.LLM, description="Ranking method"),
+    candidates: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.SEMANTIC_MAX_CANDIDATES,
+        description="Profiles pre-selected locally for the LLM to re-rank",
+    ),
+    deadline_ms: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.SEARCH_MAX_DEADLINE_MS,
+        description="Latency budget; local results are returned past it",
+    ),
+) -> Dict[str, Any]:
     """Search for profiles based on a text query using semantic search (GET method).
 
+    The response carries an ``ETag`` derived from the normalized query and the
+    store generation. A matching ``If-None-Match`` is answered with 304
+    without searching again, until a profile is written. LLM rankings are
+    not deterministic and are not cached forever, so their tag is weak: a
+    client keeps the ranking it holds for as long as the generation lasts,
+    even if a new search would order it differently. Only results of the
+    ranking asked for carry an ``ETag``: LLM searches that fell back to local
+    search, because Groq failed, was too busy or missed the deadline, are not
+    revalidated in place of the LLM ranking.
+
     See POST method for more details.
     """
-    return await _perform_search(query)
+    generation = await profile_service.generation()
+    etag = make_etag(
+        "search",
+        mode.value,
+        normalize_query(query),
+        candidates or "",
+        deadline_ms or "",
+        generation,
+        weak=mode is SearchMode.LLM,
+    )
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
+    results = await _perform_search(query, mode, candidates, deadline_ms, generation)
+    if results["tier"] == mode.value:
+        response.headers.update(etag_headers(etag))
+    return results
 
 
 @router.post("/")
 async def search_profiles_post(
-    query_data: Dict[str, str] = Body(
-        ..., example={"query": "experienced AI researcher"}
+    query_data: Dict[str, Any] = Body(
+        ...,
+        example={
+            "query": "experienced AI researcher",
+            "mode": "llm",
+            "candidates": 30,
+            "deadline_ms": 2000,
+        },
     )
-) -> Dict[str, List[Dict[str, Any]]]:
+) -> Dict[str, Any]:
     """Search for profiles based on a text query using semantic search.
 
     The search uses Groq's LLM to understand the semantic meaning of:
@@ -44,6 +107,21 @@ async def search_profiles_post(
     - Skills (weighted higher)
     - Interests (weighted medium)
 
+    Only the best local matches are sent to Groq; an optional 'candidates'
+    field sets how many (``SEMANTIC_CANDIDATES`` by default).
+
+    An optional 'deadline_ms' field bounds the latency: lexical search runs
+    alongside the LLM, and its results are returned if the LLM has not
+    answered in time.
+
+    The response's 'tier' field names the ranking returned: "llm", or
+    "lexical" if Groq failed, was unavailable or missed the deadline and
+    local search answered instead; local modes report their own name.
+
+    An optional 'mode' field selects local ranking instead: "lexical" for BM25
+    keyword search or "vector" for embedding search, neither of which calls
+    Groq.
+
     Args:
         query_data: JSON object with a 'query' field containing the search string
 
@@ -59,46 +137,207 @@ async def search_profiles_post(
             detail="Missing required field 'query' in request body",
         )
 
-    return await _perform_search(query_data["query"])
+    try:
+        mode = SearchMode(query_data.get("mode", SearchMode.LLM))
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid search mode: {query_data['mode']}",
+        ) from None
+
+    candidates = _int_field(query_data, "candidates", settings.SEMANTIC_MAX_CANDIDATES)
+    deadline_ms = _int_field(query_data, "deadline_ms", settings.SEARCH_MAX_DEADLINE_MS)
+    return await _perform_search(query_data["query"], mode, candidates, deadline_ms)
+
+
+def _int_field(query_data: Dict[str, Any], name: str, maximum: int) -> Optional[int]:
+    value = query_data.get(name)
+    if value is not None and (not isinstance(value, int) or not 1 <= value <= maximum):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Field '{name}' must be an integer between 1 and {maximum}",
+        )
+    return value
 
 
-async def _perform_search(query: str) -> Dict[str, List[Dict[str, Any]]]:
+async def _perform_search(
+    query: str,
+    mode: SearchMode = SearchMode.LLM,
+    candidates: Optional[int] = None,
+    deadline_ms: Optional[int] = None,
+    generation: Optional[int] = None,
+) -> Dict[str, Any]:
     """Internal function to perform the search logic.
 
+    Requests for the same normalized query, mode, candidate count and
+    deadline against the same store generation are coalesced: while one is
+    running, the others wait for its result instead of searching again.
+
     Args:
         query: Search string to match against profiles
+        mode: How profiles are ranked
+        candidates: Profiles pre-selected for the LLM; the default if None
+        deadline_ms: Latency budget of an LLM search; unbounded if None
+        generation: Current store generation, if already known
 
     Returns:
-        Dict with matches
+        Dict with matches, and the tier that produced them
 
     Raises:
         HTTPException on error
     """
-    logger.info(f"Performing semantic search for query: '{query}'")
+    if generation is None:
+        generation = await profile_service.generation()
+    key = (mode, normalize_query(query), candidates, deadline_ms, generation)
+    return await _searches.run(
+        key, lambda: _run_search(query, mode, candidates, deadline_ms, generation)
+    )
+
+
+async def _run_search(
+    query: str,
+    mode: SearchMode,
+    candidates: Optional[int],
+    deadline_ms: Optional[int],
+    generation: int,
+) -> Dict[str, Any]:
+    logger.info(f"Performing {mode.value} search for query: '{query}'")
 
     try:
-        # Get all profiles
-        profiles = await profile_service.list_profiles()
+        # Get all profiles, read from the store once per generation
+        profiles = await profile_service.search_corpus(generation)
 
+        # Local modes are their own tier; the LLM may fall back to lexical
+        tier = mode.value
         if not profiles:
             logger.warning("No profiles found in database")
-            return {"matches": []}
+            return {"matches": [], "tier": tier}
 
-        # Convert profiles to dictionaries
-        profile_dicts = [profile.dict() for profile in profiles]
-        logger.info(f"Found {len(profile_dicts)} profiles to search through")
+        # Stored profiles are already validated dictionaries
+        logger.info(f"Found {len(profiles)} profiles to search through")
 
-        # Use Groq for semantic search
-        matches = await groq_service.get_semantic_search_results(query, profile_dicts)
+        if mode is SearchMode.LEXICAL:
+            matches = await groq_service.get_lexical_search_results(query, profiles)
+        elif mode is SearchMode.VECTOR:
+            matches = await groq_service.get_vector_search_results(query, profiles)
+        elif deadline_ms is not None:
+            # Race Groq against lexical search within the budget
+            matches, tier = await groq_service.get_search_results_within(
+                query,
+                profiles,
+                deadline_ms / 1000,
+                candidates=candidates,
+                generation=generation,
+            )
+        else:
+            # Use Groq for semantic search
+            # Rankings are cached per store generation
+            matches, tier = await groq_service.get_semantic_search_results(
+                query, profiles, candidates=candidates, generation=generation
+            )
         logger.info(f"Search complete. Found {len(matches)} matching profiles")
 
-        return {"matches": matches}
+        return {"matches": matches, "tier": tier}
     except Exception as e:
-        logger.error(f"Search failed: {str(e)}", exc_info=True)
+        logger.error(f"Search failed: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to search profiles: {str(e)}",
+            detail=f"Failed to search profiles: {e}",
+        ) from e
+
+
+@router.get("/stream")
+async def search_profiles_stream(
+    query: str = Query(..., description="Search query for matching profiles"),
+    candidates: Optional[int] = Query(
+        None,
+        ge=1,
+        le=settings.SEMANTIC_MAX_CANDIDATES,
+        description="Profiles pre-selected locally for the LLM to re-rank",
+    ),
+) -> StreamingResponse:
+    """Search for profiles, streaming progressively better results.
+
+    The response is a Server-Sent Events stream of up to three events, each
+    carrying JSON data:
+
+    - ``lexical``: ``{"matches": [...]}`` from local BM25 search, within
+      milliseconds
+    - ``llm``: ``{"matches": [...]}`` re-ranked by Groq with match reasons,
+      once it answers; omitted if Groq is unavailable
+    - ``done``: ``{}``, or ``error``: ``{"detail": "..."}`` if the search
+      failed
+
+    The Groq call starts at once, alongside the lexical search.
+    """
+    generation = await profile_service.generation()
+    profiles = await profile_service.search_corpus(generation)
+    return StreamingResponse(
+        _search_events(query, profiles, candidates, generation),
+        media_type="text/event-stream",
+        # Proxies must pass each event on as soon as it is written
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _search_events(
+    query: str,
+    profiles: List[Dict[str, Any]],
+    candidates: Optional[int],
+    generation: int,
+) -> AsyncIterator[str]:
+    if not profiles:
+        yield _sse("lexical", {"matches": []})
+        yield _sse("done", {})
+        return
+
+    llm = asyncio.ensure_future(
+        groq_service.get_llm_search_results(
+            query, profiles, candidates=candidates, generation=generation
         )
+    )
+    try:
+        lexical = await groq_service.get_lexical_search_results(query, profiles)
+        yield _sse("lexical", {"matches": lexical})
+        ranked = await llm
+        if ranked is not None:
+            yield _sse("llm", {"matches": ranked})
+        yield _sse("done", {})
+    except Exception as e:
+        logger.error(f"Streaming search failed: {e}", exc_info=True)
+        yield _sse("error", {"detail": f"Failed to search profiles: {e}"})
+    finally:
+        # The client may disconnect before Groq answers
+        llm.cancel()
+
+
+@router.get("/cache/stats")
+async def search_cache_stats() -> Dict[str, Any]:
+    """Report the hit and miss counters of the LLM search result cache.
+
+    Returns:
+        Dict[str, Any]: Hits per tier, misses, hit rate and entries per tier
+    """
+    return await asyncio.to_thread(groq_service.cache.stats)
+
+
+@router.get("/llm/stats")
+async def search_llm_stats() -> Dict[str, Any]:
+    """Report the load on Groq and the state of the protections around it.
+
+    Returns:
+        Dict[str, Any]: Requests running, queued and rejected by admission
+        control, the circuit breaker state and the current read timeout
+    """
+    return {
+        **groq_service.admission.stats(),
+        "circuit": groq_service.breaker.state,
+        "read_timeout_seconds": round(groq_service.read_timeout.value, 3),
+    }
 
 
 @router.get("/health")
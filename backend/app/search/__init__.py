@@ -0,0 +1,9 @@
+"""Local profile search package.
+
+Contains the in-process retrieval structures used by search:
+- Inverted index with BM25 ranking for lexical search
+- LSA embeddings with cosine similarity for vector search
+- IVF index for approximate nearest neighbour vector search
+- Int8 and product-quantized storage for compressed embeddings
+- Reciprocal rank fusion of lexical and vector rankings
+"""
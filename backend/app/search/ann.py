@@ -0,0 +1,131 @@
+"""Inverted file (IVF) index for approximate nearest neighbour search.
+
+Vectors are partitioned by a coarse quantizer: spherical k-means centroids,
+each owning an inverted list of the positions of the vectors closest to it. A
+query is compared with the centroids first, and only the vectors in the
+``nprobe`` closest lists are scored. Probing more lists raises recall at the
+cost of latency; probing all of them is an exact search.
+
+The index stores positions only. Scoring the candidates is left to the
+caller, which owns the vectors.
+"""
+
+from array import array
+from typing import List, Optional
+
+import numpy as np
+
+
+def _assign(
+    vectors: np.ndarray, centroids: np.ndarray, chunk: int = 8192
+) -> np.ndarray:
+    """Return the index of the most similar centroid for every vector."""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk):
+        labels[start : start + chunk] = np.argmax(
+            vectors[start : start + chunk] @ centroids.T, axis=1
+        )
+    return labels
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def spherical_kmeans(
+    vectors: np.ndarray, clusters: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Cluster unit vectors by cosine similarity.
+
+    Returns:
+        np.ndarray: ``(clusters, dimensions)`` unit-length centroids
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _assign(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(clusters + 1))
+        empty = bounds[:-1] == bounds[1:]
+        sums = np.zeros_like(centroids)
+        sums[~empty] = np.add.reduceat(vectors[order], bounds[:-1][~empty], axis=0)
+        if empty.any():
+            # Restart empty clusters on random vectors
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Coarse partition of vectors into inverted lists.
+
+    Args:
+        centroids: Unit-length centroids of the lists, one per row
+        nprobe: Number of lists probed per query by default
+    """
+
+    def __init__(self, centroids: np.ndarray, nprobe: int = 16):
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        self.nprobe = nprobe
+        self._lists: List[array] = [array("q") for _ in range(len(centroids))]
+        self._size = 0
+
+    @classmethod
+    def train(
+        cls,
+        vectors: np.ndarray,
+        lists: Optional[int] = None,
+        nprobe: int = 16,
+        sample: int = 65536,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Learn centroids from ``vectors`` and index them.
+
+        Args:
+            vectors: Unit-length vectors, one per row, indexed by row number
+            lists: Number of inverted lists; ``4 * sqrt(len(vectors))`` if None
+            nprobe: Number of lists probed per query by default
+            sample: Maximum number of vectors k-means is run on
+            seed: Seed for sampling and centroid initialization
+        """
+        if lists is None:
+            lists = 4 * int(np.sqrt(len(vectors)))
+        lists = max(1, min(lists, len(vectors)))
+        training = vectors
+        if len(vectors) > sample:
+            rng = np.random.default_rng(seed)
+            training = vectors[rng.choice(len(vectors), sample, replace=False)]
+        index = cls(spherical_kmeans(training, lists, seed=seed), nprobe)
+        index.add_batch(vectors, 0)
+        return index
+
+    def __len__(self) -> int:
+        """Return the number of vectors in the index."""
+        return self._size
+
+    def add(self, vector: np.ndarray, position: int) -> None:
+        """Insert one vector stored at ``position``."""
+        self._lists[int(np.argmax(self.centroids @ vector))].append(position)
+        self._size += 1
+
+    def add_batch(self, vectors: np.ndarray, first_position: int) -> None:
+        """Insert consecutive vectors, the first stored at ``first_position``."""
+        labels = _assign(vectors, self.centroids)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(len(self._lists) + 1))
+        positions = order + first_position
+        for label, inverted in enumerate(self._lists):
+            inverted.extend(positions[bounds[label] : bounds[label + 1]].tolist())
+        self._size += len(vectors)
+
+    def probe(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Return the positions in the lists closest to ``query``."""
+        nprobe = min(nprobe or self.nprobe, len(self._lists))
+        similarities = self.centroids @ query
+        closest = np.argpartition(-similarities, nprobe - 1)[:nprobe]
+        candidates = [self._lists[label] for label in closest]
+        return np.concatenate(
+            [np.frombuffer(c, dtype=np.int64) for c in candidates if len(c)]
+            or [np.empty(0, dtype=np.int64)]
+        )
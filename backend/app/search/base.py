@@ -0,0 +1,64 @@
+"""Common behaviour of the local search indexes."""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class ProfileIndex(ABC):
+    """An append-only index over a list of profiles.
+
+    Profiles are addressed by their position in the list the index was built
+    from. Every profile store lists profiles in creation order, so new
+    profiles only ever appear at the end and can be indexed incrementally.
+    """
+
+    def __init__(self):
+        self._ids: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        """Return the number of profile positions indexed."""
+        return len(self._ids)
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every indexed profile."""
+        self._ids = []
+
+    @abstractmethod
+    def add(self, profile: Dict) -> int:
+        """Index ``profile`` at the next position and return that position."""
+
+    def _extends(self, profiles: Sequence[Dict]) -> bool:
+        """Return True if ``profiles`` starts with the indexed profiles."""
+        indexed = len(self._ids)
+        return not indexed or (
+            len(profiles) >= indexed
+            and profiles[indexed - 1].get("id") == self._ids[-1]
+            and profiles[0].get("id") == self._ids[0]
+        )
+
+    def sync(self, profiles: Sequence[Dict]) -> None:
+        """Bring the index in line with ``profiles``.
+
+        Profiles appended since the last sync are indexed incrementally. If
+        the list no longer starts with what was indexed, for example after the
+        store was replaced, the index is rebuilt.
+        """
+        if not self._extends(profiles):
+            self.clear()
+        for profile in profiles[len(self._ids) :]:
+            self.add(profile)
+
+    @abstractmethod
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Rank indexed profiles against ``query``.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results; all matches if None
+
+        Returns:
+            List[Tuple[int, float]]: ``(position, score)`` pairs, best first
+        """
@@ -0,0 +1,29 @@
+"""Combination of several rankings into one."""
+
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Tuple[int, float]]], limit: int, k: int = 60
+) -> List[int]:
+    """Merge rankings by reciprocal rank fusion (RRF).
+
+    Every ranking contributes ``1 / (k + rank)`` to each position it lists.
+    Only ranks count, so rankings whose scores are on different scales, such
+    as BM25 and cosine similarity, are merged without calibration.
+
+    Args:
+        rankings: ``(position, score)`` pairs per ranking, best first
+        limit: Maximum number of positions returned
+        k: Damping constant; larger values flatten the weight of top ranks
+
+    Returns:
+        List[int]: Positions, best first
+    """
+    fused: Dict[int, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, (position, _) in enumerate(ranking, 1):
+            fused[position] += 1.0 / (k + rank)
+    ordered = sorted(fused.items(), key=lambda item: (-item[1], item[0]))
+    return [position for position, _ in ordered[:limit]]
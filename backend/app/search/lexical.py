@@ -0,0 +1,285 @@
+"""Inverted index with BM25F ranking over profile fields.
+
+Profiles are tokenized once, when they enter the index, into per-field
+postings lists. A query only touches the postings of its own terms, so its
+cost depends on how many profiles match rather than on the corpus size.
+
+Scoring is BM25F: a term's frequency in each field is length-normalized,
+weighted by the field's importance and summed before BM25 saturation, so
+repeating a skill cannot outweigh matching in several fields.
+"""
+
+import math
+import re
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from app.search.base import ProfileIndex
+
+# Relative importance of each field, mirroring the weights of the original
+# substring matcher (skills 20, interests 15, name 10, bio 5 per term)
+FIELD_WEIGHTS: Dict[str, float] = {
+    "skills": 2.0,
+    "interests": 1.5,
+    "name": 1.0,
+    "bio": 1.0,
+}
+
+# Query terms that also look for related terms, at EXPANSION_WEIGHT
+QUERY_EXPANSIONS: Dict[str, List[str]] = {
+    "ml": [
+        "machine learning",
+        "deep learning",
+        "ai",
+        "artificial intelligence",
+        "neural networks",
+    ],
+    "ai": [
+        "artificial intelligence",
+        "machine learning",
+        "deep learning",
+        "neural networks",
+    ],
+    "frontend": [
+        "ui",
+        "user interface",
+        "react",
+        "angular",
+        "vue",
+        "javascript",
+        "web",
+    ],
+    "backend": ["server", "api", "database", "node", "django", "flask", "fastapi"],
+    "cloud": [
+        "aws",
+        "azure",
+        "gcp",
+        "infrastructure",
+        "devops",
+        "kubernetes",
+        "docker",
+    ],
+    "mobile": ["ios", "android", "flutter", "react native", "cross-platform"],
+    "data": ["analytics", "visualization", "science", "scientist", "analysis"],
+    "experienced": ["years", "experience", "senior"],
+    "senior": ["years", "experience"],
+    "expert": ["years", "experience", "senior"],
+}
+EXPANSION_WEIGHT = 0.5
+
+# Roles named in the query and in a profile's bio add ROLE_WEIGHT times the
+# term's IDF, as the original matcher's 25 point role bonus did
+ROLES = frozenset(
+    [
+        "developer",
+        "engineer",
+        "scientist",
+        "designer",
+        "manager",
+        "specialist",
+        "expert",
+    ]
+)
+ROLE_WEIGHT = 1.25
+
+# Words, keeping trailing "+" and "#" so C++ and C# survive
+_TOKEN = re.compile(r"[a-z0-9]+[+#]*")
+
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """Strip common English inflections from a lowercase token.
+
+    A deliberately light stemmer: plurals and "-ing"/"-ed" forms are folded
+    together, and short tokens (often acronyms such as "aws") are kept as-is.
+    """
+    if len(token) <= 4 or not token.isalpha():
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith("sses"):
+        return token[:-2]
+    if token.endswith("ing") and len(token) > 6:
+        return token[:-3]
+    if token.endswith("ed") and len(token) > 5:
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str, stemming: bool = True) -> List[str]:
+    """Split ``text`` into lowercase, optionally stemmed, terms."""
+    tokens = _TOKEN.findall(text.lower())
+    return [stem(token) for token in tokens] if stemming else tokens
+
+
+def field_text(profile: Dict, field: str) -> str:
+    """Return a profile field as text, joining list fields such as skills."""
+    value = profile.get(field) or ""
+    return " ".join(value) if isinstance(value, list) else value
+
+
+def _sum_by_doc(
+    docs: List[np.ndarray], values: List[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum parallel arrays of ``values`` per document id, over the hits only."""
+    if len(docs) == 1:
+        # A single postings list holds each document once
+        return docs[0], values[0]
+    unique, inverse = np.unique(np.concatenate(docs), return_inverse=True)
+    return unique, np.bincount(inverse, weights=np.concatenate(values))
+
+
+class _Postings:
+    """Positions of the profiles containing a term in one field, with counts."""
+
+    __slots__ = ("counts", "docs")
+
+    def __init__(self):
+        self.docs = array("I")
+        self.counts = array("f")
+
+
+class LexicalIndex(ProfileIndex):
+    """BM25F inverted index over profile name, bio, skills and interests.
+
+    Args:
+        stemming: Whether to apply :func:`stem` to indexed and query terms
+        k1: BM25 term frequency saturation
+        b: BM25 length normalization strength
+        field_weights: Weight of each indexed field
+    """
+
+    def __init__(
+        self,
+        stemming: bool = True,
+        k1: float = 1.2,
+        b: float = 0.75,
+        field_weights: Optional[Dict[str, float]] = None,
+    ):
+        super().__init__()
+        self.stemming = stemming
+        self.k1 = k1
+        self.b = b
+        self.field_weights = dict(field_weights or FIELD_WEIGHTS)
+        self._fields = list(self.field_weights)
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every indexed profile and its postings."""
+        super().clear()
+        # field -> term -> postings
+        self._postings: Dict[str, Dict[str, _Postings]] = {
+            field: {} for field in self._fields
+        }
+        self._doc_freq: Dict[str, int] = {}
+        self._lengths = {field: array("f") for field in self._fields}
+        self._total_lengths = dict.fromkeys(self._fields, 0.0)
+
+    def add(self, profile: Dict) -> int:
+        """Add ``profile`` to the postings of each field and return its position."""
+        position = len(self._ids)
+        seen = set()
+        for field in self._fields:
+            terms = tokenize(field_text(profile, field), self.stemming)
+            self._lengths[field].append(len(terms))
+            self._total_lengths[field] += len(terms)
+            counts = Counter(terms)
+            field_postings = self._postings[field]
+            for term, count in counts.items():
+                postings = field_postings.get(term)
+                if postings is None:
+                    postings = field_postings[term] = _Postings()
+                postings.docs.append(position)
+                postings.counts.append(count)
+            seen.update(counts)
+        for term in seen:
+            self._doc_freq[term] = self._doc_freq.get(term, 0) + 1
+        self._ids.append(profile.get("id"))
+        return position
+
+    def query_terms(self, query: str) -> Dict[str, float]:
+        """Return the weighted terms searched for ``query``, expansions included."""
+        words = _TOKEN.findall(query.lower())
+        terms = {stem(w) if self.stemming else w: 1.0 for w in words}
+        for word in words:
+            for related in QUERY_EXPANSIONS.get(word, ()):
+                for term in tokenize(related, self.stemming):
+                    terms.setdefault(term, EXPANSION_WEIGHT)
+        return terms
+
+    def search(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Rank the profiles matching ``query`` by their BM25F score."""
+        count = len(self._ids)
+        if not count:
+            return []
+        average_lengths = {
+            field: max(total / count, 1e-9)
+            for field, total in self._total_lengths.items()
+        }
+        roles = self._role_terms(query)
+        # Scores are summed over postings hits only, never per indexed profile
+        hit_docs: List[np.ndarray] = []
+        hit_scores: List[np.ndarray] = []
+
+        for term, query_weight in self.query_terms(query).items():
+            doc_freq = self._doc_freq.get(term)
+            if not doc_freq:
+                continue
+            idf = math.log(1.0 + (count - doc_freq + 0.5) / (doc_freq + 0.5))
+            field_docs = []
+            field_tf = []
+            for field in self._fields:
+                postings = self._postings[field].get(term)
+                if postings is None:
+                    continue
+                # Copies: a live view would stop the arrays from growing
+                docs = np.frombuffer(postings.docs, dtype=np.uint32).copy()
+                counts = np.frombuffer(postings.counts, dtype=np.float32).copy()
+                lengths = np.frombuffer(self._lengths[field], dtype=np.float32)[docs]
+                norm = 1.0 - self.b + self.b * lengths / average_lengths[field]
+                field_docs.append(docs)
+                field_tf.append(self.field_weights[field] * counts / norm)
+            docs, tf = _sum_by_doc(field_docs, field_tf)
+            hit_docs.append(docs)
+            hit_scores.append(query_weight * idf * tf / (self.k1 + tf))
+            bio = self._postings.get("bio", {}).get(term)
+            if term in roles and bio is not None:
+                hit_docs.append(np.frombuffer(bio.docs, dtype=np.uint32).copy())
+                hit_scores.append(np.full(len(bio.docs), ROLE_WEIGHT * idf))
+
+        if not hit_docs:
+            return []
+        matched, scores = _sum_by_doc(hit_docs, hit_scores)
+        if limit is not None and len(matched) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+            matched, scores = matched[top], scores[top]
+        # Best first; ties keep insertion order
+        order = np.lexsort((matched, -scores))
+        return [(int(matched[i]), float(scores[i])) for i in order]
+
+    def _role_terms(self, query: str) -> Set[str]:
+        terms = {stem(w) if self.stemming else w for w in _TOKEN.findall(query.lower())}
+        return terms & ROLES
+
+    def matched_fields(self, profile: Dict, query: str) -> Dict[str, List[str]]:
+        """Explain a match: the values of each field of ``profile`` that match.
+
+        Skills and interests report the matching entries; name and bio report
+        the whole field.
+        """
+        terms = set(self.query_terms(query))
+        matches: Dict[str, List[str]] = {}
+        for field in self._fields:
+            value = profile.get(field) or []
+            values: Iterable[str] = value if isinstance(value, list) else [value]
+            hits = [v for v in values if terms.intersection(tokenize(v, self.stemming))]
+            if hits:
+                matches[field] = hits
+        return matches
@@ -0,0 +1,242 @@
+"""Storage for the embedding matrix of the vector search, optionally compressed.
+
+Three layouts share one interface:
+
+- ``FloatVectors`` keeps float32 vectors, 4 bytes per dimension.
+- ``Int8Vectors`` keeps each dimension as a signed byte scaled per dimension,
+  4x smaller.
+- ``PQVectors`` applies product quantization: vectors are cut into
+  ``subspaces`` slices, and each slice is replaced by the index of its nearest
+  centroid among 256 learned for that slice. With 128 dimensions and 32
+  subspaces a vector takes 32 bytes, 16x smaller.
+
+Compressed vectors are never decompressed to be scored. Similarities are
+computed with asymmetric distance computation (ADC): the query stays exact,
+and its products with the per-dimension scales or the per-slice centroids are
+computed once per query and applied to the codes.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+class _Rows:
+    """A 2-D array that grows geometrically as rows are appended."""
+
+    def __init__(self, width: int, dtype: type):
+        self._data = np.zeros((16, width), dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of rows appended."""
+        return self._size
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self._data[: self._size]
+
+    def extend(self, rows: np.ndarray) -> None:
+        needed = self._size + len(rows)
+        if needed > len(self._data):
+            grown = np.zeros(
+                (max(needed, 2 * len(self._data)), self._data.shape[1]),
+                dtype=self._data.dtype,
+            )
+            grown[: self._size] = self.rows
+            self._data = grown
+        self._data[self._size : needed] = rows
+        self._size = needed
+
+
+def kmeans(
+    vectors: np.ndarray, clusters: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Cluster vectors by Euclidean distance and return the centroids."""
+    rng = np.random.default_rng(seed)
+    clusters = min(clusters, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        labels = _nearest(vectors, centroids)
+        counts = np.bincount(labels, minlength=clusters)
+        sums = np.zeros_like(centroids)
+        for dimension in range(vectors.shape[1]):
+            sums[:, dimension] = np.bincount(
+                labels, weights=vectors[:, dimension], minlength=clusters
+            )
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            # Restart empty clusters on random vectors
+            centroids[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+    return centroids
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 16384):
+    labels = np.empty(len(vectors), dtype=np.int64)
+    squared_norms = (centroids**2).sum(axis=1)
+    for start in range(0, len(vectors), chunk):
+        # ||x - c||^2 up to ||x||^2, which does not change the argmin
+        distances = squared_norms - 2 * vectors[start : start + chunk] @ centroids.T
+        labels[start : start + chunk] = np.argmin(distances, axis=1)
+    return labels
+
+
+class FloatVectors:
+    """Uncompressed float32 vectors."""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self._rows = _Rows(dimensions, np.float32)
+
+    def __len__(self) -> int:
+        """Return the number of vectors stored."""
+        return len(self._rows)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by the stored vectors."""
+        return len(self) * self.dimensions * 4
+
+    def train(self, sample: np.ndarray) -> None:
+        """Learn the encoding from sample vectors; nothing to learn here."""
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Append vectors, one per row."""
+        self._rows.extend(vectors)
+
+    def reconstruct(self) -> np.ndarray:
+        """Return the stored vectors, decoded if compressed."""
+        return self._rows.rows
+
+    def scores(
+        self, query: np.ndarray, positions: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Return the dot products of ``query`` with the stored vectors.
+
+        Args:
+            query: Query vector
+            positions: Positions to score; every vector if None
+        """
+        rows = self._rows.rows
+        return (rows if positions is None else rows[positions]) @ query
+
+
+class Int8Vectors(FloatVectors):
+    """Vectors stored as bytes, with a scale per dimension."""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self._rows = _Rows(dimensions, np.int8)
+        self.scale = np.ones(dimensions, dtype=np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by the codes and the scales."""
+        return len(self) * self.dimensions + self.scale.nbytes
+
+    def train(self, sample: np.ndarray) -> None:
+        """Set each dimension's scale from the sample's largest magnitude."""
+        peak = np.abs(sample).max(axis=0)
+        self.scale = np.where(peak > 0, peak / 127, 1.0).astype(np.float32)
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Append vectors, one per row, rounded to bytes."""
+        codes = np.clip(np.rint(vectors / self.scale), -127, 127)
+        self._rows.extend(codes.astype(np.int8))
+
+    def reconstruct(self) -> np.ndarray:
+        """Return the stored vectors, scaled back to floats."""
+        return self._rows.rows * self.scale
+
+    def scores(
+        self, query: np.ndarray, positions: Optional[np.ndarray] = None, chunk=4096
+    ) -> np.ndarray:
+        """Return the dot products of ``query`` with the stored vectors."""
+        scaled = query * self.scale
+        codes = self._rows.rows
+        if positions is not None:
+            return codes[positions].astype(np.float32) @ scaled
+        out = np.empty(len(codes), dtype=np.float32)
+        # Widen a cache-sized slice at a time rather than the whole matrix
+        for start in range(0, len(codes), chunk):
+            out[start : start + chunk] = (
+                codes[start : start + chunk].astype(np.float32) @ scaled
+            )
+        return out
+
+
+class PQVectors(FloatVectors):
+    """Product-quantized vectors: one byte per slice of ``subspaces`` slices."""
+
+    def __init__(self, dimensions: int, subspaces: int = 32, seed: int = 0):
+        if dimensions % subspaces:
+            # Fall back to the largest slice count that divides evenly
+            subspaces = max(s for s in range(1, subspaces + 1) if dimensions % s == 0)
+        self.dimensions = dimensions
+        self.subspaces = subspaces
+        self.seed = seed
+        self._rows = _Rows(subspaces, np.uint8)
+        # (subspaces, 256, dimensions / subspaces)
+        self.codebooks = np.zeros(
+            (subspaces, 1, dimensions // subspaces), dtype=np.float32
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by the codes and the codebooks."""
+        return len(self) * self.subspaces + self.codebooks.nbytes
+
+    def _slices(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors.reshape(len(vectors), self.subspaces, -1)
+
+    def train(self, sample: np.ndarray) -> None:
+        """Learn a codebook of up to 256 centroids per slice from ``sample``."""
+        slices = self._slices(sample)
+        codebooks = [
+            kmeans(slices[:, s], 256, seed=self.seed + s) for s in range(self.subspaces)
+        ]
+        size = min(len(codebook) for codebook in codebooks)
+        self.codebooks = np.stack([codebook[:size] for codebook in codebooks])
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Append vectors, one per row, as the nearest centroid of each slice."""
+        slices = self._slices(np.asarray(vectors, dtype=np.float32))
+        codes = np.empty((len(vectors), self.subspaces), dtype=np.uint8)
+        for s in range(self.subspaces):
+            codes[:, s] = _nearest(slices[:, s], self.codebooks[s])
+        self._rows.extend(codes)
+
+    def reconstruct(self) -> np.ndarray:
+        """Return the stored vectors as their centroids."""
+        codes = self._rows.rows
+        slices = self.codebooks[np.arange(self.subspaces), codes]
+        return slices.reshape(len(codes), self.dimensions)
+
+    def scores(
+        self, query: np.ndarray, positions: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Return the approximate dot products of ``query`` with the vectors."""
+        # Products of each query slice with each centroid of that slice
+        table = np.einsum("sd,scd->sc", self._slices(query[None])[0], self.codebooks)
+        codes = self._rows.rows
+        if positions is not None:
+            codes = codes[positions]
+        out = np.zeros(len(codes), dtype=np.float32)
+        # One 1-D gather per slice; a single 2-D fancy index is several times slower
+        for s in range(self.subspaces):
+            out += table[s].take(codes[:, s])
+        return out
+
+
+def create_vector_storage(
+    quantization: Optional[str], dimensions: int, subspaces: int = 32, seed: int = 0
+) -> FloatVectors:
+    """Build the storage for ``quantization``: None, "int8" or "pq"."""
+    if not quantization or quantization == "none":
+        return FloatVectors(dimensions)
+    if quantization == "int8":
+        return Int8Vectors(dimensions)
+    if quantization == "pq":
+        return PQVectors(dimensions, subspaces, seed)
+    raise ValueError(f"Unknown vector quantization: {quantization}")
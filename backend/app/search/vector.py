@@ -0,0 +1,360 @@
+"""Local semantic search with latent semantic analysis (LSA) embeddings.
+
+Profiles are embedded without any network access. A TF-IDF vocabulary is
+learned from the profiles themselves, and a truncated SVD of the TF-IDF matrix
+projects every profile into a small dense space in which terms that occur in
+similar profiles end up close together. A query is embedded the same way and
+compared with every profile by cosine similarity.
+
+The embeddings live in one contiguous matrix, so a query is a single
+matrix-vector product. The matrix may be stored compressed (see
+``app.search.quantization``); the best approximate matches are then scored
+again exactly by embedding those profiles afresh. The model is learned once
+and reused for profiles created later; it is learned again whenever the
+corpus has grown by ``refit_growth`` since, so the vocabulary keeps up with
+the data.
+"""
+
+import math
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from app.search.ann import IVFIndex
+from app.search.base import ProfileIndex
+from app.search.lexical import FIELD_WEIGHTS, field_text, tokenize
+from app.search.quantization import FloatVectors, create_vector_storage
+
+
+class _SparseRows(NamedTuple):
+    """A sparse matrix in compressed row form."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    columns: int
+
+    def dot(self, dense: np.ndarray, chunk: int = 4096) -> np.ndarray:
+        """Return ``self @ dense``, expanding about ``chunk`` entries at a time."""
+        rows = len(self.indptr) - 1
+        out = np.zeros((rows, dense.shape[1]), dtype=np.float32)
+        start = 0
+        while start < rows:
+            stop = int(np.searchsorted(self.indptr, self.indptr[start] + chunk))
+            stop = min(max(stop - 1, start + 1), rows)
+            begin, end = self.indptr[start], self.indptr[stop]
+            products = self.data[begin:end, None] * dense[self.indices[begin:end]]
+            out[start:stop] = _sum_segments(
+                products, self.indptr[start : stop + 1] - begin
+            )
+            start = stop
+        return out
+
+    def transpose(self) -> "_SparseRows":
+        """Return the transpose, also in compressed row form."""
+        rows = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        order = np.argsort(self.indices, kind="stable")
+        indptr = np.searchsorted(
+            self.indices[order], np.arange(self.columns + 1), side="left"
+        )
+        return _SparseRows(indptr, rows[order], self.data[order], len(self.indptr) - 1)
+
+
+def _sum_segments(values: np.ndarray, indptr: np.ndarray) -> np.ndarray:
+    """Sum ``values`` over the row segments delimited by ``indptr``."""
+    out = np.zeros((len(indptr) - 1, values.shape[1]), dtype=np.float32)
+    starts = indptr[:-1]
+    nonempty = starts < indptr[1:]
+    if nonempty.any():
+        # Empty segments are skipped, since reduceat cannot express them
+        out[nonempty] = np.add.reduceat(values, starts[nonempty], axis=0)
+    return out
+
+
+def _orthonormal(matrix: np.ndarray) -> np.ndarray:
+    return np.linalg.qr(matrix)[0]
+
+
+def truncated_svd(
+    matrix: _SparseRows, rank: int, iterations: int = 2, seed: int = 0
+) -> np.ndarray:
+    """Return the top ``rank`` right singular vectors of a sparse matrix.
+
+    Randomized range finder (Halko et al., 2011) with power iterations, which
+    only needs products with the sparse matrix and its transpose.
+
+    Returns:
+        np.ndarray: ``(rank, columns)`` matrix of orthonormal rows
+    """
+    transposed = matrix.transpose()
+    sketch = min(rank + 10, transposed.columns, matrix.columns)
+    rng = np.random.default_rng(seed)
+    basis = _orthonormal(
+        matrix.dot(rng.standard_normal((matrix.columns, sketch)).astype(np.float32))
+    )
+    for _ in range(iterations):
+        basis = _orthonormal(matrix.dot(_orthonormal(transposed.dot(basis))))
+    projected = transposed.dot(basis).T
+    _, _, components = np.linalg.svd(projected, full_matrices=False)
+    return components[:rank].astype(np.float32)
+
+
+class _Model(NamedTuple):
+    """A learned vocabulary, its IDF weights and the LSA projection."""
+
+    vocabulary: Dict[str, int]
+    idf: np.ndarray
+    # (dimensions, vocabulary) projection onto the latent space
+    components: np.ndarray
+
+
+class VectorIndex(ProfileIndex):
+    """Cosine-similarity search over LSA embeddings of profiles.
+
+    Args:
+        dimensions: Size of the latent space
+        max_features: Maximum vocabulary size, keeping the most common terms
+        fit_sample: Maximum number of profiles the model is learned from
+        refit_growth: Learn the model again once the corpus has grown by this
+            factor since it was last learned
+        stemming: Whether to stem terms, as in the lexical index
+        seed: Seed for sampling and the randomized SVD
+        ann_min_size: Search approximately through an IVF index once this many
+            profiles are indexed; always search exhaustively if None
+        ann_lists: Number of IVF lists; scaled with the corpus if None
+        nprobe: Number of IVF lists probed per query by default
+        quantization: Compress stored vectors: None, "int8" or "pq"
+        pq_subspaces: Bytes per vector with product quantization
+        rerank_factor: With quantization, re-score ``rerank_factor * limit``
+            approximate matches exactly; 0 keeps the approximate scores
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 128,
+        max_features: int = 20000,
+        fit_sample: int = 20000,
+        refit_growth: float = 2.0,
+        stemming: bool = True,
+        seed: int = 0,
+        ann_min_size: Optional[int] = 50000,
+        ann_lists: Optional[int] = None,
+        nprobe: int = 16,
+        quantization: Optional[str] = None,
+        pq_subspaces: int = 32,
+        rerank_factor: int = 2,
+    ):
+        super().__init__()
+        self.dimensions = dimensions
+        self.max_features = max_features
+        self.fit_sample = fit_sample
+        self.refit_growth = refit_growth
+        self.stemming = stemming
+        self.seed = seed
+        self.ann_min_size = ann_min_size
+        self.ann_lists = ann_lists
+        self.nprobe = nprobe
+        self.quantization = None if quantization == "none" else quantization
+        self.pq_subspaces = pq_subspaces
+        self.rerank_factor = rerank_factor
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every indexed profile and the fitted embedding model."""
+        super().clear()
+        self._model: Optional[_Model] = None
+        self._fitted_size = 0
+        self._storage: FloatVectors = FloatVectors(0)
+        self._ann: Optional[IVFIndex] = None
+        # The profiles last synced, for exact re-ranking
+        self._profiles: Sequence[Dict] = ()
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The unit-length embeddings of the indexed profiles, one per row.
+
+        Decoded, and so approximate, when the vectors are stored compressed.
+        """
+        return self._storage.reconstruct()
+
+    @property
+    def nbytes(self) -> int:
+        """Memory taken by the stored vectors."""
+        return self._storage.nbytes
+
+    def _term_counts(self, profile: Dict) -> Counter:
+        counts: Counter = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(field_text(profile, field), self.stemming):
+                counts[term] += weight
+        return counts
+
+    def _tfidf(self, counts: Counter) -> Tuple[np.ndarray, np.ndarray]:
+        vocabulary = self._model.vocabulary
+        columns = [vocabulary[t] for t in counts if t in vocabulary]
+        values = np.array(
+            [1.0 + math.log(counts[t]) for t in counts if t in vocabulary],
+            dtype=np.float32,
+        )
+        values *= self._model.idf[columns]
+        norm = np.linalg.norm(values)
+        return np.array(columns, dtype=np.int64), values / norm if norm else values
+
+    def embed(self, counts: Counter) -> np.ndarray:
+        """Embed weighted term counts as a unit vector in the latent space."""
+        columns, values = self._tfidf(counts)
+        vector = self._model.components[:, columns] @ values
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _tfidf_rows(self, counts: Sequence[Counter]) -> _SparseRows:
+        indptr, indices, data = [0], [], []
+        for profile_counts in counts:
+            columns, values = self._tfidf(profile_counts)
+            indices.append(columns)
+            data.append(values)
+            indptr.append(indptr[-1] + len(columns))
+        return _SparseRows(
+            np.array(indptr, dtype=np.int64),
+            np.concatenate(indices),
+            np.concatenate(data),
+            len(self._model.vocabulary),
+        )
+
+    def fit(self, profiles: Sequence[Dict]) -> None:
+        """Learn the model from ``profiles`` and index them."""
+        self.clear()
+        if not profiles:
+            return
+        counts = [self._term_counts(profile) for profile in profiles]
+        sample: Sequence[Counter] = counts
+        if len(counts) > self.fit_sample:
+            rng = np.random.default_rng(self.seed)
+            picked = rng.choice(len(counts), self.fit_sample, replace=False)
+            sample = [counts[i] for i in sorted(picked)]
+
+        doc_freq: Counter = Counter()
+        for profile_counts in sample:
+            doc_freq.update(profile_counts.keys())
+        # Terms seen once carry no co-occurrence signal, unless data is scarce
+        min_df = 2 if len(sample) >= 100 else 1
+        terms = [t for t, df in doc_freq.most_common(self.max_features) if df >= min_df]
+        if not terms:
+            return
+        vocabulary = {term: column for column, term in enumerate(terms)}
+        idf = np.array(
+            [math.log((1 + len(sample)) / (1 + doc_freq[t])) + 1.0 for t in terms],
+            dtype=np.float32,
+        )
+        self._model = _Model(vocabulary, idf, np.zeros((0, 0), dtype=np.float32))
+        rank = min(self.dimensions, len(sample), len(terms))
+        components = truncated_svd(self._tfidf_rows(sample), rank, seed=self.seed)
+        self._model = self._model._replace(components=components)
+
+        # Embed the whole corpus in one product rather than profile by profile
+        vectors = self._embed_all(counts)
+        self._storage = create_vector_storage(
+            self.quantization, rank, self.pq_subspaces, self.seed
+        )
+        self._storage.train(vectors[: self.fit_sample])
+        self._storage.add(vectors)
+        self._ids = [profile.get("id") for profile in profiles]
+        self._profiles = profiles
+        self._fitted_size = len(profiles)
+        self._maybe_build_ann(vectors)
+
+    def _embed_all(self, counts: Sequence[Counter]) -> np.ndarray:
+        components = np.ascontiguousarray(self._model.components.T)
+        vectors = self._tfidf_rows(counts).dot(components)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    def _maybe_build_ann(self, vectors: Optional[np.ndarray] = None) -> None:
+        if (
+            self._ann is None
+            and self.ann_min_size is not None
+            and len(self._ids) >= self.ann_min_size
+        ):
+            self._ann = IVFIndex.train(
+                self.vectors if vectors is None else vectors,
+                self.ann_lists,
+                self.nprobe,
+                seed=self.seed,
+            )
+
+    def sync(self, profiles: Sequence[Dict]) -> None:
+        """Index ``profiles``, refitting the model if they changed or grew enough."""
+        if (
+            self._model is None
+            or not self._extends(profiles)
+            or len(profiles) >= self.refit_growth * self._fitted_size
+        ):
+            self.fit(profiles)
+        else:
+            super().sync(profiles)
+            self._profiles = profiles
+
+    def add(self, profile: Dict) -> int:
+        """Embed ``profile`` with the current model and return its position."""
+        position = len(self._ids)
+        vector = self.embed(self._term_counts(profile))
+        self._storage.add(vector[None])
+        self._ids.append(profile.get("id"))
+        if self._ann is not None:
+            self._ann.add(vector, position)
+        else:
+            self._maybe_build_ann()
+        return position
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        min_similarity: float = 0.0,
+        nprobe: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[Tuple[int, float]]:
+        """Rank indexed profiles by cosine similarity to ``query``.
+
+        Once the IVF index is built only the profiles in the ``nprobe`` lists
+        closest to the query are scored, unless ``exact`` is set.
+        Only profiles more similar than ``min_similarity`` are returned.
+        """
+        if self._model is None or not self._ids:
+            return []
+        counts = Counter(tokenize(query, self.stemming))
+        query_vector = self.embed(counts)
+        if not query_vector.any():
+            return []
+        if self._ann is None or exact:
+            positions = np.arange(len(self._ids))
+            similarities = self._storage.scores(query_vector)
+        else:
+            positions = self._ann.probe(query_vector, nprobe)
+            similarities = self._storage.scores(query_vector, positions)
+
+        if self.quantization is not None and self.rerank_factor > 0:
+            depth = len(positions) if limit is None else limit * self.rerank_factor
+            if depth < len(positions):
+                keep = np.argpartition(-similarities, depth - 1)[:depth]
+                positions = positions[keep]
+            similarities = self._exact_similarities(query_vector, positions)
+
+        matched = np.flatnonzero(similarities > min_similarity)
+        if limit is not None and len(matched) > limit:
+            matched = matched[
+                np.argpartition(-similarities[matched], limit - 1)[:limit]
+            ]
+        order = np.lexsort((positions[matched], -similarities[matched]))
+        return [
+            (int(positions[matched[i]]), float(similarities[matched[i]])) for i in order
+        ]
+
+    def _exact_similarities(
+        self, query_vector: np.ndarray, positions: np.ndarray
+    ) -> np.ndarray:
+        """Score profiles against the query with freshly computed embeddings."""
+        if not len(positions):
+            return np.zeros(0, dtype=np.float32)
+        counts = [self._term_counts(self._profiles[int(p)]) for p in positions]
+        return self._embed_all(counts) @ query_vector
@@ -0,0 +1,129 @@
+"""Streaming parsers for bulk profile uploads.
+
+An upload is either NDJSON (one JSON record per line) or a single JSON array
+of records. Both are parsed incrementally from the request body, so memory use
+does not depend on the size of the upload.
+"""
+
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Optional, Tuple
+
+# A parsed record, or the reason it could not be parsed
+UploadRecord = Tuple[Optional[Any], Optional[str]]
+
+_WHITESPACE = " \t\r\n"
+
+
+async def _iter_text(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+async def _iter_ndjson(
+    head: str, texts: AsyncIterator[str]
+) -> AsyncIterator[UploadRecord]:
+    buffer = head
+    while True:
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                yield _parse_line(line)
+        try:
+            buffer += await texts.__anext__()
+        except StopAsyncIteration:
+            break
+    if buffer.strip():
+        yield _parse_line(buffer)
+
+
+def _parse_line(line: str) -> UploadRecord:
+    try:
+        return json.loads(line), None
+    except json.JSONDecodeError as e:
+        return None, f"Invalid JSON: {e}"
+
+
+async def _iter_json_array(
+    head: str, texts: AsyncIterator[str]
+) -> AsyncIterator[UploadRecord]:
+    decoder = json.JSONDecoder()
+    buffer = head
+    pos = buffer.index("[") + 1
+    # "first": a value or "]"; "value": a value; "next": "," or "]"
+    state = "first"
+    eof = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos < len(buffer):
+            char = buffer[pos]
+            if char == "]" and state != "value":
+                return
+            if state == "next":
+                if char != ",":
+                    yield None, f"Invalid JSON array: unexpected {char!r}"
+                    return
+                pos += 1
+                state = "value"
+                continue
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof:
+                    yield None, f"Invalid JSON: {e}"
+                    return
+            else:
+                # A value running to the end of the buffer may be cut short
+                if end < len(buffer) or eof:
+                    yield record, None
+                    pos = end
+                    state = "next"
+                    continue
+        if eof:
+            yield None, "Invalid JSON array: unexpected end of upload"
+            return
+        try:
+            buffer = buffer[pos:] + await texts.__anext__()
+            pos = 0
+        except StopAsyncIteration:
+            eof = True
+
+
+async def iter_upload_records(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[UploadRecord]:
+    """Yield the records of an NDJSON or JSON-array upload as they arrive.
+
+    The format is detected from the first non-whitespace character. A line of
+    NDJSON that fails to parse is reported and skipped; a syntax error in a
+    JSON array ends the upload, since the rest cannot be located reliably.
+
+    Args:
+        chunks: The raw upload body
+
+    Yields:
+        UploadRecord: ``(record, None)`` for each parsed record, or
+            ``(None, reason)`` for one that could not be parsed
+    """
+    texts = _iter_text(chunks).__aiter__()
+    head = ""
+    async for text in texts:
+        head += text
+        if head.strip():
+            break
+    if not head.strip():
+        return
+
+    if head.lstrip()[0] == "[":
+        records = _iter_json_array(head, texts)
+    else:
+        records = _iter_ndjson(head, texts)
+    async for record in records:
+        yield record
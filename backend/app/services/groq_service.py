@@ -8,12 +8,63 @@ This module provides integration with Groq's LLM API for:
 
 import asyncio
 import json
+import logging
 import os
 import sys
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import httpx
+from app.core.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    Priority,
+    SharedPriority,
+)
+from app.core.batching import MicroBatcher
 from app.core.config import settings
+from app.core.resilience import AdaptiveTimeout, CircuitBreaker, CircuitOpenError
+from app.search.hybrid import reciprocal_rank_fusion
+from app.search.lexical import LexicalIndex
+from app.search.vector import VectorIndex
+from app.services.profile_service import data_directory
+from app.services.search_cache import SearchCache
+
+logger = logging.getLogger(__name__)
+
+
+def _format_profile(index: int, profile: Dict[str, Any]) -> str:
+    return (
+        f"Profile {index+1}:\nName: {profile['name']}\nBio: {profile['bio']}\n"
+        f"Skills: {', '.join(profile['skills'])}\n"
+        f"Interests: {', '.join(profile['interests'])}"
+    )
+
+
+def _estimate_tokens(text: str) -> int:
+    # Llama tokenizers average about four characters of English per token
+    return len(text) // 4 + 1
+
+
+def _with_score(profile: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    profile_copy = profile.copy()
+    profile_copy["score"] = result.get("score", 0) / 100.0  # Normalize to 0-1
+    profile_copy["match_reason"] = result.get("reasoning", "")
+    return profile_copy
+
+
+# A search waiting to be batched: query, shortlist and admission priority
+_BatchItem = Tuple[str, List[Dict[str, Any]], Priority]
+
+# Completion tokens budgeted per profile for its score and reasoning
+_RESPONSE_TOKENS_PER_PROFILE = 30
+
+# Admission priorities of Groq requests; lower values are admitted first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+# Calls whose caller stopped waiting, finishing only to warm the cache
+PRIORITY_LOW = 2
 
 
 class GroqService:
@@ -24,139 +75,682 @@ class GroqService:
         self.api_key = settings.GROQ_API_KEY
         self.base_url = "https://api.groq.com/openai/v1"
         self.model = "llama3-70b-8192"  # Using Llama 3 for high quality results
+        self.lexical_index = LexicalIndex(stemming=settings.LEXICAL_STEMMING)
+        self.vector_index = VectorIndex(
+            dimensions=settings.VECTOR_DIMENSIONS,
+            stemming=settings.LEXICAL_STEMMING,
+            ann_min_size=settings.VECTOR_ANN_MIN_PROFILES,
+            ann_lists=settings.VECTOR_ANN_LISTS or None,
+            nprobe=settings.VECTOR_ANN_NPROBE,
+            quantization=settings.VECTOR_QUANTIZATION,
+            pq_subspaces=settings.VECTOR_PQ_SUBSPACES,
+            rerank_factor=settings.VECTOR_RERANK_FACTOR,
+        )
+        self.cache = SearchCache(
+            max_entries=settings.SEARCH_CACHE_SIZE,
+            ttl=settings.SEARCH_CACHE_TTL_SECONDS,
+            db_file=(
+                data_directory() / "search_cache.sqlite3"
+                if settings.SEARCH_CACHE_DISK_ENTRIES
+                else None
+            ),
+            disk_entries=settings.SEARCH_CACHE_DISK_ENTRIES,
+            disk_ttl=settings.SEARCH_CACHE_DISK_TTL_SECONDS,
+        )
+        # The indexes are updated from worker threads as well as the event loop
+        self._lexical_lock = threading.Lock()
+        self._vector_lock = threading.Lock()
+
+        # Created on first use, or by ``start`` at application startup
+        self._client: Optional[httpx.AsyncClient] = None
+        # Fail fast to local search while Groq is failing or abnormally slow
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.GROQ_BREAKER_FAILURES,
+            reset_timeout=settings.GROQ_BREAKER_RESET_SECONDS,
+            half_open_calls=settings.GROQ_BREAKER_HALF_OPEN_CALLS,
+        )
+        self.read_timeout = AdaptiveTimeout(
+            minimum=settings.GROQ_MIN_READ_TIMEOUT_SECONDS,
+            maximum=settings.GROQ_READ_TIMEOUT_SECONDS,
+            percentile=settings.GROQ_TIMEOUT_PERCENTILE,
+            multiplier=settings.GROQ_TIMEOUT_MULTIPLIER,
+        )
+        # Shared by every search, so bursts queue here instead of being
+        # rejected by Groq with 429s
+        self.admission = AdmissionController(
+            max_in_flight=settings.GROQ_MAX_IN_FLIGHT,
+            requests_per_minute=settings.GROQ_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.GROQ_TOKENS_PER_MINUTE,
+            max_queue=settings.GROQ_MAX_QUEUE,
+            queue_timeout=settings.GROQ_QUEUE_TIMEOUT_SECONDS,
+        )
+        # Concurrent searches share one Groq prompt within this window
+        self.batcher: MicroBatcher[_BatchItem, Optional[List[Dict[str, Any]]]] = (
+            MicroBatcher(
+                self._rank_batch,
+                window=settings.LLM_BATCH_WINDOW_MS / 1000,
+                max_size=settings.LLM_BATCH_MAX_QUERIES,
+            )
+        )
+        # LLM calls outliving their deadline, finishing to warm the cache
+        self._background: Set[asyncio.Future] = set()
 
         # In test environment, don't raise an error for missing API key
         self.is_test = os.getenv("ENVIRONMENT") == "test"
         if not self.api_key and not self.is_test:
             raise ValueError("GROQ_API_KEY is not set in environment variables")
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled HTTP client shared by every Groq request.
+
+        Connections are kept alive between searches, so only the first
+        request to Groq pays for the TCP and TLS handshakes.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> httpx.AsyncClient:
+        options = {
+            "limits": httpx.Limits(
+                max_connections=settings.GROQ_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GROQ_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.GROQ_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            "timeout": httpx.Timeout(
+                settings.GROQ_READ_TIMEOUT_SECONDS,
+                connect=settings.GROQ_CONNECT_TIMEOUT_SECONDS,
+            ),
+        }
+        try:
+            return httpx.AsyncClient(http2=settings.GROQ_HTTP2, **options)
+        except ImportError:
+            # HTTP/2 needs the h2 package: pip install "httpx[http2]"
+            logger.warning("HTTP/2 support is not installed, using HTTP/1.1 for Groq")
+            return httpx.AsyncClient(**options)
+
+    async def start(self) -> None:
+        """Open the shared HTTP client; called at application startup."""
+        if self._client is None:
+            self._client = self._create_client()
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        for task in list(self._background):
+            task.cancel()
+        self.batcher.close()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     async def get_semantic_search_results(
-        self, query: str, profiles: List[Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+        self,
+        query: str,
+        profiles: List[Dict[str, Any]],
+        candidates: Optional[int] = None,
+        generation: Optional[int] = None,
+        priority: Union[int, Priority] = PRIORITY_NORMAL,
+    ) -> Tuple[List[Dict[str, Any]], str]:
         """
         Perform semantic search on profiles using Groq LLM.
 
+        Retrieval happens in two stages. The local indexes pick the
+        ``candidates`` best matches, and only those are sent to Groq to be
+        re-ranked and explained, so the prompt stays the same size however
+        large the corpus grows.
+
         Args:
             query: The search query
             profiles: List of profile dictionaries to search through
+            candidates: Number of profiles sent to the LLM; defaults to
+                ``SEMANTIC_CANDIDATES``
+            generation: Generation of the profile store ``profiles`` were read
+                from. If given, LLM rankings are cached under it and the
+                normalized query, and repeated searches skip Groq
+            priority: Admission priority of the Groq requests, such as
+                ``PRIORITY_HIGH`` or ``PRIORITY_NORMAL``; a ``Priority``
+                changed during the search applies to requests still waiting
 
         Returns:
-            List of profile dictionaries with added relevance scores
+            List of profile dictionaries with added relevance scores, and the
+            tier that produced them: "llm", or "lexical" if Groq was
+            unavailable and the local fallback answered
         """
         if not profiles:
-            return []
+            return [], "llm"
+
+        ranked_profiles = await self.get_llm_search_results(
+            query, profiles, candidates, generation, priority
+        )
+        if ranked_profiles is None:
+            return self._fallback_search(query, profiles), "lexical"
+        return ranked_profiles, "llm"
+
+    async def get_search_results_within(
+        self,
+        query: str,
+        profiles: List[Dict[str, Any]],
+        deadline: float,
+        candidates: Optional[int] = None,
+        generation: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Perform semantic search, settling for local results past a deadline.
+
+        Lexical scoring and the Groq ranking start together. The LLM ranking
+        is returned if it arrives within ``deadline``; otherwise the lexical
+        results are. A late LLM call is left to finish in the background, so
+        its ranking is cached for the next identical search. Its Groq
+        requests are admitted ahead of those of searches without a deadline.
+
+        Args:
+            query: The search query
+            profiles: List of profile dictionaries to search through
+            deadline: Seconds to wait for the LLM ranking
+            candidates: Number of profiles sent to the LLM
+            generation: Generation of the profile store, for caching
+
+        Returns:
+            The matches, and the tier that produced them: "llm" or "lexical"
+        """
+        if not profiles:
+            return [], "llm"
+
+        priority = Priority(PRIORITY_HIGH)
+        llm = asyncio.ensure_future(
+            self.get_llm_search_results(
+                query, profiles, candidates, generation, priority
+            )
+        )
+        lexical = asyncio.ensure_future(
+            self.get_lexical_search_results(query, profiles)
+        )
+        await asyncio.wait({llm}, timeout=deadline)
+
+        if llm.done():
+            if not llm.cancelled() and llm.exception() is None:
+                ranked_profiles = llm.result()
+                if ranked_profiles is not None:
+                    lexical.cancel()
+                    return ranked_profiles, "llm"
+        else:
+            # Nobody waits for the answer any more: live searches go first
+            priority.value = PRIORITY_LOW
+            self._background.add(llm)
+            llm.add_done_callback(self._finish_background)
+        return await lexical, "lexical"
+
+    def _finish_background(self, task: asyncio.Future) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Groq API error after deadline: %s", task.exception())
+
+    async def get_llm_search_results(
+        self,
+        query: str,
+        profiles: List[Dict[str, Any]],
+        candidates: Optional[int] = None,
+        generation: Optional[int] = None,
+        priority: Union[int, Priority] = PRIORITY_NORMAL,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rank profiles with Groq, without falling back to local search.
+
+        Takes the same arguments as ``get_semantic_search_results``.
+
+        Returns:
+            The LLM ranking, or None if Groq is unavailable, failed or is
+            too busy to admit the request
+        """
+        limit = candidates or settings.SEMANTIC_CANDIDATES
+        cache_key = None
+        if generation is not None:
+            cache_key = self.cache.key(query, generation, limit)
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
 
         # For testing purposes, use the fallback search if running the test script
         if self.is_test or (sys.argv and "test_semantic_search.py" in sys.argv[0]):
             print("Using fallback search for testing...")
-            return self._fallback_search(query, profiles)
+            return None
+
+        if self.breaker.state == CircuitBreaker.OPEN:
+            # Groq has been failing; answer locally without waiting for it
+            return None
+
+        # Indexing a large corpus for the first time blocks for a while
+        shortlist = await asyncio.to_thread(
+            self._retrieve_candidates, query, profiles, limit
+        )
+        if not shortlist:
+            return []
 
+        if not isinstance(priority, Priority):
+            priority = Priority(priority)
+        ranked_profiles = await self._rank_with_llm(query, shortlist, priority)
+        # Fallback results are not cached, so the LLM is tried again next time
+        if ranked_profiles is not None and cache_key is not None:
+            await self.cache.put(cache_key, generation, ranked_profiles)
+        return ranked_profiles
+
+    async def _rank_with_llm(
+        self, query: str, shortlist: List[Dict[str, Any]], priority: Priority
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Have Groq score the shortlisted profiles.
+
+        Returns:
+            The matching profiles, best first, or None if Groq failed
+        """
+        chunks = self._chunk_profiles(shortlist, settings.LLM_CHUNK_TOKENS)
+        if self.batcher.window > 0 and len(chunks) == 1:
+            # Small enough to share a prompt with concurrent searches
+            try:
+                return await self.batcher.submit((query, shortlist, priority))
+            except Exception as e:
+                logger.error("Groq API error: %s", e)
+                return None
+
+        # Rank token-budgeted chunks of the shortlist concurrently
+        semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        chunk_results = await asyncio.gather(
+            *(
+                self._rank_chunk(self.client, semaphore, query, chunk, priority)
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+
+        for ranked in chunk_results:
+            if isinstance(ranked, BaseException):
+                logger.error("Groq API error: %s", ranked)
+                return None
+            if ranked is None:
+                return None
+
+        # Scores are absolute (0-100), so the chunk rankings merge directly
+        ranked_profiles = [profile for ranked in chunk_results for profile in ranked]
+        ranked_profiles.sort(key=lambda x: x["score"], reverse=True)
+        return ranked_profiles
+
+    async def _post_chat(
+        self,
+        client: httpx.AsyncClient,
+        prompt: str,
+        tokens: int,
+        priority: Priority,
+    ) -> httpx.Response:
+        """
+        Send one chat completion request through the circuit breaker.
+
+        The breaker is consulted before admission control, so while the
+        circuit is open requests neither wait for nor spend the rate limits.
+        The read timeout follows recent Groq latencies, so an outlier is cut
+        short and counted as a failure rather than waited out.
+
+        Args:
+            client: The HTTP client to send the request with
+            prompt: The user message
+            tokens: Estimated tokens the request consumes, for rate limiting
+            priority: Admission priority of the request
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            AdmissionRejected: If the request could not be admitted in time
+            httpx.HTTPError: If the request fails or times out
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("Groq circuit breaker is open")
+        try:
+            async with self.admission.admit(tokens, priority):
+                # Time spent queued for admission is not Groq's latency
+                started = time.perf_counter()
+                response = await client.post(
+                    f"{self.base_url}/chat/completions",
+                    headers={
+                        "Authorization": f"Bearer {self.api_key}",
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "model": self.model,
+                        "messages": [
+                            {
+                                "role": "system",
+                                "content": "You are a semantic search engine that analyzes profiles and returns relevant matches as JSON. You excel at understanding natural language queries and finding semantic matches beyond just keyword matching.",
+                            },
+                            {"role": "user", "content": prompt},
+                        ],
+                        "temperature": 0.1,  # Low temperature for consistent results
+                        "response_format": {"type": "json_object"},
+                    },
+                    timeout=httpx.Timeout(
+                        self.read_timeout.value,
+                        connect=settings.GROQ_CONNECT_TIMEOUT_SECONDS,
+                    ),
+                )
+                response.raise_for_status()
+        except AdmissionRejected:
+            # Groq was not called: no verdict on it
+            self.breaker.release()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled, for example at shutdown: no verdict on Groq
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        self.read_timeout.observe(time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def _chunk_profiles(
+        profiles: List[Dict[str, Any]], budget: int
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Split profiles into consecutive chunks that fit one prompt each.
+
+        Args:
+            profiles: Profiles to split, in order
+            budget: Estimated prompt tokens allowed per chunk; a profile
+                larger than that gets a chunk of its own
+
+        Returns:
+            The chunks, covering every profile once
+        """
+        chunks: List[List[Dict[str, Any]]] = []
+        used = 0
+        for profile in profiles:
+            tokens = _estimate_tokens(_format_profile(0, profile))
+            if not chunks or used + tokens > budget:
+                chunks.append([])
+                used = 0
+            chunks[-1].append(profile)
+            used += tokens
+        return chunks
+
+    async def _rank_chunk(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        query: str,
+        chunk: List[Dict[str, Any]],
+        priority: Priority,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Have Groq score one chunk of profiles against the query.
+
+        Profiles are numbered from 1 within the chunk, and the returned
+        ``profile_index`` values are mapped back through the chunk.
+
+        Returns:
+            Copies of the matching profiles with score and match reason, or
+            None if the response could not be used
+        """
         # Format profiles for the prompt
         profiles_text = "\n\n".join(
-            [
-                f"Profile {i+1}:\nName: {p['name']}\nBio: {p['bio']}\n"
-                f"Skills: {', '.join(p['skills'])}\n"
-                f"Interests: {', '.join(p['interests'])}"
-                for i, p in enumerate(profiles)
-            ]
+            [_format_profile(i, p) for i, p in enumerate(chunk)]
         )
 
         # Create prompt for semantic search
         prompt = f"""
         I have the following user profiles:
-        
+
         {profiles_text}
-        
+
         Search query: "{query}"
-        
+
         Analyze these profiles and rank them by relevance to the search query.
         Consider skills, interests, bio, and name, with skills being most important.
         Return a JSON object with the following structure:
         {{
           "results": [
             {{
-              "profile_index": 1, 
-              "score": 85, 
+              "profile_index": 1,
+              "score": 85,
               "reasoning": "brief explanation of why this profile matches"
             }},
             ...
           ]
         }}
-        
+
         Only include profiles with some relevance (score > 0).
         Be sure to understand the semantic meaning of the query and match based on concepts, not just keywords.
         Use a score of 0-100 where 100 is a perfect match and 0 is no match at all.
         """
 
+        # Call Groq API for semantic search, once admitted under the limits
+        tokens = _estimate_tokens(prompt) + _RESPONSE_TOKENS_PER_PROFILE * len(chunk)
+        async with semaphore:
+            response = await self._post_chat(client, prompt, tokens, priority)
+
+        results = self._parse_results(response)
+        if results is None:
+            return None
+
+        # Map the results back to the profiles of this chunk
+        ranked_profiles = []
+        for result in results:
+            profile_idx = result.get("profile_index", 0) - 1
+            if 0 <= profile_idx < len(chunk):
+                ranked_profiles.append(_with_score(chunk[profile_idx], result))
+        return ranked_profiles
+
+    async def _rank_batch(
+        self, batch: List[_BatchItem]
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Have Groq score the shortlists of concurrent searches together.
+
+        Searches are grouped so that the union of their shortlists fits one
+        prompt, and each group costs one Groq request listing every profile
+        once, however many of its searches shortlisted it.
+
+        Args:
+            batch: The query, shortlist and priority of each search; every
+                shortlist fits one prompt on its own
+
+        Returns:
+            The ranking of each search, in order, or None where Groq failed
+        """
+        groups: List[List[_BatchItem]] = []
+        # Profile tokens of each group, counting shared profiles once
+        group_tokens: Dict[Any, int] = {}
+        for search in batch:
+            tokens = {
+                p["id"]: _estimate_tokens(_format_profile(0, p)) for p in search[1]
+            }
+            merged = {**group_tokens, **tokens}
+            if not groups or sum(merged.values()) > settings.LLM_CHUNK_TOKENS:
+                groups.append([])
+                merged = tokens
+            groups[-1].append(search)
+            group_tokens = merged
+
+        semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        group_results = await asyncio.gather(
+            *(self._rank_group(self.client, semaphore, group) for group in groups),
+            return_exceptions=True,
+        )
+
+        rankings: List[Optional[List[Dict[str, Any]]]] = []
+        for group, ranked in zip(groups, group_results):
+            if isinstance(ranked, BaseException):
+                logger.error("Groq API error: %s", ranked)
+                ranked = [None] * len(group)
+            rankings.extend(ranked)
+        return rankings
+
+    async def _rank_group(
+        self,
+        client: httpx.AsyncClient,
+        semaphore: asyncio.Semaphore,
+        group: List[_BatchItem],
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        """
+        Have Groq score several queries against their shared profiles.
+
+        Returns:
+            The ranking of each query in ``group``, best first, restricted to
+            its own shortlist, or None for every query if the response could
+            not be used
+        """
+        if len(group) == 1:
+            query, shortlist, priority = group[0]
+            ranked = await self._rank_chunk(
+                client, semaphore, query, shortlist, priority
+            )
+            if ranked is not None:
+                ranked.sort(key=lambda x: x["score"], reverse=True)
+            return [ranked]
+
+        # Each profile is listed once, however many queries shortlisted it
+        profiles = list(
+            {p["id"]: p for _, shortlist, _ in group for p in shortlist}.values()
+        )
+        profiles_text = "\n\n".join(
+            [_format_profile(i, p) for i, p in enumerate(profiles)]
+        )
+        queries_text = "\n".join(
+            f'Query {i+1}: "{query}"' for i, (query, _, _) in enumerate(group)
+        )
+
+        prompt = f"""
+        I have the following user profiles:
+
+        {profiles_text}
+
+        Search queries:
+        {queries_text}
+
+        For each query separately, analyze these profiles and rank them by relevance to that query.
+        Consider skills, interests, bio, and name, with skills being most important.
+        Return a JSON object with the following structure:
+        {{
+          "results": [
+            {{
+              "query_index": 1,
+              "profile_index": 1,
+              "score": 85,
+              "reasoning": "brief explanation of why this profile matches the query"
+            }},
+            ...
+          ]
+        }}
+
+        Only include query and profile pairs with some relevance (score > 0).
+        Be sure to understand the semantic meaning of each query and match based on concepts, not just keywords.
+        Use a score of 0-100 where 100 is a perfect match and 0 is no match at all.
+        """
+
+        tokens = _estimate_tokens(prompt) + _RESPONSE_TOKENS_PER_PROFILE * sum(
+            len(shortlist) for _, shortlist, _ in group
+        )
+        priority = SharedPriority(priority for _, _, priority in group)
+        async with semaphore:
+            response = await self._post_chat(client, prompt, tokens, priority)
+
+        results = self._parse_results(response)
+        if results is None:
+            return [None] * len(group)
+
+        # Fan the results out to the queries, each within its own shortlist
+        allowed = [{p["id"] for p in shortlist} for _, shortlist, _ in group]
+        rankings: List[List[Dict[str, Any]]] = [[] for _ in group]
+        for result in results:
+            query_idx = result.get("query_index", 0) - 1
+            profile_idx = result.get("profile_index", 0) - 1
+            if (
+                0 <= query_idx < len(group)
+                and 0 <= profile_idx < len(profiles)
+                and profiles[profile_idx]["id"] in allowed[query_idx]
+            ):
+                rankings[query_idx].append(_with_score(profiles[profile_idx], result))
+        for ranked in rankings:
+            ranked.sort(key=lambda x: x["score"], reverse=True)
+        return rankings
+
+    @staticmethod
+    def _parse_results(response: httpx.Response) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract the ``results`` list from a chat completion response.
+
+        Returns:
+            The results, or None if the response content is not usable
+        """
+        result = response.json()
+
+        # Extract the JSON response
+        content = result["choices"][0]["message"]["content"]
         try:
-            # Call Groq API for semantic search
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "system",
-                                "content": "You are a semantic search engine that analyzes profiles and returns relevant matches as JSON. You excel at understanding natural language queries and finding semantic matches beyond just keyword matching.",
-                            },
-                            {"role": "user", "content": prompt},
-                        ],
-                        "temperature": 0.1,  # Low temperature for consistent results
-                        "response_format": {"type": "json_object"},
-                    },
-                )
+            search_results = json.loads(content)
+        except json.JSONDecodeError as e:
+            print(f"JSON decode error: {str(e)}")
+            print(f"Original content: {content}")
+            return None
+
+        # For debugging
+        print(f"Groq API Response: {json.dumps(search_results, indent=2)}")
+
+        # Check if results key exists
+        if "results" not in search_results:
+            print("No 'results' key in response, using fallback search")
+            return None
+        return search_results.get("results", [])
+
+    def _retrieve_candidates(
+        self, query: str, profiles: List[Dict[str, Any]], limit: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Pick the profiles worth re-ranking with the LLM.
 
-                response.raise_for_status()
-                result = response.json()
-
-                # Extract the JSON response
-                content = result["choices"][0]["message"]["content"]
-                try:
-                    search_results = json.loads(content)
-
-                    # For debugging
-                    print(f"Groq API Response: {json.dumps(search_results, indent=2)}")
-
-                    # Check if results key exists
-                    if "results" not in search_results:
-                        print("No 'results' key in response, using fallback search")
-                        return self._fallback_search(query, profiles)
-
-                    # Map the results back to the original profiles
-                    ranked_profiles = []
-                    for result in search_results.get("results", []):
-                        profile_idx = result.get("profile_index", 0) - 1
-                        if 0 <= profile_idx < len(profiles):
-                            profile_copy = profiles[profile_idx].copy()
-                            profile_copy["score"] = (
-                                result.get("score", 0) / 100.0
-                            )  # Normalize to 0-1
-                            profile_copy["match_reason"] = result.get("reasoning", "")
-                            ranked_profiles.append(profile_copy)
-                except json.JSONDecodeError as e:
-                    print(f"JSON decode error: {str(e)}")
-                    print(f"Original content: {content}")
-                    return self._fallback_search(query, profiles)
-
-                # Sort by score (highest first)
-                ranked_profiles.sort(key=lambda x: x["score"], reverse=True)
-                return ranked_profiles
-
-        except Exception as e:
-            # Fallback to basic search if Groq API fails
-            print(f"Groq API error: {str(e)}")
-            return self._fallback_search(query, profiles)
+        ``SEMANTIC_RETRIEVER`` selects the lexical index, the vector index,
+        or both merged by reciprocal rank fusion. A store no larger than
+        ``limit`` is sent whole.
+
+        Args:
+            query: The search query
+            profiles: List of profile dictionaries to search through
+            limit: Maximum number of candidates
+
+        Returns:
+            The candidate profiles, best local match first
+        """
+        if len(profiles) <= limit:
+            return list(profiles)
+
+        retriever = settings.SEMANTIC_RETRIEVER
+        if retriever not in ("lexical", "vector", "hybrid"):
+            raise ValueError(f"Unknown semantic retriever: {retriever}")
+        rankings = []
+        if retriever != "vector":
+            with self._lexical_lock:
+                self.lexical_index.sync(profiles)
+                rankings.append(self.lexical_index.search(query, limit=limit))
+        if retriever != "lexical":
+            with self._vector_lock:
+                self.vector_index.sync(profiles)
+                rankings.append(
+                    self.vector_index.search(
+                        query,
+                        limit=limit,
+                        min_similarity=settings.VECTOR_MIN_SIMILARITY,
+                    )
+                )
+        return [profiles[p] for p in reciprocal_rank_fusion(rankings, limit)]
 
     def _fallback_search(
         self, query: str, profiles: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
         """
-        Fallback search method using basic text matching if Groq API fails.
+        Fallback search method using the local BM25 index if Groq API fails.
+
+        The index follows ``profiles`` incrementally, so only profiles added
+        since the previous search are tokenized. Scores are relative to the
+        best match, which scores 1.
 
         Args:
             query: The search query
@@ -165,164 +759,86 @@ class GroqService:
         Returns:
             List of profile dictionaries with added relevance scores
         """
-        query = query.lower()
+        with self._lexical_lock:
+            self.lexical_index.sync(profiles)
+            ranked = self.lexical_index.search(query, limit=settings.LOCAL_SEARCH_LIMIT)
+        if not ranked:
+            return []
+
+        best_score = ranked[0][1]
         matches = []
+        for position, score in ranked:
+            profile_copy = profiles[position].copy()
+            profile_copy["score"] = round(score / best_score, 4)
+            profile_copy["match_reason"] = self._match_reason(profile_copy, query)
+            matches.append(profile_copy)
+        return matches
 
-        # Split query into terms for better matching
-        query_terms = query.lower().split()
+    async def get_lexical_search_results(
+        self, query: str, profiles: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform keyword search on profiles without calling Groq.
 
-        for profile in profiles:
-            profile_copy = profile.copy()
-            score = 0
-            match_reason = []
-
-            # Check name (weight: 1)
-            if any(term in profile_copy["name"].lower() for term in query_terms):
-                score += 10
-                match_reason.append(f"Name matches search terms")
-
-            # Check bio (weight: 1)
-            bio_matches = [
-                term for term in query_terms if term in profile_copy["bio"].lower()
-            ]
-            if bio_matches:
-                score += len(bio_matches) * 5
-                match_reason.append(f"Bio contains relevant terms")
-
-            # Check skills (weight: 2)
-            skill_matches = []
-            for skill in profile_copy["skills"]:
-                skill_lower = skill.lower()
-                for term in query_terms:
-                    if term in skill_lower:
-                        score += 20
-                        skill_matches.append(skill)
-                        break
-
-            if skill_matches:
-                match_reason.append(f"Skills match: {', '.join(skill_matches[:2])}")
-
-            # Check interests (weight: 1.5)
-            interest_matches = []
-            for interest in profile_copy["interests"]:
-                interest_lower = interest.lower()
-                for term in query_terms:
-                    if term in interest_lower:
-                        score += 15
-                        interest_matches.append(interest)
-                        break
-
-            if interest_matches:
-                match_reason.append(
-                    f"Interests match: {', '.join(interest_matches[:2])}"
-                )
+        This is the ranking used as the fallback; see ``_fallback_search``.
+        It runs in a worker thread, since indexing a large corpus for the
+        first time takes a while.
+        """
+        return await asyncio.to_thread(self._fallback_search, query, profiles)
 
-            # Check for specific role matches
-            roles = [
-                "developer",
-                "engineer",
-                "scientist",
-                "designer",
-                "manager",
-                "specialist",
-                "expert",
-            ]
-            for role in roles:
-                if role in query.lower() and role in profile_copy["bio"].lower():
-                    score += 25
-                    match_reason.append(f"Role '{role}' matches")
-
-            # Add semantic-like matching for common terms
-            semantic_matches = {
-                "ml": [
-                    "machine learning",
-                    "deep learning",
-                    "ai",
-                    "artificial intelligence",
-                    "neural networks",
-                ],
-                "ai": [
-                    "artificial intelligence",
-                    "machine learning",
-                    "deep learning",
-                    "neural networks",
-                ],
-                "frontend": [
-                    "ui",
-                    "user interface",
-                    "react",
-                    "angular",
-                    "vue",
-                    "javascript",
-                    "web",
-                ],
-                "backend": [
-                    "server",
-                    "api",
-                    "database",
-                    "node",
-                    "django",
-                    "flask",
-                    "fastapi",
-                ],
-                "cloud": [
-                    "aws",
-                    "azure",
-                    "gcp",
-                    "infrastructure",
-                    "devops",
-                    "kubernetes",
-                    "docker",
-                ],
-                "mobile": [
-                    "ios",
-                    "android",
-                    "flutter",
-                    "react native",
-                    "cross-platform",
-                ],
-                "data": [
-                    "analytics",
-                    "visualization",
-                    "science",
-                    "scientist",
-                    "analysis",
-                    "statistics",
-                ],
-            }
+    async def get_vector_search_results(
+        self, query: str, profiles: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Perform semantic search on profiles with local LSA embeddings.
 
-            for term, related_terms in semantic_matches.items():
-                if term in query.lower():
-                    for related in related_terms:
-                        if related in profile_copy["bio"].lower() or any(
-                            related in skill.lower() for skill in profile_copy["skills"]
-                        ):
-                            score += 15
-                            match_reason.append(f"Term '{term}' relates to '{related}'")
-                            break
-
-            # Special case for experience level terms
-            experience_terms = [
-                "experienced",
-                "senior",
-                "expert",
-                "specialist",
-                "professional",
-            ]
-            if any(term in query.lower() for term in experience_terms) and any(
-                term in profile_copy["bio"].lower()
-                for term in ["years", "experience", "senior"]
-            ):
-                score += 20
-                match_reason.append("Experience level matches")
-
-            if score > 0:
-                profile_copy["score"] = min(score, 100) / 100.0  # Normalize to 0-1
-                profile_copy["match_reason"] = "; ".join(
-                    match_reason[:3]
-                )  # Limit to top 3 reasons
-                matches.append(profile_copy)
-
-        # Sort by score
-        matches.sort(key=lambda x: x["score"], reverse=True)
+        Runs in-process with no network access. The embedding model is learned
+        from the profiles themselves, so related terms that co-occur in
+        profiles match each other even when the query shares no keyword.
+
+        Args:
+            query: The search query
+            profiles: List of profile dictionaries to search through
+
+        Returns:
+            List of profile dictionaries with cosine similarity as the score
+        """
+        # Learning the model blocks for seconds on a large corpus
+        return await asyncio.to_thread(self._vector_search, query, profiles)
+
+    def _vector_search(
+        self, query: str, profiles: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        with self._vector_lock:
+            self.vector_index.sync(profiles)
+            ranked = self.vector_index.search(
+                query,
+                limit=settings.LOCAL_SEARCH_LIMIT,
+                min_similarity=settings.VECTOR_MIN_SIMILARITY,
+            )
+
+        matches = []
+        for position, similarity in ranked:
+            profile_copy = profiles[position].copy()
+            profile_copy["score"] = round(similarity, 4)
+            profile_copy["match_reason"] = (
+                self._match_reason(profile_copy, query)
+                or "Similar in meaning to the search query"
+            )
+            matches.append(profile_copy)
         return matches
+
+    def _match_reason(self, profile: Dict[str, Any], query: str) -> str:
+        fields = self.lexical_index.matched_fields(profile, query)
+        match_reason = []
+        if "name" in fields:
+            match_reason.append("Name matches search terms")
+        if "bio" in fields:
+            match_reason.append("Bio contains relevant terms")
+        if "skills" in fields:
+            match_reason.append(f"Skills match: {', '.join(fields['skills'][:2])}")
+        if "interests" in fields:
+            match_reason.append(
+                f"Interests match: {', '.join(fields['interests'][:2])}"
+            )
+        return "; ".join(match_reason[:3])  # Limit to top 3 reasons
@@ -1,47 +1,285 @@
 import json
-import os
+import uuid
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
-import aiofiles
-from app.models.profile import Profile
+from app.core.config import settings
+from app.core.etag import make_etag
+from app.models.profile import (
+    BulkImportError,
+    BulkImportResult,
+    Profile,
+    ProfileCreate,
+)
+from app.services.bulk_import import UploadRecord
+from app.storage.base import ProfileStore
+from app.storage.json_store import JSONFileStore
+from app.storage.sqlite_store import SQLiteStore
+from app.storage.writer import GroupCommitWriter
+from pydantic import ValidationError
+
+
+def data_directory() -> Path:
+    """Return the directory holding the profile store and other runtime data."""
+    if settings.PROFILE_DATA_DIR:
+        return Path(settings.PROFILE_DATA_DIR)
+    # Get the absolute path to the backend directory
+    return Path(__file__).parent.parent.parent / "data"
+
+
+def create_profile_store() -> ProfileStore:
+    """Build the storage backend selected by ``settings.PROFILE_STORE_BACKEND``."""
+    data_dir = data_directory()
+    backend = settings.PROFILE_STORE_BACKEND.lower()
+    if backend == "json":
+        return JSONFileStore(
+            data_dir / "profiles.json",
+            compact_threshold=settings.PROFILE_LOG_COMPACT_BYTES,
+        )
+    if backend == "sqlite":
+        return SQLiteStore(data_dir / "profiles.sqlite3")
+    raise ValueError(f"Unknown PROFILE_STORE_BACKEND: {settings.PROFILE_STORE_BACKEND}")
+
+
+def _describe_errors(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'record'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+class CachedBody(NamedTuple):
+    """A serialized JSON response body and its entity tag."""
+
+    body: bytes
+    etag: str
+
+
+class _ResponseCache:
+    """Pre-serialized JSON bodies for one store generation."""
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self.generation: Optional[int] = None
+        self.profile_list: Optional[CachedBody] = None
+        self.profiles: "OrderedDict[str, CachedBody]" = OrderedDict()
+
+    def reset(self, generation: Optional[int] = None) -> None:
+        self.generation = generation
+        self.profile_list = None
+        self.profiles.clear()
+
+    def get_profile(self, profile_id: str) -> Optional[CachedBody]:
+        body = self.profiles.get(profile_id)
+        if body is not None:
+            self.profiles.move_to_end(profile_id)
+        return body
+
+    def put_profile(self, profile_id: str, body: CachedBody) -> None:
+        self.profiles[profile_id] = body
+        if len(self.profiles) > self.max_profiles:
+            self.profiles.popitem(last=False)
 
 
 class ProfileService:
-    def __init__(self):
-        # Get the absolute path to the backend directory
-        backend_dir = Path(__file__).parent.parent.parent
-        self.data_file = backend_dir / "data" / "profiles.json"
-        self.data_file.parent.mkdir(exist_ok=True)
-        if not self.data_file.exists():
-            self.data_file.write_text("[]")
+    """Profile operations on top of a pluggable storage backend.
+
+    Profiles are validated once, when they are written, and stored as the
+    JSON-ready dump of a ``Profile``. Read paths trust the store and hand out
+    those dictionaries as they are, without building models again.
+    """
+
+    def __init__(self, store: Optional[ProfileStore] = None):
+        self.store = store if store is not None else create_profile_store()
+        self.writer = GroupCommitWriter(
+            self.store,
+            max_batch=settings.PROFILE_WRITE_BATCH_SIZE,
+            max_delay=settings.PROFILE_WRITE_BATCH_DELAY_MS / 1000,
+        )
+        self._responses = _ResponseCache(settings.PROFILE_RESPONSE_CACHE_SIZE)
+        # Every profile, with the store generation it was read at
+        self._corpus: Optional[Tuple[int, List[Dict]]] = None
 
     async def _read_profiles(self) -> List[Dict]:
-        async with aiofiles.open(self.data_file, mode='r') as f:
-            content = await f.read()
-            return json.loads(content)
+        return await self.store.list()
 
     async def _write_profiles(self, profiles: List[Dict]) -> None:
-        async with aiofiles.open(self.data_file, mode='w') as f:
-            await f.write(json.dumps(profiles, indent=2))
+        await self.store.replace_all(profiles)
 
-    async def create_profile(self, profile_data: Dict) -> Profile:
+    async def create_profile(self, profile_data: Dict) -> Dict:
+        """Validate a profile and return it once its group commit is durable."""
         try:
-            profiles = await self._read_profiles()
-            profiles.append(profile_data)
-            await self._write_profiles(profiles)
-            return Profile(**profile_data)
+            profile = Profile(**profile_data).model_dump(mode="json")
+            await self.writer.submit(profile)
+            self._responses.reset()
+            return profile
         except Exception as e:
             print(f"Error creating profile: {str(e)}")
             raise
 
-    async def get_profile(self, profile_id: str) -> Optional[Profile]:
-        profiles = await self._read_profiles()
-        for profile in profiles:
-            if profile["id"] == profile_id:
-                return Profile(**profile)
-        return None
+    async def export_ndjson(
+        self, compress: bool = False, batch_size: int = 1000
+    ) -> AsyncIterator[bytes]:
+        """Stream every stored profile as NDJSON, optionally gzip-compressed.
+
+        Records are encoded exactly as stored, without building models, and
+        emitted one store page at a time, so memory use stays constant.
+        """
+        gzip = zlib.compressobj(wbits=31) if compress else None
+        cursor: Optional[int] = 0
+        while cursor is not None:
+            profiles, cursor = await self.store.page(cursor, batch_size)
+            chunk = "".join(json.dumps(profile) + "\n" for profile in profiles).encode()
+            if gzip is not None:
+                chunk = gzip.compress(chunk)
+            if chunk:
+                yield chunk
+        if gzip is not None:
+            yield gzip.flush()
+
+    async def import_profiles(
+        self, records: AsyncIterable[UploadRecord], batch_size: Optional[int] = None
+    ) -> BulkImportResult:
+        """Validate and store a stream of uploaded records.
+
+        Each record is validated against ``ProfileCreate`` and given a new id.
+        Valid records are committed ``batch_size`` at a time, straight to the
+        store; invalid ones are reported by position and skipped.
+        """
+        batch_size = batch_size or settings.PROFILE_IMPORT_BATCH_SIZE
+        created = 0
+        errors: List[BulkImportError] = []
+        batch: List[Dict] = []
+        index = 0
+        async for record, parse_error in records:
+            if parse_error is not None:
+                errors.append(BulkImportError(index=index, error=parse_error))
+            else:
+                try:
+                    profile = ProfileCreate.model_validate(record)
+                except ValidationError as e:
+                    errors.append(
+                        BulkImportError(index=index, error=_describe_errors(e))
+                    )
+                else:
+                    batch.append(
+                        Profile(
+                            **profile.model_dump(), id=str(uuid.uuid4())
+                        ).model_dump(mode="json")
+                    )
+                    if len(batch) >= batch_size:
+                        await self.store.append(batch)
+                        created += len(batch)
+                        batch = []
+            index += 1
+        if batch:
+            await self.store.append(batch)
+            created += len(batch)
+        if created:
+            self._responses.reset()
+        return BulkImportResult(created=created, failed=len(errors), errors=errors)
+
+    async def close(self) -> None:
+        """Flush pending writes and release the storage backend."""
+        await self.writer.close()
+        await self.store.close()
+
+    async def get_profile(self, profile_id: str) -> Optional[Dict]:
+        """Return the stored profile with ``profile_id``, or None."""
+        return await self.store.get(profile_id)
+
+    async def list_profiles(self) -> List[Dict]:
+        """Return every stored profile in insertion order."""
+        return await self.store.list()
+
+    async def search_corpus(self, generation: Optional[int] = None) -> List[Dict]:
+        """Return every profile for searching, read once per store generation.
+
+        Searches share this list instead of reading the whole store per query;
+        it is read again only after a write moves the generation on.
+
+        Args:
+            generation: Current store generation, if already known
+        """
+        if generation is None:
+            generation = await self.store.generation()
+        corpus = self._corpus
+        if corpus is None or corpus[0] != generation:
+            corpus = (generation, await self.list_profiles())
+            self._corpus = corpus
+        return corpus[1]
+
+    async def generation(self) -> int:
+        """Return the current store generation; see ``ProfileStore.generation``."""
+        return await self.store.generation()
+
+    async def _current_responses(self) -> _ResponseCache:
+        # Read the generation before the data, so a cached body is never older
+        # than the generation it is filed under
+        generation = await self.store.generation()
+        if self._responses.generation != generation:
+            self._responses.reset(generation)
+        return self._responses
+
+    async def list_profiles_json(self) -> CachedBody:
+        """Return every profile as a JSON array, serialized once per generation.
+
+        The entity tag is derived from the store generation.
+        """
+        responses = await self._current_responses()
+        cached = responses.profile_list
+        if cached is None:
+            # A write while the store is read resets the cache; the body is
+            # still tagged with, and filed under, the generation it was read at
+            generation = responses.generation
+            cached = CachedBody(
+                json.dumps(await self.store.list()).encode(),
+                make_etag("profiles", generation),
+            )
+            if responses.generation == generation:
+                responses.profile_list = cached
+        return cached
+
+    async def get_profile_json(self, profile_id: str) -> Optional[CachedBody]:
+        """Return one profile as JSON, keeping recently requested ones serialized.
+
+        The entity tag is derived from the profile's ``updated_at``, so it
+        survives writes to other profiles.
+        """
+        responses = await self._current_responses()
+        cached = responses.get_profile(profile_id)
+        if cached is None:
+            generation = responses.generation
+            profile = await self.store.get(profile_id)
+            if profile is None:
+                return None
+            cached = CachedBody(
+                json.dumps(profile).encode(),
+                make_etag("profile", profile_id, profile["updated_at"]),
+            )
+            if responses.generation == generation:
+                responses.put_profile(profile_id, cached)
+        return cached
+
+    async def list_profiles_page(
+        self, after: int, limit: int
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """Return up to ``limit`` profiles after cursor ``after``, and the next cursor."""
+        return await self.store.page(after, limit)
+
+    def iter_profiles(self, after: int = 0) -> AsyncIterator[Dict]:
+        """Yield every profile after cursor ``after``, reading the store in batches."""
+        return self.store.iter(after)
+
 
-    async def list_profiles(self) -> List[Profile]:
-        profiles = await self._read_profiles()
-        return [Profile(**profile) for profile in profiles]
+profile_service = ProfileService()
@@ -0,0 +1,196 @@
+"""Cache of LLM search results.
+
+Groq rankings are slow and cost tokens, while popular queries repeat. Results
+are cached under the normalized query and the generation of the profile
+store, so any profile write makes earlier entries unreachable instead of
+requiring explicit invalidation.
+
+There are two tiers:
+- An in-memory LRU, bounded in entries and age, answering in microseconds
+- An SQLite file that survives restarts; hits are promoted to memory
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_results (
+    key TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL,
+    created REAL NOT NULL,
+    results TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_results_created ON search_results (created);
+"""
+
+Results = List[Dict[str, Any]]
+
+
+def normalize_query(query: str) -> str:
+    """Fold case and whitespace, which do not change a search."""
+    return " ".join(query.lower().split())
+
+
+class _DiskTier:
+    """Search results kept in an SQLite file."""
+
+    def __init__(self, db_file: Path, max_entries: int, ttl: float):
+        self.db_file = Path(db_file)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # Accessed from worker threads one at a time
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._generation: Optional[int] = None
+        # Rows in the table, kept up to date so inserts need not count them
+        (self._count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM search_results"
+        ).fetchone()
+
+    def get(self, key: str) -> Optional[Results]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created, results FROM search_results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[0] > self.ttl:
+            return None
+        return json.loads(row[1])
+
+    def put(self, key: str, generation: int, results: Results) -> None:
+        with self._lock, self._conn:
+            if generation != self._generation:
+                # Entries of older generations can never be hit again
+                purged = self._conn.execute(
+                    "DELETE FROM search_results WHERE generation != ?", (generation,)
+                )
+                self._count -= purged.rowcount
+                self._generation = generation
+            row = (generation, time.time(), json.dumps(results), key)
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO search_results "
+                "(generation, created, results, key) VALUES (?, ?, ?, ?)",
+                row,
+            )
+            if inserted.rowcount:
+                self._count += 1
+            else:
+                self._conn.execute(
+                    "UPDATE search_results SET generation = ?, created = ?, "
+                    "results = ? WHERE key = ?",
+                    row,
+                )
+            if self._count > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Drop the oldest rows down to nine tenths of the cap, so the
+        # eviction runs once per many inserts rather than on every one
+        keep = max(1, self.max_entries - self.max_entries // 10)
+        evicted = self._conn.execute(
+            "DELETE FROM search_results WHERE created < ("
+            "SELECT created FROM search_results "
+            "ORDER BY created DESC LIMIT 1 OFFSET ?)",
+            (keep - 1,),
+        )
+        self._count -= evicted.rowcount
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class SearchCache:
+    """Two-tier cache of search results keyed by query and store generation.
+
+    Args:
+        max_entries: Entries kept in memory, least recently used evicted first
+        ttl: Seconds an entry stays valid in memory
+        db_file: SQLite file of the disk tier; memory only if None
+        disk_entries: Entries kept on disk, oldest evicted first
+        disk_ttl: Seconds an entry stays valid on disk
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 3600.0,
+        db_file: Optional[Path] = None,
+        disk_entries: int = 100_000,
+        disk_ttl: float = 86400.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[float, Results]]" = OrderedDict()
+        self._disk = (
+            _DiskTier(db_file, disk_entries, disk_ttl) if db_file is not None else None
+        )
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str, generation: int, *variant: Any) -> str:
+        """Build the cache key of a search.
+
+        Args:
+            query: The search query, normalized here
+            generation: Generation of the profile store searched
+            variant: Further parameters that change the results
+        """
+        return json.dumps([normalize_query(query), generation, *variant])
+
+    async def get(self, key: str) -> Optional[Results]:
+        """Return the cached results for ``key``, or None on a miss."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            if time.monotonic() - entry[0] <= self.ttl:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[1]
+            del self._memory[key]
+
+        if self._disk is not None:
+            results = await asyncio.to_thread(self._disk.get, key)
+            if results is not None:
+                self.disk_hits += 1
+                self._remember(key, results)
+                return results
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, generation: int, results: Results) -> None:
+        """Cache ``results`` for ``key`` in both tiers."""
+        self._remember(key, results)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.put, key, generation, results)
+
+    def _remember(self, key: str, results: Results) -> None:
+        self._memory[key] = (time.monotonic(), results)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the hit and miss counters and the size of each tier."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (
+                round((self.memory_hits + self.disk_hits) / lookups, 4)
+                if lookups
+                else 0.0
+            ),
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._disk) if self._disk is not None else 0,
+        }
@@ -0,0 +1,6 @@
+"""Profile storage package.
+
+Contains the storage backend interface and its implementations:
+- JSON snapshot plus append-only mutation log
+- SQLite database
+"""
@@ -0,0 +1,81 @@
+"""Storage backend interface for profiles."""
+
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+def complete_timestamps(profile: Dict, default: str) -> Dict:
+    """Set the timestamps ``profile`` lacks to ``default``, in place.
+
+    Records stored before profiles were validated on write have no
+    ``created_at`` or ``updated_at``. Stores complete them as they load them,
+    so every record they serve matches the ``Profile`` model.
+    """
+    for field in TIMESTAMP_FIELDS:
+        if profile.get(field) is None:
+            profile[field] = default
+    return profile
+
+
+class ProfileStore(ABC):
+    """Persistent store of profile records.
+
+    Records are plain dictionaries keyed by their ``id`` field. Stores keep
+    insertion order, so listing returns profiles in the order they were
+    created, and give every record its timestamps; see
+    ``complete_timestamps``.
+    """
+
+    @abstractmethod
+    async def get(self, profile_id: str) -> Optional[Dict]:
+        """Return the profile with ``profile_id``, or None if it does not exist."""
+
+    @abstractmethod
+    async def list(self) -> List[Dict]:
+        """Return every profile in insertion order."""
+
+    @abstractmethod
+    async def generation(self) -> int:
+        """Return a number that changes whenever the stored profiles change.
+
+        Generations are only meaningful for equality checks. Processes that
+        share the same storage see the same generation for the same contents.
+        """
+
+    @abstractmethod
+    async def page(self, after: int, limit: int) -> Tuple[List[Dict], Optional[int]]:
+        """Return up to ``limit`` profiles following the cursor ``after``.
+
+        Cursors are opaque, increasing integers; ``0`` starts from the first
+        profile.
+
+        Returns:
+            Tuple[List[Dict], Optional[int]]: The profiles and the cursor to pass
+                for the next page, or None when there are no more profiles
+        """
+
+    async def iter(self, after: int = 0, batch_size: int = 500) -> AsyncIterator[Dict]:
+        """Yield profiles in insertion order, reading ``batch_size`` at a time."""
+        cursor: Optional[int] = after
+        while cursor is not None:
+            profiles, cursor = await self.page(cursor, batch_size)
+            for profile in profiles:
+                yield profile
+
+    @abstractmethod
+    async def append(self, profiles: List[Dict]) -> None:
+        """Durably add ``profiles`` to the store in a single commit."""
+
+    @abstractmethod
+    async def replace_all(self, profiles: List[Dict]) -> None:
+        """Replace the whole contents of the store with ``profiles``."""
+
+    async def close(self) -> None:  # noqa: B027
+        """Release any resources held by the store.
+
+        This is an optional hook: stores holding no resources need not
+        override it.
+        """
+        # Nothing to release by default
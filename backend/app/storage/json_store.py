@@ -0,0 +1,327 @@
+"""JSON file storage backend.
+
+On disk the store is a JSON snapshot (``profiles.json``) plus an append-only
+JSONL log of mutations (``profiles.log``). Both are read once when the store is
+constructed; after that every read is served from an in-memory
+``id -> profile`` index.
+
+Several processes (for example uvicorn workers) may share the same files.
+Writers hold an exclusive advisory lock on ``profiles.lock`` and replace files
+only by atomic rename. Before serving a read, each process compares the
+identity and size of the files with what it last applied, and catches up
+only when another process changed them: new log records are applied
+incrementally, and a replaced snapshot triggers a full reload.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import secrets
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.storage.base import ProfileStore, complete_timestamps
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no advisory flock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class _DiskState(NamedTuple):
+    """What a process has applied from disk."""
+
+    snapshot: Optional[Tuple[int, int, int]]  # inode, mtime_ns, size
+    log_inode: Optional[int]
+    log_size: int  # offset up to which the log has been applied
+
+
+# Full reload (snapshot, if replaced), log entries to apply, resulting state
+_Changes = Tuple[Optional[List[Dict]], List[Dict], _DiskState]
+
+
+@contextmanager
+def _file_lock(path: Path, exclusive: bool) -> Iterator[None]:
+    """Hold an advisory lock on ``path`` across processes."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _encode_snapshot(profiles: List[Dict]) -> bytes:
+    # No indent: only the compact encoder has a C implementation
+    return json.dumps(profiles, separators=(",", ":")).encode()
+
+
+def _write_temp_file(target: Path, data: bytes) -> Path:
+    """Durably write ``data`` to a new file next to ``target`` and return it.
+
+    The name is random, so stores of the same file in one process, or in
+    several, never write to each other's temporary files.
+    """
+    path = target.with_name(f"{target.name}.{secrets.token_hex(8)}.tmp")
+    with open(path, "xb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return path
+
+
+def _apply_entry(profiles: Dict[str, Dict], order: List[str], entry: Dict) -> None:
+    if entry["op"] == "create":
+        profile = entry["profile"]
+        if profile["id"] not in profiles:
+            order.append(profile["id"])
+        profiles[profile["id"]] = profile
+    else:
+        raise ValueError(f"Unknown profile log operation: {entry['op']}")
+
+
+class JSONFileStore(ProfileStore):
+    """Profile store kept resident in memory and written through to disk.
+
+    Writes append one line to the log and become visible in the index once the
+    line is durable. When the log grows past ``compact_threshold`` bytes it is
+    folded into a fresh snapshot in the background.
+
+    Blocking file operations that must happen under the cross-process lock run
+    in a worker thread; the in-memory index is only modified on the event loop.
+    """
+
+    def __init__(self, data_file: Path, compact_threshold: int = 1_048_576):
+        self.data_file = Path(data_file)
+        self.log_file = self.data_file.with_suffix(".log")
+        self.lock_file = self.data_file.with_suffix(".lock")
+        self.compact_threshold = compact_threshold
+        self.data_file.parent.mkdir(parents=True, exist_ok=True)
+
+        # Insertion-ordered index, so listing keeps the on-disk order
+        self._profiles: Dict[str, Dict] = {}
+        # Profile ids by position, for cursor pagination
+        self._order: List[str] = []
+        self._state = _DiskState(None, None, 0)
+        with _file_lock(self.lock_file, exclusive=True):
+            if not self.data_file.exists():
+                self._replace_snapshot(b"[]")
+            changes = self._read_changes()
+            self._truncate_torn_tail(changes[2])
+        self._apply_changes(changes)
+
+        self._write_lock = asyncio.Lock()
+        self._compaction: Optional[asyncio.Task] = None
+
+    # Disk access. These run in a worker thread with the file lock held.
+
+    def _disk_state(self) -> _DiskState:
+        snapshot = os.stat(self.data_file)
+        snapshot_id = (snapshot.st_ino, snapshot.st_mtime_ns, snapshot.st_size)
+        try:
+            log = os.stat(self.log_file)
+        except FileNotFoundError:
+            return _DiskState(snapshot_id, None, 0)
+        return _DiskState(snapshot_id, log.st_ino, log.st_size)
+
+    def _read_log(self, offset: int) -> Tuple[List[Dict], int]:
+        """Read complete log records from ``offset``.
+
+        Returns:
+            Tuple[List[Dict], int]: The records and the offset after the last one
+        """
+        entries = []
+        try:
+            with open(self.log_file, "rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # Torn write from a crash: ignore the partial record
+                        logger.warning("Ignoring truncated record in %s", self.log_file)
+                        break
+                    entries.append(json.loads(line))
+                    offset += len(line)
+        except FileNotFoundError:
+            return entries, 0
+        return entries, offset
+
+    def _read_changes(self) -> _Changes:
+        """Read whatever changed on disk since ``self._state``."""
+        disk = self._disk_state()
+        if (
+            disk.snapshot != self._state.snapshot
+            or disk.log_inode != self._state.log_inode
+            or disk.log_size < self._state.log_size
+        ):
+            snapshot = json.loads(self.data_file.read_bytes())
+            entries, offset = self._read_log(0)
+            return snapshot, entries, disk._replace(log_size=offset)
+        if disk.log_size == self._state.log_size:
+            return None, [], self._state
+        entries, offset = self._read_log(self._state.log_size)
+        return None, entries, disk._replace(log_size=offset)
+
+    def _truncate_torn_tail(self, state: _DiskState) -> None:
+        if (
+            state.log_inode is not None
+            and self.log_file.stat().st_size > state.log_size
+        ):
+            os.truncate(self.log_file, state.log_size)
+
+    def _replace_snapshot(self, data: bytes) -> None:
+        os.replace(_write_temp_file(self.data_file, data), self.data_file)
+
+    def _append_locked(self, data: bytes) -> _Changes:
+        with _file_lock(self.lock_file, exclusive=True):
+            snapshot, entries, state = self._read_changes()
+            self._truncate_torn_tail(state)
+            with open(self.log_file, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            return snapshot, entries, self._disk_state()
+
+    def _replace_all_locked(self, data: bytes) -> _DiskState:
+        with _file_lock(self.lock_file, exclusive=True):
+            self._replace_snapshot(data)
+            self.log_file.unlink(missing_ok=True)
+            return self._disk_state()
+
+    def _swap_snapshot_locked(self, tmp_file: Path, base: _DiskState) -> _Changes:
+        """Install a snapshot of the store as it was at ``base``."""
+        with _file_lock(self.lock_file, exclusive=True):
+            snapshot, entries, state = self._read_changes()
+            if state.snapshot != base.snapshot or state.log_inode != base.log_inode:
+                # Another process compacted or replaced the store meanwhile
+                tmp_file.unlink()
+                return snapshot, entries, state
+            # Carry over records appended since the snapshot was taken
+            with open(self.log_file, "rb") as f:
+                f.seek(base.log_size)
+                tail = f.read(state.log_size - base.log_size)
+            tmp_log = _write_temp_file(self.log_file, tail)
+            os.replace(tmp_file, self.data_file)
+            os.replace(tmp_log, self.log_file)
+            return snapshot, entries, self._disk_state()
+
+    def _refresh_locked(self) -> _Changes:
+        with _file_lock(self.lock_file, exclusive=False):
+            return self._read_changes()
+
+    # In-memory index. These run on the event loop.
+
+    def _apply_changes(self, changes: _Changes) -> None:
+        snapshot, entries, state = changes
+        # Records without timestamps date from the snapshot; every process
+        # sees the same file, so they agree on the value
+        loaded_at = datetime.utcfromtimestamp(state.snapshot[1] / 1e9).isoformat()
+        for profile in snapshot or ():
+            complete_timestamps(profile, loaded_at)
+        for entry in entries:
+            complete_timestamps(entry["profile"], loaded_at)
+        if snapshot is not None:
+            profiles: Dict[str, Dict] = {}
+            order: List[str] = []
+            for profile in snapshot:
+                _apply_entry(profiles, order, {"op": "create", "profile": profile})
+            for entry in entries:
+                _apply_entry(profiles, order, entry)
+            # Swap in one step so concurrent readers see either view
+            self._profiles, self._order = profiles, order
+        else:
+            for entry in entries:
+                _apply_entry(self._profiles, self._order, entry)
+        self._state = state
+
+    async def _refresh(self) -> None:
+        """Catch up with changes made by other processes."""
+        if self._disk_state() == self._state:
+            return
+        async with self._write_lock:
+            if self._disk_state() != self._state:
+                self._apply_changes(await asyncio.to_thread(self._refresh_locked))
+
+    async def generation(self) -> int:
+        """Return a hash of the snapshot and log file identities."""
+        await self._refresh()
+        # Derived from the file identities, so every worker agrees on it
+        digest = hashlib.blake2b(repr(self._state).encode(), digest_size=8)
+        return int.from_bytes(digest.digest(), "big")
+
+    async def get(self, profile_id: str) -> Optional[Dict]:
+        """Return the profile with ``profile_id`` from memory, after catching up."""
+        await self._refresh()
+        return self._profiles.get(profile_id)
+
+    async def list(self) -> List[Dict]:
+        """Return every profile from memory, after catching up."""
+        await self._refresh()
+        return list(self._profiles.values())
+
+    async def page(self, after: int, limit: int) -> Tuple[List[Dict], Optional[int]]:
+        """Return a page of profiles; the cursor is a position in insertion order."""
+        await self._refresh()
+        ids = self._order[after : after + limit]
+        end = after + len(ids)
+        return [self._profiles[i] for i in ids], end if end < len(self._order) else None
+
+    async def replace_all(self, profiles: List[Dict]) -> None:
+        """Write ``profiles`` as a new snapshot and start an empty log."""
+        data = _encode_snapshot(profiles)
+        async with self._write_lock:
+            state = await asyncio.to_thread(self._replace_all_locked, data)
+            self._apply_changes((profiles, [], state))
+
+    async def append(self, profiles: List[Dict]) -> None:
+        """Append ``profiles`` to the mutation log in a single durable write."""
+        entries = [{"op": "create", "profile": profile} for profile in profiles]
+        data = "".join(json.dumps(entry) + "\n" for entry in entries).encode()
+        async with self._write_lock:
+            snapshot, changes, state = await asyncio.to_thread(
+                self._append_locked, data
+            )
+            self._apply_changes((snapshot, changes + entries, state))
+        self._maybe_schedule_compaction()
+
+    def _maybe_schedule_compaction(self) -> None:
+        if self._state.log_size < self.compact_threshold:
+            return
+        loop = asyncio.get_running_loop()
+        if (
+            self._compaction is not None
+            and not self._compaction.done()
+            and self._compaction.get_loop() is loop
+        ):
+            return
+        self._compaction = loop.create_task(self.compact())
+
+    async def compact(self) -> None:
+        """Fold the mutation log into a new snapshot.
+
+        The snapshot is written without holding any lock; records appended
+        meanwhile, by this or another process, are carried over into the new
+        log. Replaying a create is idempotent, so a crash between the two
+        renames only leaves records that are applied twice.
+        """
+        async with self._write_lock:
+            self._apply_changes(await asyncio.to_thread(self._refresh_locked))
+            profiles = list(self._profiles.values())
+            base = self._state
+
+        tmp_file = await asyncio.to_thread(
+            lambda: _write_temp_file(self.data_file, _encode_snapshot(profiles))
+        )
+
+        async with self._write_lock:
+            self._apply_changes(
+                await asyncio.to_thread(self._swap_snapshot_locked, tmp_file, base)
+            )
+        logger.info("Compacted profile log into %d profiles", len(profiles))
@@ -0,0 +1,207 @@
+"""SQLite storage backend.
+
+Profiles live in a single table with an indexed ``id`` column and JSON1 columns
+for skills and interests. The database runs in WAL mode, so readers never
+block the writer and several processes can share one file. Nothing is kept
+resident beyond SQLite's own page cache.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.storage.base import TIMESTAMP_FIELDS, ProfileStore, complete_timestamps
+
+_COLUMNS = (
+    "id",
+    "name",
+    "bio",
+    "skills",
+    "interests",
+    "github_url",
+    "linkedin_url",
+    "created_at",
+    "updated_at",
+)
+_JSON_COLUMNS = ("skills", "interests")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    bio TEXT NOT NULL,
+    skills TEXT NOT NULL DEFAULT '[]' CHECK (json_valid(skills)),
+    interests TEXT NOT NULL DEFAULT '[]' CHECK (json_valid(interests)),
+    github_url TEXT,
+    linkedin_url TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0);
+"""
+
+_BUMP_GENERATION = "UPDATE meta SET value = value + 1 WHERE key = 'generation'"
+
+_SELECT = f"SELECT {', '.join(_COLUMNS)} FROM profiles"
+# Upsert rather than INSERT OR REPLACE, so a rewritten profile keeps its seq
+_INSERT = (
+    f"INSERT INTO profiles ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+    "ON CONFLICT(id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in _COLUMNS[1:])
+)
+
+
+def _to_row(profile: Dict) -> tuple:
+    profile = complete_timestamps(dict(profile), datetime.utcnow().isoformat())
+    row = []
+    for column in _COLUMNS:
+        value = profile.get(column)
+        if column in _JSON_COLUMNS:
+            value = json.dumps(value or [])
+        row.append(value)
+    return tuple(row)
+
+
+def _from_row(row: tuple) -> Dict:
+    profile: Dict[str, Any] = {}
+    for column, value in zip(_COLUMNS, row):
+        if column in _JSON_COLUMNS:
+            value = json.loads(value)
+        profile[column] = value
+    return profile
+
+
+class SQLiteStore(ProfileStore):
+    """Profile store backed by an SQLite database file.
+
+    Blocking SQLite calls run in worker threads. Each thread keeps its own
+    connection, so reads proceed in parallel while SQLite serializes writers.
+    """
+
+    def __init__(self, db_file: Path, busy_timeout: float = 5.0):
+        self.db_file = Path(db_file)
+        self.busy_timeout = busy_timeout
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        conn = self._connection()
+        # WAL mode is persistent, so setting it once per database is enough
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._complete_timestamps(conn)
+
+    @staticmethod
+    def _complete_timestamps(conn: sqlite3.Connection) -> None:
+        """Store timestamps for rows written without them, once for all workers."""
+        now = datetime.utcnow().isoformat()
+        with conn:
+            changed = sum(
+                conn.execute(
+                    f"UPDATE profiles SET {field} = ? WHERE {field} IS NULL", (now,)
+                ).rowcount
+                for field in TIMESTAMP_FIELDS
+            )
+            if changed:
+                conn.execute(_BUMP_GENERATION)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_file, timeout=self.busy_timeout, check_same_thread=False
+            )
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    async def _run(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.to_thread(lambda: func(self._connection()))
+
+    async def generation(self) -> int:
+        """Return the generation counter bumped by every write transaction."""
+
+        def query(conn: sqlite3.Connection) -> int:
+            row = conn.execute(
+                "SELECT value FROM meta WHERE key = 'generation'"
+            ).fetchone()
+            return row[0]
+
+        return await self._run(query)
+
+    async def get(self, profile_id: str) -> Optional[Dict]:
+        """Return the profile with ``profile_id``, or None if it does not exist."""
+
+        def query(conn: sqlite3.Connection) -> Optional[Dict]:
+            row = conn.execute(f"{_SELECT} WHERE id = ?", (profile_id,)).fetchone()
+            return _from_row(row) if row else None
+
+        return await self._run(query)
+
+    async def list(self) -> List[Dict]:
+        """Return every profile, ordered by insertion sequence."""
+
+        def query(conn: sqlite3.Connection) -> List[Dict]:
+            rows = conn.execute(f"{_SELECT} ORDER BY seq").fetchall()
+            return [_from_row(row) for row in rows]
+
+        return await self._run(query)
+
+    async def page(self, after: int, limit: int) -> Tuple[List[Dict], Optional[int]]:
+        """Return a page of profiles; the cursor is the last row sequence number."""
+
+        def query(conn: sqlite3.Connection) -> Tuple[List[Dict], Optional[int]]:
+            rows = conn.execute(
+                f"SELECT seq, {', '.join(_COLUMNS)} FROM profiles "
+                "WHERE seq > ? ORDER BY seq LIMIT ?",
+                (after, limit + 1),
+            ).fetchall()
+            # The extra row only tells whether another page follows
+            profiles = [_from_row(row[1:]) for row in rows[:limit]]
+            return profiles, rows[limit - 1][0] if len(rows) > limit else None
+
+        return await self._run(query)
+
+    async def append(self, profiles: List[Dict]) -> None:
+        """Insert or update ``profiles`` in one transaction."""
+        rows = [_to_row(profile) for profile in profiles]
+
+        def insert(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.executemany(_INSERT, rows)
+                conn.execute(_BUMP_GENERATION)
+
+        await self._run(insert)
+
+    async def replace_all(self, profiles: List[Dict]) -> None:
+        """Replace every row with ``profiles`` in one transaction."""
+        rows = [_to_row(profile) for profile in profiles]
+
+        def replace(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute("DELETE FROM profiles")
+                conn.executemany(_INSERT, rows)
+                conn.execute(_BUMP_GENERATION)
+
+        await self._run(replace)
+
+    async def close(self) -> None:
+        """Close the connections opened by every thread."""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,90 @@
+"""Group-commit writer for profile stores.
+
+Concurrent writers hand their records to a single background task, which
+commits them to the store in batches. Every batch costs one store commit (one
+fsync for the JSON store, one transaction for SQLite) however many callers it
+serves.
+"""
+
+import asyncio
+import contextlib
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from app.storage.base import ProfileStore
+
+logger = logging.getLogger(__name__)
+
+_Pending = Tuple[Dict, "asyncio.Future[None]"]
+
+
+class GroupCommitWriter:
+    """Serializes writes to a store and commits them in batches.
+
+    A batch is committed once ``max_batch`` records are queued, or
+    ``max_delay`` seconds after its first record arrived, whichever comes
+    first. Callers of :meth:`submit` resume only after their batch is durable.
+    """
+
+    def __init__(
+        self, store: ProfileStore, max_batch: int = 256, max_delay: float = 0.002
+    ):
+        self.store = store
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "Optional[asyncio.Queue[_Pending]]" = None
+        self._full: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_running(self) -> "asyncio.Queue[_Pending]":
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # Idle, or the previous event loop has gone away
+            self._queue = asyncio.Queue()
+            self._full = asyncio.Event()
+            self._task = loop.create_task(self._run(self._queue, self._full))
+        return self._queue
+
+    async def submit(self, profile: Dict) -> None:
+        """Queue ``profile`` for the next batch and wait until it is committed."""
+        queue = self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((profile, future))
+        if queue.qsize() >= self.max_batch:
+            self._full.set()
+        await future
+
+    async def _run(self, queue: "asyncio.Queue[_Pending]", full: asyncio.Event) -> None:
+        # Runs only while there is work, so no task outlives its event loop idle
+        while not queue.empty():
+            batch = [queue.get_nowait()]
+            if self.max_delay > 0 and queue.qsize() + 1 < self.max_batch:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(full.wait(), self.max_delay)
+            full.clear()
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+            await self._commit(batch)
+
+    async def _commit(self, batch: List[_Pending]) -> None:
+        try:
+            await self.store.append([profile for profile, _ in batch])
+        except Exception as e:
+            logger.error("Group commit of %d profiles failed: %s", len(batch), e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def close(self) -> None:
+        """Wait until everything still queued has been committed."""
+        task = self._task
+        if (
+            task is not None
+            and not task.done()
+            and task.get_loop() is asyncio.get_running_loop()
+        ):
+            await task
@@ -0,0 +1,101 @@
+"""Benchmark the IVF index against exact vector search.
+
+Builds an IVF index over synthetic clustered unit vectors, shaped like the
+profile embeddings of the vector search, and reports recall@10 and query
+latency for several ``nprobe`` settings next to exhaustive search.
+
+Usage:
+    python benchmarks/ann_benchmark.py --size 1000000 --nprobe 8 16 32
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.search.ann import IVFIndex
+
+
+def make_vectors(centers: np.ndarray, size: int, noise: float, seed: int) -> np.ndarray:
+    """Unit vectors drawn around random topic ``centers``."""
+    rng = np.random.default_rng(seed)
+    vectors = np.empty((size, centers.shape[1]), dtype=np.float32)
+    for start in range(0, size, 100_000):
+        stop = min(start + 100_000, size)
+        labels = rng.integers(0, len(centers), stop - start)
+        offsets = rng.standard_normal((stop - start, centers.shape[1]))
+        vectors[start:stop] = centers[labels] + noise * offsets
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors
+
+
+def top_k(similarities: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` largest ``similarities``, best first."""
+    best = np.argpartition(-similarities, k - 1)[:k]
+    return best[np.argsort(-similarities[best])]
+
+
+def percentile_ms(timings: list, q: float) -> float:
+    """The ``q``-th percentile of ``timings`` in milliseconds."""
+    return float(np.percentile(timings, q) * 1000)
+
+
+def main() -> None:
+    """Build the index and print recall and latency for each ``nprobe``."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dimensions", type=int, default=128)
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--noise", type=float, default=1.7)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--lists", type=int, default=None)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    centers = rng.standard_normal((args.topics, args.dimensions))
+    vectors = make_vectors(centers, args.size, args.noise, args.seed + 1)
+    queries = make_vectors(centers, args.queries, args.noise, args.seed + 2)
+
+    started = time.perf_counter()
+    index = IVFIndex.train(vectors, args.lists, seed=args.seed)
+    build = time.perf_counter() - started
+    print(
+        f"{args.size} vectors, {args.dimensions} dimensions, "
+        f"{len(index.centroids)} lists, built in {build:.1f}s"
+    )
+
+    exact, timings = [], []
+    for query in queries:
+        started = time.perf_counter()
+        exact.append(set(top_k(vectors @ query, args.k).tolist()))
+        timings.append(time.perf_counter() - started)
+    print(f"{'search':>12} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p99 ms':>8}")
+    print(
+        f"{'exact':>12} {1.0:>10.3f} "
+        f"{percentile_ms(timings, 50):>8.2f} {percentile_ms(timings, 99):>8.2f}"
+    )
+
+    for nprobe in args.nprobe:
+        hits, timings = 0, []
+        for query, expected in zip(queries, exact):
+            started = time.perf_counter()
+            candidates = index.probe(query, nprobe)
+            found = candidates[top_k(vectors[candidates] @ query, args.k)]
+            timings.append(time.perf_counter() - started)
+            hits += len(expected.intersection(found.tolist()))
+        print(
+            f"{'nprobe=' + str(nprobe):>12} {hits / (args.k * len(queries)):>10.3f} "
+            f"{percentile_ms(timings, 50):>8.2f} {percentile_ms(timings, 99):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Benchmark the pooled Groq client against a client per request.
+
+Starts a local stub of the chat completions endpoint and sends it the same
+requests twice: once opening a new ``httpx.AsyncClient`` per request, as
+searches used to, and once through the shared client of ``GroqService``. The
+stub counts the TCP connections it accepts and can delay the first response
+on each connection to stand in for the TLS handshake to ``api.groq.com``.
+
+Usage:
+    python benchmarks/groq_client_benchmark.py --requests 500 --handshake-ms 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+os.environ.setdefault("SEARCH_CACHE_DISK_ENTRIES", "0")
+
+import httpx
+from app.services.groq_service import GroqService
+
+RESPONSE = json.dumps(
+    {"choices": [{"message": {"content": json.dumps({"results": []})}}]}
+).encode()
+
+
+class StubServer:
+    """Minimal HTTP/1.1 server answering every request with ``RESPONSE``."""
+
+    def __init__(self, handshake: float):
+        self.handshake = handshake
+        self.connections = 0
+
+    async def handle(self, reader, writer) -> None:
+        """Serve one connection, delaying only its first response."""
+        self.connections += 1
+        first = True
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    if name.lower() == b"content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                if first:
+                    await asyncio.sleep(self.handshake)
+                    first = False
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(RESPONSE), RESPONSE)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def percentile_ms(timings: List[float], percentile: float) -> float:
+    """The ``percentile``-th of ``timings`` in milliseconds."""
+    ordered = sorted(timings)
+    return 1000 * ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+async def run(post, url: str, requests: int, concurrency: int) -> List[float]:
+    """Send ``requests`` posts, ``concurrency`` at a time, and return their latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "query"}]}
+
+    async def one() -> float:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await post(url, json=payload)
+            response.raise_for_status()
+            return time.perf_counter() - started
+
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+async def main() -> None:
+    """Compare a client per request with the pooled client against the stub."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    stub = StubServer(args.handshake_ms / 1000)
+    server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/openai/v1/chat/completions"
+
+    async def post_with_new_client(url, **kwargs):
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            return await client.post(url, **kwargs)
+
+    service = GroqService()
+    await service.start()
+
+    print(
+        f"{'client':>12} {'connections':>12} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'total s':>8}"
+    )
+    for name, post in (
+        ("per-request", post_with_new_client),
+        ("pooled", service.client.post),
+    ):
+        stub.connections = 0
+        started = time.perf_counter()
+        timings = await run(post, url, args.requests, args.concurrency)
+        total = time.perf_counter() - started
+        print(
+            f"{name:>12} {stub.connections:>12} {percentile_ms(timings, 50):>8.2f} "
+            f"{percentile_ms(timings, 99):>8.2f} {total:>8.2f}"
+        )
+
+    await service.close()
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
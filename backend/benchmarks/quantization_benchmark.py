@@ -0,0 +1,81 @@
+"""Benchmark compressed vector storage against float32 vectors.
+
+Encodes synthetic clustered unit vectors with each storage layout and reports
+memory per vector, recall@10 of the approximate (ADC) scores, recall@10 after
+exactly re-scoring the best ``--rerank-factor * 10`` candidates, and the
+latency of an exhaustive scan.
+
+Usage:
+    python benchmarks/quantization_benchmark.py --size 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from ann_benchmark import make_vectors, percentile_ms, top_k
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.search.quantization import create_vector_storage
+
+
+def main() -> None:
+    """Encode the vectors with each storage and print recall, latency and size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dimensions", type=int, default=128)
+    parser.add_argument("--topics", type=int, default=1000)
+    parser.add_argument("--noise", type=float, default=1.7)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--subspaces", type=int, default=32)
+    parser.add_argument("--rerank-factor", type=int, default=2)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    centers = rng.standard_normal((args.topics, args.dimensions))
+    vectors = make_vectors(centers, args.size, args.noise, args.seed + 1)
+    queries = make_vectors(centers, args.queries, args.noise, args.seed + 2)
+    exact = [set(top_k(vectors @ query, args.k).tolist()) for query in queries]
+    depth = args.k * args.rerank_factor
+
+    print(
+        f"{'storage':>8} {'bytes/vec':>10} {'ratio':>6} {'recall':>7} "
+        f"{'reranked':>9} {'p50 ms':>8} {'p99 ms':>8} {'build s':>8}"
+    )
+    for quantization in ("none", "int8", "pq"):
+        started = time.perf_counter()
+        storage = create_vector_storage(
+            quantization, args.dimensions, args.subspaces, args.seed
+        )
+        storage.train(vectors[:65536])
+        storage.add(vectors)
+        build = time.perf_counter() - started
+
+        hits, reranked_hits, timings = 0, 0, []
+        for query, expected in zip(queries, exact):
+            started = time.perf_counter()
+            scores = storage.scores(query)
+            timings.append(time.perf_counter() - started)
+            hits += len(expected.intersection(top_k(scores, args.k).tolist()))
+            candidates = top_k(scores, depth)
+            rescored = candidates[top_k(vectors[candidates] @ query, args.k)]
+            reranked_hits += len(expected.intersection(rescored.tolist()))
+
+        total = args.k * len(queries)
+        print(
+            f"{quantization:>8} {storage.nbytes / args.size:>10.1f} "
+            f"{args.dimensions * 4 * args.size / storage.nbytes:>6.1f} "
+            f"{hits / total:>7.3f} {reranked_hits / total:>9.3f} "
+            f"{percentile_ms(timings, 50):>8.2f} {percentile_ms(timings, 99):>8.2f} "
+            f"{build:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -35,8 +35,8 @@ async def simple_test():
     profiles = await profile_service.list_profiles()
     print(f"Found {len(profiles)} profiles in the database.\n")
 
-    # Convert profiles to dictionaries for search
-    profile_dicts = [profile.model_dump() for profile in profiles]
+    # Profiles are already dictionaries, ready for search
+    profile_dicts = profiles
 
     # Test query
     query = "experienced React developer"
@@ -44,7 +44,7 @@ async def simple_test():
     print("-" * 40)
 
     # Perform search
-    results = await groq_service.get_semantic_search_results(query, profile_dicts)
+    results, _ = await groq_service.get_semantic_search_results(query, profile_dicts)
 
     if results:
         print(f"Found {len(results)} matches:\n")
@@ -135,8 +135,8 @@ async def test_semantic_search():
     else:
         print(f"Using existing profiles. Total profiles: {len(profiles)}")
 
-    # Convert profiles to dictionaries for search
-    profile_dicts = [profile.model_dump() for profile in profiles]
+    # Profiles are already dictionaries, ready for search
+    profile_dicts = profiles
 
     # Test queries
     test_queries = [
@@ -155,7 +155,7 @@ async def test_semantic_search():
         print("-" * 40)
 
         try:
-            results = await groq_service.get_semantic_search_results(
+            results, _ = await groq_service.get_semantic_search_results(
                 query, profile_dicts
             )
 
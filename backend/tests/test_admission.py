@@ -0,0 +1,188 @@
+"""Tests for admission control of outbound Groq requests."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.core.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    Priority,
+    TokenBucket,
+)
+from app.core.resilience import CircuitBreaker, CircuitOpenError
+from app.services.groq_service import PRIORITY_LOW, GroqService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(60, clock)  # One unit per second
+
+    assert bucket.wait_time(60) == 0
+    bucket.take(50)
+    assert bucket.wait_time(20) == 10
+    clock.now = 10
+    assert bucket.wait_time(20) == 0
+    assert bucket.wait_time(1000) == 40  # Capped at a full bucket
+    assert TokenBucket(0, clock).wait_time(10**9) == 0  # Unlimited
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_by_priority():
+    controller = AdmissionController(max_in_flight=1)
+    order = []
+    release = asyncio.Event()
+
+    async def call(name: str, priority: int) -> None:
+        async with controller.admit(1, priority):
+            order.append(name)
+            await release.wait()
+
+    first = asyncio.ensure_future(call("first", 1))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.ensure_future(call(name, priority))
+        for name, priority in (("normal", 1), ("urgent", 0))
+    ]
+    await asyncio.sleep(0)
+    assert controller.stats() == {"in_flight": 1, "queued": 2, "rejected": 0}
+
+    release.set()
+    await asyncio.gather(first, *waiters)
+    assert order == ["first", "urgent", "normal"]
+    assert controller.stats() == {"in_flight": 0, "queued": 0, "rejected": 0}
+
+
+@pytest.mark.asyncio
+async def test_priority_changes_apply_to_waiting_requests():
+    controller = AdmissionController(max_in_flight=1)
+    order = []
+    release = asyncio.Event()
+    abandoned = Priority(0)
+
+    async def call(name: str, priority) -> None:
+        async with controller.admit(1, priority):
+            order.append(name)
+            await release.wait()
+
+    first = asyncio.ensure_future(call("first", 1))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.ensure_future(call("abandoned", abandoned)),
+        asyncio.ensure_future(call("live", 1)),
+    ]
+    await asyncio.sleep(0)
+    abandoned.value = 2
+
+    release.set()
+    await asyncio.gather(first, *waiters)
+    assert order == ["first", "live", "abandoned"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_and_long_waits_are_rejected():
+    controller = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.05)
+    release = asyncio.Event()
+
+    async def call() -> None:
+        async with controller.admit(1):
+            await release.wait()
+
+    running = asyncio.ensure_future(call())
+    await asyncio.sleep(0)
+    queued = asyncio.ensure_future(call())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected):
+        await call()  # The queue is full
+    with pytest.raises(AdmissionRejected):
+        await queued  # Waited past the queue timeout
+    assert controller.rejected == 2
+
+    release.set()
+    await running
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_admission():
+    # 6000 tokens per minute refill 100 per second
+    controller = AdmissionController(tokens_per_minute=6000, queue_timeout=1)
+
+    async with controller.admit(6000):
+        pass
+    started = asyncio.get_running_loop().time()
+    async with controller.admit(10):
+        waited = asyncio.get_running_loop().time() - started
+    assert 0.05 <= waited < 0.5
+
+
+@pytest.mark.asyncio
+async def test_rejected_groq_requests_fall_back_to_local_search():
+    service = GroqService()
+    service.is_test = False
+    service.admission = AdmissionController(max_in_flight=1, max_queue=0)
+    profiles = [
+        {
+            "id": "1",
+            "name": "AI Developer",
+            "bio": "Expert in machine learning",
+            "skills": ["Python"],
+            "interests": [],
+        }
+    ]
+
+    with patch("httpx.AsyncClient.post", new_callable=AsyncMock) as mock_post:
+        async with service.admission.admit(1):
+            results, tier = await service.get_semantic_search_results(
+                "python", profiles
+            )
+
+    mock_post.assert_not_called()
+    assert (results[0]["id"], tier) == ("1", "lexical")
+    assert service.admission.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_spends_no_admission():
+    service = GroqService()
+    service.breaker = CircuitBreaker(failure_threshold=1)
+    service.breaker.record_failure()
+    service.admission = AdmissionController(requests_per_minute=1)
+
+    with pytest.raises(CircuitOpenError):
+        await service._post_chat(service.client, "prompt", 10, Priority(0))
+
+    # The single request of the minute is still available
+    assert service.admission.requests.wait_time(1) == 0
+    assert service.admission.stats() == {"in_flight": 0, "queued": 0, "rejected": 0}
+
+
+@pytest.mark.asyncio
+async def test_calls_past_the_deadline_drop_to_low_priority():
+    service = GroqService()
+    priorities = []
+
+    async def slow_llm(query, profiles, candidates, generation, priority):
+        priorities.append(priority)
+        await asyncio.sleep(0.05)
+        return []
+
+    with patch.object(service, "get_llm_search_results", side_effect=slow_llm):
+        _, tier = await service.get_search_results_within(
+            "python",
+            [{"id": "1", "name": "Dev", "bio": "", "skills": [], "interests": []}],
+            deadline=0.01,
+        )
+
+    assert tier == "lexical"
+    assert priorities[0].value == PRIORITY_LOW
+    await service.close()
@@ -0,0 +1,150 @@
+"""Tests for micro-batching of concurrent LLM searches."""
+
+import asyncio
+import json
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.batching import MicroBatcher
+from app.services.groq_service import GroqService
+
+
+@pytest.mark.asyncio
+async def test_concurrent_submissions_share_a_batch():
+    batches = []
+
+    async def handler(items):
+        batches.append(items)
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher(handler, window=0.01, max_size=3)
+    results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    assert results == [0, 10, 20, 30, 40]
+    # A full batch is handed over at once, the rest when the window closes
+    assert batches == [[0, 1, 2], [3, 4]]
+
+
+@pytest.mark.asyncio
+async def test_batch_failure_reaches_every_caller():
+    async def handler(items):
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(handler, window=0.01, max_size=8)
+    results = await asyncio.gather(
+        batcher.submit(1), batcher.submit(2), return_exceptions=True
+    )
+    assert [str(result) for result in results] == ["boom", "boom"]
+
+
+def _chat_response(answers, **kwargs):
+    """Answer a batched prompt with ``answers``: query -> [(name, score)]."""
+    prompt = kwargs["json"]["messages"][1]["content"]
+    names = re.findall(r"^\s*Name: (.*)$", prompt, re.M)
+    queries = re.findall(r'^\s*Query \d+: "(.*)"$', prompt, re.M)
+    results = [
+        {
+            "query_index": queries.index(query) + 1,
+            "profile_index": names.index(name) + 1,
+            "score": score,
+            "reasoning": f"{name} for {query}",
+        }
+        for query, scored in answers.items()
+        for name, score in scored
+        if query in queries and name in names
+    ]
+    response = MagicMock()
+    response.json.return_value = {
+        "choices": [{"message": {"content": json.dumps({"results": results})}}]
+    }
+    return response
+
+
+def _batching_service() -> GroqService:
+    service = GroqService()
+    service.is_test = False
+    service.batcher = MicroBatcher(service._rank_batch, window=0.01, max_size=8)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_groq_request():
+    service = _batching_service()
+    profiles = [
+        {
+            "id": str(i),
+            "name": name,
+            "bio": "",
+            "skills": [skill],
+            "interests": [],
+        }
+        for i, name, skill in (
+            (1, "ML Engineer", "Python"),
+            (2, "Painter", "Watercolor"),
+            (3, "Guide", "Hiking"),
+        )
+    ]
+    answers = {
+        "python": [("ML Engineer", 90), ("Guide", 20)],
+        "painting": [("Painter", 80)],
+    }
+
+    with patch(
+        "httpx.AsyncClient.post",
+        new_callable=AsyncMock,
+        side_effect=lambda *args, **kwargs: _chat_response(answers, **kwargs),
+    ) as mock_post:
+        (python, _), (painting, _), (hiking, _) = await asyncio.gather(
+            *(
+                service.get_semantic_search_results(query, profiles)
+                for query in ("python", "painting", "hiking")
+            )
+        )
+
+    mock_post.assert_called_once()
+    prompt = mock_post.call_args.kwargs["json"]["messages"][1]["content"]
+    assert prompt.count("Name: ML Engineer") == 1  # Profiles are listed once
+    assert len(re.findall(r'Query \d+: "', prompt)) == 3
+    assert [(r["id"], r["score"]) for r in python] == [("1", 0.9), ("3", 0.2)]
+    assert [(r["id"], r["match_reason"]) for r in painting] == [
+        ("2", "Painter for painting")
+    ]
+    assert hiking == []
+
+
+@pytest.mark.asyncio
+async def test_batched_results_stay_within_each_shortlist():
+    service = _batching_service()
+    profiles = [
+        {
+            "id": str(i),
+            "name": f"Painter {i}",
+            "bio": "Paints landscapes",
+            "skills": ["Watercolor"],
+            "interests": [],
+        }
+        for i in range(20)
+    ]
+    profiles[4] = dict(profiles[4], name="ML Engineer", skills=["Python"])
+    profiles[9] = dict(profiles[9], name="Chef", skills=["Cooking"])
+    # Groq also scores the profiles shortlisted for the other query
+    answers = {
+        "python": [("ML Engineer", 90), ("Chef", 70)],
+        "cooking": [("Chef", 80), ("ML Engineer", 10)],
+    }
+
+    with patch(
+        "httpx.AsyncClient.post",
+        new_callable=AsyncMock,
+        side_effect=lambda *args, **kwargs: _chat_response(answers, **kwargs),
+    ) as mock_post:
+        (python, _), (cooking, _) = await asyncio.gather(
+            service.get_semantic_search_results("python", profiles, candidates=1),
+            service.get_semantic_search_results("cooking", profiles, candidates=1),
+        )
+
+    mock_post.assert_called_once()
+    # Each search keeps only the profiles it shortlisted
+    assert [r["id"] for r in python] == ["4"]
+    assert [r["id"] for r in cooking] == ["9"]
@@ -0,0 +1,40 @@
+"""Tests for the streaming bulk upload parser."""
+
+import pytest
+from app.services.bulk_import import iter_upload_records
+
+
+async def _chunks(data: str, size: int):
+    encoded = data.encode()
+    for start in range(0, len(encoded), size):
+        yield encoded[start : start + size]
+
+
+async def _parse(data: str, size: int = 3):
+    return [record async for record in iter_upload_records(_chunks(data, size))]
+
+
+@pytest.mark.asyncio
+async def test_parses_ndjson_across_chunk_boundaries():
+    records = await _parse('{"a": 1}\n\nnot json\n{"b": "é"}')
+
+    assert records[0] == ({"a": 1}, None)
+    assert records[1][0] is None and records[1][1].startswith("Invalid JSON")
+    assert records[2] == ({"b": "é"}, None)
+
+
+@pytest.mark.asyncio
+async def test_parses_json_array_across_chunk_boundaries():
+    records = await _parse(' [{"a": "x,]"} ,\n {"b": [1, 2]}]')
+
+    assert records == [({"a": "x,]"}, None), ({"b": [1, 2]}, None)]
+    assert await _parse("[ ]") == []
+
+
+@pytest.mark.asyncio
+async def test_malformed_json_array_stops_the_upload():
+    records = await _parse('[{"a": 1} {"b": 2}]')
+
+    assert records[0] == ({"a": 1}, None)
+    assert records[1][0] is None
+    assert len(records) == 2
@@ -0,0 +1,97 @@
+"""Tests for the BM25 lexical index."""
+
+from app.search.lexical import LexicalIndex, stem, tokenize
+from app.services.groq_service import GroqService
+
+
+def _profile(profile_id: str, name: str, bio: str, skills=(), interests=()) -> dict:
+    return {
+        "id": profile_id,
+        "name": name,
+        "bio": bio,
+        "skills": list(skills),
+        "interests": list(interests),
+    }
+
+
+PROFILES = [
+    _profile("1", "Ada", "Writes about databases", ["Python"], ["Chess"]),
+    _profile("2", "Grace", "Python developer", ["Go"], ["Compilers"]),
+    _profile("3", "Linus", "Kernel hacker", ["C", "C++"], ["Python"]),
+    _profile("4", "Alan", "Mathematician", ["Logic"], ["Cryptography"]),
+]
+
+
+def test_tokenize_and_stem():
+    assert tokenize("Building C++ and C# APIs", stemming=False) == [
+        "building",
+        "c++",
+        "and",
+        "c#",
+        "apis",
+    ]
+    assert stem("developers") == "developer"
+    assert stem("learning") == stem("learned") == "learn"
+    assert stem("aws") == "aws"
+
+
+def test_fields_are_weighted():
+    index = LexicalIndex()
+    index.sync(PROFILES)
+
+    ranked = index.search("python")
+
+    # skills > interests > bio
+    assert [position for position, _ in ranked] == [0, 2, 1]
+    assert ranked[0][1] > ranked[1][1] > ranked[2][1]
+    assert index.search("nothing matches") == []
+
+
+def test_limit_and_expansion():
+    index = LexicalIndex()
+    index.sync(PROFILES)
+
+    assert len(index.search("python", limit=2)) == 2
+    # "backend" also searches for related terms such as "database"
+    assert [position for position, _ in index.search("backend")] == [0]
+
+
+def test_sync_is_incremental():
+    index = LexicalIndex()
+    index.sync(PROFILES[:2])
+    indexed = index._postings["skills"]["python"]
+
+    index.sync(PROFILES)
+
+    assert len(index) == 4
+    assert index._postings["skills"]["python"] is indexed
+    assert [position for position, _ in index.search("kernel")] == [2]
+
+    # A list that no longer extends the indexed one is indexed from scratch
+    index.sync(PROFILES[2:])
+    assert len(index) == 2
+    assert [position for position, _ in index.search("kernel")] == [0]
+
+
+def test_fallback_search_uses_index():
+    service = GroqService()
+
+    results = service._fallback_search("python", PROFILES)
+
+    assert [r["id"] for r in results] == ["1", "3", "2"]
+    assert results[0]["score"] == 1.0
+    assert results[0]["match_reason"] == "Skills match: Python"
+    assert "score" not in PROFILES[0]
+
+
+def test_role_in_query_and_bio_is_boosted():
+    index = LexicalIndex()
+    index.sync(
+        [
+            _profile("1", "Sam", "Hobbyist", ["Developer tools"]),
+            _profile("2", "Kim", "Frontend developer"),
+        ]
+    )
+
+    # Without the role bonus the skills match would rank first
+    assert [position for position, _ in index.search("developers")] == [1, 0]
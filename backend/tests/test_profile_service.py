@@ -0,0 +1,189 @@
+"""Tests for the profile service."""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from app.core.etag import make_etag
+from app.main import app
+from app.services.profile_service import ProfileService
+from app.storage.json_store import JSONFileStore
+from pydantic import ValidationError
+
+
+def _profile(profile_id: str, name: str = "Test User") -> dict:
+    return {
+        "id": profile_id,
+        "name": name,
+        "bio": "Test Bio",
+        "skills": ["Python"],
+        "interests": ["AI"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_profiles_loaded_once_and_indexed(tmp_path, monkeypatch):
+    data_file = tmp_path / "profiles.json"
+    data_file.write_text(json.dumps([_profile("a"), _profile("b", "Other")]))
+
+    service = ProfileService(JSONFileStore(data_file))
+    # Reads are served from memory while the files are unchanged
+    monkeypatch.setattr(JSONFileStore, "_read_changes", None)
+
+    profile = await service.get_profile("b")
+    assert profile is not None
+    assert profile["name"] == "Other"
+    assert await service.get_profile("missing") is None
+    assert [p["id"] for p in await service.list_profiles()] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_create_profile_writes_through(tmp_path):
+    data_file = tmp_path / "profiles.json"
+    service = ProfileService(JSONFileStore(data_file))
+
+    await service.create_profile(_profile("a"))
+
+    assert (await service.get_profile("a"))["id"] == "a"
+    reloaded = ProfileService(JSONFileStore(data_file))
+    assert [p["id"] for p in await reloaded.list_profiles()] == ["a"]
+
+
+class _CountingStore(JSONFileStore):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.commits = []
+
+    async def append(self, profiles):
+        self.commits.append(len(profiles))
+        if any(p["name"] == "Fail" for p in profiles):
+            raise OSError("disk full")
+        await super().append(profiles)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_creates_are_group_committed(tmp_path):
+    store = _CountingStore(tmp_path / "profiles.json")
+    service = ProfileService(store)
+
+    await asyncio.gather(*(service.create_profile(_profile(str(i))) for i in range(20)))
+
+    assert sum(store.commits) == 20
+    assert len(store.commits) < 20
+    reloaded = ProfileService(JSONFileStore(tmp_path / "profiles.json"))
+    assert len(await reloaded.list_profiles()) == 20
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_writer_task_stops_once_idle(tmp_path):
+    service = ProfileService(JSONFileStore(tmp_path / "profiles.json"))
+
+    await service.create_profile(_profile("a"))
+    await asyncio.sleep(0)
+
+    # Nothing is left running to be destroyed with the event loop
+    assert service.writer._task.done()
+    await service.create_profile(_profile("b"))
+    assert len(await service.list_profiles()) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_commit_propagates_to_callers(tmp_path):
+    store = _CountingStore(tmp_path / "profiles.json")
+    service = ProfileService(store)
+
+    with pytest.raises(OSError):
+        await service.create_profile(_profile("a", "Fail"))
+    await service.create_profile(_profile("b"))
+
+    assert [p["id"] for p in await service.list_profiles()] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_create_profile_stores_validated_record(tmp_path):
+    service = ProfileService(JSONFileStore(tmp_path / "profiles.json"))
+
+    created = await service.create_profile(_profile("a"))
+
+    stored = await service.get_profile("a")
+    assert stored == created
+    # Timestamps are fixed at write time, not re-generated on every read
+    assert isinstance(stored["created_at"], str)
+    assert (await service.get_profile("a"))["created_at"] == stored["created_at"]
+
+    with pytest.raises(ValidationError):
+        await service.create_profile({"id": "b", "name": "No bio"})
+
+
+@pytest.mark.asyncio
+async def test_responses_are_serialized_once_per_generation(tmp_path):
+    service = ProfileService(JSONFileStore(tmp_path / "profiles.json"))
+    await service.create_profile(_profile("a"))
+
+    body = await service.list_profiles_json()
+    profile_body = await service.get_profile_json("a")
+
+    assert await service.list_profiles_json() is body
+    assert await service.get_profile_json("a") is profile_body
+    assert await service.get_profile_json("missing") is None
+
+    await service.create_profile(_profile("b"))
+
+    refreshed = await service.list_profiles_json()
+    assert [p["id"] for p in json.loads(refreshed.body)] == ["a", "b"]
+    assert refreshed.etag != body.etag
+    # A profile's tag follows its own updated_at, not the store generation
+    unchanged = await service.get_profile_json("a")
+    assert unchanged is not profile_body
+    assert unchanged == profile_body
+
+
+@pytest.mark.asyncio
+async def test_app_shutdown_flushes_pending_writes(tmp_path):
+    service = ProfileService(JSONFileStore(tmp_path / "profiles.json"))
+
+    with patch("app.main.profile_service", service):
+        async with app.router.lifespan_context(app):
+            pending = asyncio.ensure_future(service.create_profile(_profile("a")))
+            await asyncio.sleep(0)
+        assert pending.done()
+
+    reloaded = ProfileService(JSONFileStore(tmp_path / "profiles.json"))
+    assert [p["id"] for p in await reloaded.list_profiles()] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_search_corpus_is_read_once_per_generation(tmp_path):
+    service = ProfileService(JSONFileStore(tmp_path / "profiles.json"))
+    await service.create_profile(_profile("a"))
+
+    corpus = await service.search_corpus()
+    with patch.object(service.store, "list", side_effect=AssertionError):
+        assert await service.search_corpus() is corpus
+
+    await service.create_profile(_profile("b"))
+    assert [p["id"] for p in await service.search_corpus()] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_write_during_serialization_keeps_body_and_tag_together(tmp_path):
+    service = ProfileService(JSONFileStore(tmp_path / "profiles.json"))
+    await service.create_profile(_profile("a"))
+    tag = make_etag("profiles", await service.generation())
+    read = service.store.list
+
+    async def list_during_write():
+        profiles = await read()
+        await service.create_profile(_profile("b"))
+        return profiles
+
+    with patch.object(service.store, "list", side_effect=list_during_write):
+        body = await service.list_profiles_json()
+
+    assert [p["id"] for p in json.loads(body.body)] == ["a"]
+    assert body.etag == tag
+    # The stale body is not served for the new generation
+    refreshed = await service.list_profiles_json()
+    assert [p["id"] for p in json.loads(refreshed.body)] == ["a", "b"]
@@ -0,0 +1,211 @@
+"""Tests for the profile storage backends."""
+
+import asyncio
+import json
+import sqlite3
+
+import pytest
+from app.storage.json_store import JSONFileStore
+from app.storage.sqlite_store import SQLiteStore
+
+
+def _profile(profile_id: str, name: str = "Test User") -> dict:
+    return {
+        "id": profile_id,
+        "name": name,
+        "bio": "Test Bio",
+        "skills": ["Python"],
+        "interests": ["AI"],
+        "github_url": None,
+        "linkedin_url": None,
+        "created_at": "2024-01-01T00:00:00",
+        "updated_at": "2024-01-01T00:00:00",
+    }
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def make_store(request, tmp_path):
+    def factory():
+        if request.param == "json":
+            return JSONFileStore(tmp_path / "profiles.json")
+        return SQLiteStore(tmp_path / "profiles.sqlite3")
+
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_store_round_trip(make_store):
+    store = make_store()
+
+    await store.append([_profile("a"), _profile("b", "Other")])
+
+    assert await store.get("b") == _profile("b", "Other")
+    assert await store.get("missing") is None
+    reloaded = make_store()
+    assert [p["id"] for p in await reloaded.list()] == ["a", "b"]
+    await store.close()
+    await reloaded.close()
+
+
+@pytest.mark.asyncio
+async def test_store_replace_all(make_store):
+    store = make_store()
+    await store.append([_profile("a")])
+
+    await store.replace_all([_profile("c")])
+
+    assert [p["id"] for p in await store.list()] == ["c"]
+    assert [p["id"] for p in await make_store().list()] == ["c"]
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_json_store_appends_to_log(tmp_path):
+    data_file = tmp_path / "profiles.json"
+    store = JSONFileStore(data_file)
+
+    await store.append([_profile("a")])
+    await store.append([_profile("b")])
+
+    # The snapshot is untouched; the records live in the log
+    assert json.loads(data_file.read_text()) == []
+    assert len(store.log_file.read_text().splitlines()) == 2
+
+
+@pytest.mark.asyncio
+async def test_json_store_replay_drops_torn_record(tmp_path):
+    data_file = tmp_path / "profiles.json"
+    store = JSONFileStore(data_file)
+    await store.append([_profile("a")])
+    with open(store.log_file, "a") as f:
+        f.write('{"op": "create", "profile": {"id": "b"')
+
+    reloaded = JSONFileStore(data_file)
+
+    assert [p["id"] for p in await reloaded.list()] == ["a"]
+    assert reloaded.log_file.read_text().endswith("\n")
+
+
+@pytest.mark.asyncio
+async def test_json_store_compaction_folds_log_into_snapshot(tmp_path):
+    data_file = tmp_path / "profiles.json"
+    store = JSONFileStore(data_file, compact_threshold=1)
+
+    await store.append([_profile("a")])
+    await store._compaction
+
+    assert [p["id"] for p in json.loads(data_file.read_text())] == ["a"]
+    assert store.log_file.read_text() == ""
+    assert [p["id"] for p in await JSONFileStore(data_file).list()] == ["a"]
+
+
+@pytest.mark.asyncio
+async def test_json_store_sees_writes_from_other_process(tmp_path):
+    data_file = tmp_path / "profiles.json"
+    # Two stores on the same files stand in for two uvicorn workers
+    worker_a = JSONFileStore(data_file)
+    worker_b = JSONFileStore(data_file)
+
+    await worker_a.append([_profile("a")])
+    assert [p["id"] for p in await worker_b.list()] == ["a"]
+
+    await worker_b.append([_profile("b")])
+    await worker_b.compact()
+    await worker_a.append([_profile("c")])
+
+    assert [p["id"] for p in await worker_b.list()] == ["a", "b", "c"]
+    assert [p["id"] for p in await worker_a.list()] == ["a", "b", "c"]
+    assert [p["id"] for p in await JSONFileStore(data_file).list()] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_json_store_compaction_keeps_concurrent_appends(tmp_path):
+    data_file = tmp_path / "profiles.json"
+    worker_a = JSONFileStore(data_file)
+    worker_b = JSONFileStore(data_file)
+    await worker_a.append([_profile("a")])
+
+    compaction = asyncio.ensure_future(worker_a.compact())
+    await worker_b.append([_profile("b")])
+    await compaction
+
+    assert [p["id"] for p in json.loads(data_file.read_text())][:1] == ["a"]
+    assert [p["id"] for p in await JSONFileStore(data_file).list()] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_json_stores_in_one_process_use_separate_temp_files(tmp_path):
+    data_file = tmp_path / "profiles.json"
+    worker_a = JSONFileStore(data_file)
+    worker_b = JSONFileStore(data_file)
+    await worker_a.append([_profile("a")])
+    await worker_b.append([_profile("b")])
+
+    # Both snapshots are written at once, before either is swapped in
+    await asyncio.gather(worker_a.compact(), worker_b.compact())
+
+    assert [p["id"] for p in await JSONFileStore(data_file).list()] == ["a", "b"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_store_pages_with_cursor(make_store):
+    store = make_store()
+    await store.append([_profile(str(i)) for i in range(5)])
+
+    first, cursor = await store.page(0, 2)
+    second, cursor = await store.page(cursor, 2)
+    third, cursor = await store.page(cursor, 2)
+
+    assert [p["id"] for p in first + second + third] == ["0", "1", "2", "3", "4"]
+    assert cursor is None
+    assert [p["id"] async for p in store.iter(batch_size=2)] == [
+        str(i) for i in range(5)
+    ]
+    # No cursor to an empty page when the last page is exactly full
+    last, cursor = await store.page(2, 3)
+    assert ([p["id"] for p in last], cursor) == (["2", "3", "4"], None)
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_store_generation_changes_on_write(make_store):
+    store = make_store()
+    other = make_store()
+    initial = await store.generation()
+
+    await store.append([_profile("a")])
+
+    generation = await store.generation()
+    assert generation != initial
+    assert await store.generation() == generation
+    # Another process sharing the storage agrees on the generation
+    assert await other.generation() == generation
+    await store.close()
+    await other.close()
+
+
+@pytest.mark.asyncio
+async def test_stores_complete_missing_timestamps(tmp_path):
+    legacy = {"id": "a", "name": "Seed", "bio": "Bio", "skills": [], "interests": []}
+    (tmp_path / "profiles.json").write_text(json.dumps([legacy]))
+    first = JSONFileStore(tmp_path / "profiles.json")
+    second = JSONFileStore(tmp_path / "profiles.json")
+
+    profile = await first.get("a")
+    assert profile["created_at"] == profile["updated_at"]
+    # Every process fills in the same value
+    assert await second.get("a") == profile
+
+    store = SQLiteStore(tmp_path / "profiles.sqlite3")
+    generation = await store.generation()
+    conn = sqlite3.connect(tmp_path / "profiles.sqlite3")
+    with conn:
+        conn.execute("INSERT INTO profiles (id, name, bio) VALUES ('b', 'Seed', 'Bio')")
+    conn.close()
+    await store.close()
+
+    reopened = SQLiteStore(tmp_path / "profiles.sqlite3")
+    assert (await reopened.get("b"))["updated_at"] is not None
+    assert await reopened.generation() != generation
+    await reopened.close()
@@ -1,4 +1,8 @@
+import gzip
+import json
+
 import pytest
+from app import export
 from app.main import app
 from app.models.profile import ProfileCreate
 from httpx import AsyncClient
@@ -41,3 +45,128 @@ async def test_get_profile():
         response = await ac.get(f"/api/v1/profiles/{created_profile['id']}")
         assert response.status_code == 200
         assert response.json()["id"] == created_profile["id"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_returns_not_modified():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        profile_data = {"name": "Cached User", "bio": "Test Bio"}
+        created = (await ac.post("/api/v1/profiles/", json=profile_data)).json()
+
+        listing = await ac.get("/api/v1/profiles/")
+        etag = listing.headers["ETag"]
+        repeat = await ac.get("/api/v1/profiles/", headers={"If-None-Match": etag})
+        assert repeat.status_code == 304
+        assert repeat.content == b""
+        assert repeat.headers["ETag"] == etag
+
+        page = await ac.get("/api/v1/profiles/", params={"limit": 1})
+        assert page.headers["ETag"] != etag
+        repeat = await ac.get(
+            "/api/v1/profiles/",
+            params={"limit": 1},
+            headers={"If-None-Match": f'W/{page.headers["ETag"]}'},
+        )
+        assert repeat.status_code == 304
+
+        profile_url = f"/api/v1/profiles/{created['id']}"
+        profile_etag = (await ac.get(profile_url)).headers["ETag"]
+
+        # A write changes the list's tag but not an untouched profile's
+        await ac.post("/api/v1/profiles/", json=profile_data)
+        changed = await ac.get("/api/v1/profiles/", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        repeat = await ac.get(profile_url, headers={"If-None-Match": profile_etag})
+        assert repeat.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_list_profiles_paginates_with_cursor():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        all_ids = [p["id"] for p in (await ac.get("/api/v1/profiles/")).json()]
+
+        first = await ac.get("/api/v1/profiles/", params={"limit": 2})
+        assert first.status_code == 200
+        assert [p["id"] for p in first.json()] == all_ids[:2]
+
+        cursor = first.headers["X-Next-Cursor"]
+        second = await ac.get(
+            "/api/v1/profiles/", params={"limit": 2, "cursor": cursor}
+        )
+        assert [p["id"] for p in second.json()] == all_ids[2:4]
+
+        for cursor in ("abc", "²", "١"):
+            invalid = await ac.get("/api/v1/profiles/", params={"cursor": cursor})
+            assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_profiles_streams_ndjson():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        all_ids = [p["id"] for p in (await ac.get("/api/v1/profiles/")).json()]
+
+        response = await ac.get(
+            "/api/v1/profiles/", headers={"Accept": "application/x-ndjson"}
+        )
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = response.text.splitlines()
+        assert [json.loads(line)["id"] for line in lines] == all_ids
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_ndjson_reports_per_record_errors():
+    records = [
+        json.dumps({"name": "Bulk One", "bio": "First", "skills": ["Go"]}),
+        json.dumps({"name": "Missing bio"}),
+        "not json",
+        json.dumps({"name": "Bulk Two", "bio": "Second"}),
+    ]
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/v1/profiles/bulk",
+            content="\n".join(records),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["created"] == 2
+        assert result["failed"] == 2
+        assert [e["index"] for e in result["errors"]] == [1, 2]
+        assert "bio" in result["errors"][0]["error"]
+
+        names = [p["name"] for p in (await ac.get("/api/v1/profiles/")).json()]
+        assert names[-2:] == ["Bulk One", "Bulk Two"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_json_array():
+    records = [{"name": f"Array {i}", "bio": "Imported"} for i in range(3)]
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/api/v1/profiles/bulk", json=records)
+
+        assert response.json() == {"created": 3, "failed": 0, "errors": []}
+
+
+@pytest.mark.asyncio
+async def test_export_streams_ndjson_and_gzip():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        all_ids = [p["id"] for p in (await ac.get("/api/v1/profiles/")).json()]
+
+        plain = await ac.get("/api/v1/profiles/export")
+        compressed = await ac.get("/api/v1/profiles/export", params={"gzip": True})
+
+        assert [json.loads(line)["id"] for line in plain.text.splitlines()] == all_ids
+        assert compressed.headers["content-type"] == "application/gzip"
+        assert gzip.decompress(compressed.content) == plain.content
+
+
+def test_export_cli_writes_file(tmp_path):
+    output = tmp_path / "profiles.ndjson.gz"
+
+    export.main(["-o", str(output), "--gzip"])
+
+    lines = gzip.decompress(output.read_bytes()).decode().splitlines()
+    assert all("id" in json.loads(line) for line in lines)
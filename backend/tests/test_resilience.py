@@ -0,0 +1,98 @@
+"""Tests for the circuit breaker and adaptive timeouts around Groq."""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from app.core.resilience import AdaptiveTimeout, CircuitBreaker
+from app.services.groq_service import GroqService
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_probes_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_success()  # Successes reset the consecutive count
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()  # One probe at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.release()  # An abandoned probe frees its slot
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_timeout_follows_latency_percentile():
+    timeout = AdaptiveTimeout(
+        minimum=0.5, maximum=30, percentile=90, multiplier=2, window=10, min_samples=10
+    )
+    assert timeout.value == 30  # Not enough samples yet
+
+    for latency in [1.0] * 9 + [2.0]:
+        timeout.observe(latency)
+    assert timeout.value == 2.0
+
+    # Only the latest window counts
+    for _ in range(10):
+        timeout.observe(0.01)
+    assert timeout.value == 0.5
+    timeout.observe(100)
+    assert timeout.value == 0.5  # One outlier in ten is above the 90th percentile
+    timeout.observe(100)
+    assert timeout.value == 30
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_to_local_search():
+    service = GroqService()
+    service.is_test = False
+    service.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    profiles = [
+        {
+            "id": "1",
+            "name": "AI Developer",
+            "bio": "Expert in machine learning",
+            "skills": ["Python"],
+            "interests": [],
+        }
+    ]
+
+    with patch(
+        "httpx.AsyncClient.post",
+        new_callable=AsyncMock,
+        side_effect=httpx.ReadTimeout("slow"),
+    ) as mock_post:
+        for _ in range(4):
+            results, tier = await service.get_semantic_search_results(
+                "python", profiles
+            )
+            assert (results[0]["id"], tier) == ("1", "lexical")
+
+    # Two timeouts opened the circuit; later searches did not call Groq
+    assert mock_post.call_count == 2
+    assert service.breaker.state == CircuitBreaker.OPEN
+    assert mock_post.call_args.kwargs["timeout"].read == service.read_timeout.value
@@ -1,3 +1,6 @@
+import json
+from unittest.mock import AsyncMock, patch
+
 import pytest
 from app.main import app
 from fastapi.testclient import TestClient
@@ -23,6 +26,88 @@ async def test_search_profiles():
         assert "choices" in data
 
 
+@pytest.mark.asyncio
+async def test_search_conditional_get():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.post("/api/v1/profiles/", json={"name": "Dev", "bio": "Python"})
+        with patch(
+            "app.services.groq_service.GroqService.get_llm_search_results",
+            new_callable=AsyncMock,
+            return_value=[],
+        ):
+            response = await ac.get("/api/v1/search/?query=Python developer")
+            assert response.status_code == 200
+            etag = response.headers["ETag"]
+            # LLM rankings are only revalidated per generation
+            assert etag.startswith("W/")
+
+            # Tags are keyed on the normalized query
+            repeat = await ac.get(
+                "/api/v1/search/?query=python   Developer",
+                headers={"If-None-Match": etag},
+            )
+            assert repeat.status_code == 304
+
+            await ac.post("/api/v1/profiles/", json={"name": "New", "bio": "Bio"})
+            changed = await ac.get(
+                "/api/v1/search/?query=Python developer",
+                headers={"If-None-Match": etag},
+            )
+            assert changed.status_code == 200
+            assert changed.headers["ETag"] != etag
+
+        # Without Groq the fallback ranking is not given a validator
+        fallback = await ac.get("/api/v1/search/?query=Python developer")
+        assert fallback.json()["tier"] == "lexical"
+        assert "ETag" not in fallback.headers
+
+
+def _events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: ") :], json.loads(data[len("data: ") :])))
+    return events
+
+
+@pytest.mark.asyncio
+async def test_search_stream_sends_lexical_then_llm_results():
+    profiles = [
+        {
+            "id": "1",
+            "name": "AI Developer",
+            "bio": "Expert in machine learning",
+            "skills": ["Python", "ML"],
+            "interests": [],
+        }
+    ]
+    refined = [dict(profiles[0], score=0.95, match_reason="Builds ML models")]
+    with (
+        patch(
+            "app.services.profile_service.ProfileService.search_corpus",
+            new_callable=AsyncMock,
+            return_value=profiles,
+        ),
+        patch(
+            "app.services.groq_service.GroqService.get_llm_search_results",
+            new_callable=AsyncMock,
+            side_effect=[refined, None],
+        ),
+    ):
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            response = await ac.get("/api/v1/search/stream?query=machine learning")
+            unavailable = await ac.get("/api/v1/search/stream?query=machine learning")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert [event for event, _ in events] == ["lexical", "llm", "done"]
+    assert events[0][1]["matches"][0]["id"] == "1"
+    assert events[1][1] == {"matches": refined}
+    # Without Groq, the lexical results are final
+    assert [event for event, _ in _events(unavailable.text)] == ["lexical", "done"]
+
+
 client = TestClient(app)
 
 
@@ -0,0 +1,132 @@
+"""Tests for the LLM search result cache."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.main import app
+from app.services.groq_service import GroqService
+from app.services.search_cache import SearchCache
+from httpx import AsyncClient
+
+RESULTS = [{"id": "1", "name": "AI Developer", "score": 0.9, "match_reason": "ML"}]
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_is_bounded_lru():
+    cache = SearchCache(max_entries=2)
+    for query in ("a", "b"):
+        await cache.put(cache.key(query, 1), 1, RESULTS)
+
+    assert await cache.get(cache.key("a", 1)) == RESULTS  # Now most recent
+    await cache.put(cache.key("c", 1), 1, RESULTS)
+
+    assert await cache.get(cache.key("b", 1)) is None
+    assert await cache.get(cache.key("  A ", 1)) == RESULTS  # Normalized
+    assert await cache.get(cache.key("a", 2)) is None  # Other generation
+    assert cache.stats() == {
+        "memory_hits": 2,
+        "disk_hits": 0,
+        "misses": 2,
+        "hit_rate": 0.5,
+        "memory_entries": 2,
+        "disk_entries": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_miss():
+    cache = SearchCache(ttl=-1)
+    await cache.put(cache.key("a", 1), 1, RESULTS)
+
+    assert await cache.get(cache.key("a", 1)) is None
+    assert cache.stats()["memory_entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_survives_restart(tmp_path):
+    db_file = tmp_path / "search_cache.sqlite3"
+    cache = SearchCache(db_file=db_file)
+    await cache.put(cache.key("a", 1), 1, RESULTS)
+
+    restarted = SearchCache(db_file=db_file)
+    assert await restarted.get(cache.key("a", 1)) == RESULTS
+    assert await restarted.get(cache.key("a", 1)) == RESULTS
+    assert restarted.stats()["disk_hits"] == 1
+    assert restarted.stats()["memory_hits"] == 1
+
+    # Writing under a new generation drops the entries of older ones
+    await restarted.put(restarted.key("b", 2), 2, RESULTS)
+    assert restarted.stats()["disk_entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_evicts_oldest_entries_past_its_cap(tmp_path):
+    db_file = tmp_path / "search_cache.sqlite3"
+    cache = SearchCache(db_file=db_file, disk_entries=10)
+    for i in range(25):
+        await cache.put(cache.key(str(i), 1), 1, RESULTS)
+    # Replacing an entry does not count as a new one
+    await cache.put(cache.key("24", 1), 1, RESULTS)
+
+    restarted = SearchCache(db_file=db_file, disk_entries=10)
+    assert restarted.stats()["disk_entries"] <= 10
+    assert cache.stats()["disk_entries"] == restarted.stats()["disk_entries"]
+    assert await restarted.get(restarted.key("24", 1)) == RESULTS
+    assert await restarted.get(restarted.key("0", 1)) is None
+
+
+@pytest.mark.asyncio
+async def test_repeated_llm_search_is_served_from_cache(tmp_path):
+    service = GroqService()
+    service.is_test = False
+    service.cache = SearchCache(db_file=tmp_path / "search_cache.sqlite3")
+    profiles = [
+        {
+            "id": "1",
+            "name": "AI Developer",
+            "bio": "Expert in machine learning",
+            "skills": ["Python", "ML"],
+            "interests": [],
+        }
+    ]
+    response = MagicMock()
+    response.json.return_value = {
+        "choices": [
+            {"message": {"content": '{"results": [{"profile_index": 1, "score": 90}]}'}}
+        ]
+    }
+
+    with patch(
+        "httpx.AsyncClient.post", new_callable=AsyncMock, return_value=response
+    ) as mock_post:
+        first, tier = await service.get_semantic_search_results(
+            "Machine learning", profiles, generation=7
+        )
+        second, _ = await service.get_semantic_search_results(
+            "machine  learning", profiles, generation=7
+        )
+        await service.get_semantic_search_results(
+            "machine learning", profiles, generation=8
+        )
+
+    assert tier == "llm"
+    assert first == second
+    assert first[0]["id"] == "1"
+    assert mock_post.call_count == 2
+    assert service.cache.stats()["memory_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_endpoint():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/api/v1/search/cache/stats")
+
+    assert response.status_code == 200
+    assert set(response.json()) == {
+        "memory_hits",
+        "disk_hits",
+        "misses",
+        "hit_rate",
+        "memory_entries",
+        "disk_entries",
+    }
@@ -1,11 +1,14 @@
 """Test module for semantic search functionality."""
 
+import asyncio
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from app.core.config import settings
 from app.main import app
 from app.models.profile import Profile
+from app.search.hybrid import reciprocal_rank_fusion
 from app.services.groq_service import GroqService
 from httpx import AsyncClient
 
@@ -45,7 +48,7 @@ async def test_search_endpoint_returns_matches():
 
     # Mock the profile service to return test profiles
     with patch(
-        "app.services.profile_service.ProfileService.list_profiles",
+        "app.services.profile_service.ProfileService.search_corpus",
         new_callable=AsyncMock,
     ) as mock_list_profiles:
         # Set up the mock to return our test profiles
@@ -59,17 +62,20 @@ async def test_search_endpoint_returns_matches():
             new_callable=AsyncMock,
         ) as mock_search:
             # Set up the mock to return expected search results
-            mock_search.return_value = [
-                {
-                    "id": "1",
-                    "name": "AI Developer",
-                    "bio": "Expert in machine learning",
-                    "skills": ["Python", "ML", "AI"],
-                    "interests": ["Deep Learning", "NLP"],
-                    "score": 95,
-                    "match_reason": "Strong match on AI skills and interests",
-                }
-            ]
+            mock_search.return_value = (
+                [
+                    {
+                        "id": "1",
+                        "name": "AI Developer",
+                        "bio": "Expert in machine learning",
+                        "skills": ["Python", "ML", "AI"],
+                        "interests": ["Deep Learning", "NLP"],
+                        "score": 95,
+                        "match_reason": "Strong match on AI skills and interests",
+                    }
+                ],
+                "llm",
+            )
 
             # Test the search endpoint
             async with AsyncClient(app=app, base_url="http://test") as ac:
@@ -112,7 +118,7 @@ async def test_groq_service_fallback():
     # Mock the httpx client to raise an exception
     with patch("httpx.AsyncClient.post", side_effect=Exception("API Error")):
         # Call the method with a query that should match the first profile
-        results = await service.get_semantic_search_results(
+        results, tier = await service.get_semantic_search_results(
             "machine learning", test_profiles
         )
 
@@ -120,9 +126,203 @@ async def test_groq_service_fallback():
         assert len(results) > 0
         assert results[0]["id"] == "1"  # The AI Developer should match
         assert "score" in results[0]
+        assert tier == "lexical"
         assert results[0]["match_reason"] == "Text match"
 
 
+def test_reciprocal_rank_fusion():
+    """Test that positions ranked well by several rankings come first."""
+    lexical = [(3, 12.0), (1, 9.5), (7, 2.0)]
+    vector = [(1, 0.9), (5, 0.8), (3, 0.4)]
+
+    assert reciprocal_rank_fusion([lexical, vector], limit=3) == [1, 3, 5]
+    assert reciprocal_rank_fusion([lexical], limit=10) == [3, 1, 7]
+    assert reciprocal_rank_fusion([], limit=3) == []
+
+
+def _chat_response(results):
+    response = MagicMock()
+    response.json.return_value = {
+        "choices": [{"message": {"content": json.dumps({"results": results})}}]
+    }
+    return response
+
+
+@pytest.mark.asyncio
+async def test_llm_reranks_local_candidates_only():
+    """Test that only the locally retrieved candidates are sent to Groq."""
+    service = GroqService()
+    service.is_test = False
+    profiles = [
+        {
+            "id": str(i),
+            "name": f"Painter {i}",
+            "bio": "Paints landscapes",
+            "skills": ["Watercolor"],
+            "interests": ["Hiking"],
+        }
+        for i in range(20)
+    ]
+    profiles[13] = dict(profiles[13], name="ML Engineer", skills=["Python", "ML"])
+
+    response = _chat_response([{"profile_index": 1, "score": 90, "reasoning": "ML"}])
+    with patch(
+        "httpx.AsyncClient.post", new_callable=AsyncMock, return_value=response
+    ) as mock_post:
+        results, _ = await service.get_semantic_search_results(
+            "python", profiles, candidates=5
+        )
+
+    prompt = mock_post.call_args.kwargs["json"]["messages"][1]["content"]
+    assert "Profile 1:\nName: ML Engineer" in prompt
+    assert "Profile 2:" not in prompt  # Only profile 13 matches "python"
+    assert [(r["id"], r["score"]) for r in results] == [("13", 0.9)]
+
+
+@pytest.mark.asyncio
+async def test_llm_scores_chunks_concurrently():
+    """Test that a shortlist over the token budget is split across prompts."""
+    service = GroqService()
+    service.is_test = False
+    profiles = [
+        {
+            "id": str(i),
+            "name": f"Developer {i}",
+            "bio": "Writes Python services",
+            "skills": ["Python"],
+            "interests": [],
+        }
+        for i in range(6)
+    ]
+    # Each profile prompt is about 20 tokens, so chunks hold two profiles
+    chunks = GroqService._chunk_profiles(profiles, budget=45)
+    assert [len(chunk) for chunk in chunks] == [2, 2, 2]
+
+    scores = iter([30, 70, 50])
+    with (
+        patch(
+            "httpx.AsyncClient.post",
+            new_callable=AsyncMock,
+            side_effect=lambda *args, **kwargs: _chat_response(
+                [{"profile_index": 2, "score": next(scores), "reasoning": "Python"}]
+            ),
+        ) as mock_post,
+        patch("app.services.groq_service.settings.LLM_CHUNK_TOKENS", 45),
+    ):
+        results, _ = await service.get_semantic_search_results(
+            "python", profiles, candidates=6
+        )
+
+    assert mock_post.call_count == 3
+    # The second profile of each chunk, merged into one ranking by score
+    assert [r["score"] for r in results] == [0.7, 0.5, 0.3]
+    assert {r["id"] for r in results} == {chunk[1]["id"] for chunk in chunks}
+
+
+@pytest.mark.asyncio
+async def test_groq_client_is_pooled_for_the_app_lifetime():
+    """Test that Groq requests share one client opened by the lifespan."""
+    service = GroqService()
+    with patch("app.routers.search.groq_service", service):
+        async with app.router.lifespan_context(app):
+            client = service.client
+            assert not client.is_closed
+            assert service.client is client
+            assert client.timeout.connect == settings.GROQ_CONNECT_TIMEOUT_SECONDS
+            assert client.timeout.read == settings.GROQ_READ_TIMEOUT_SECONDS
+
+    assert client.is_closed
+    assert service._client is None
+
+
+@pytest.mark.asyncio
+async def test_deadline_returns_the_best_tier_available():
+    """Test that a slow LLM loses the race against lexical search."""
+    service = GroqService()
+    profiles = [
+        {
+            "id": "1",
+            "name": "AI Developer",
+            "bio": "Expert in machine learning",
+            "skills": ["Python"],
+            "interests": [],
+        }
+    ]
+    refined = [dict(profiles[0], score=0.9, match_reason="ML")]
+    finished = asyncio.Event()
+
+    async def slow_llm(*args):
+        await asyncio.sleep(0.05)
+        finished.set()
+        return refined
+
+    with patch.object(service, "get_llm_search_results", side_effect=slow_llm):
+        matches, tier = await service.get_search_results_within(
+            "python", profiles, deadline=0.01
+        )
+        assert tier == "lexical"
+        assert matches[0]["id"] == "1"
+        # The late LLM call finishes in the background
+        await asyncio.wait_for(finished.wait(), 1)
+
+        matches, tier = await service.get_search_results_within(
+            "python", profiles, deadline=1
+        )
+        assert (matches, tier) == (refined, "llm")
+
+
+@pytest.mark.asyncio
+async def test_search_deadline_reports_tier():
+    """Test that deadline-bound searches say which tier answered."""
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.post(
+            "/api/v1/profiles/",
+            json={
+                "name": "AI Developer",
+                "bio": "Expert in machine learning",
+                "skills": ["Python"],
+                "interests": [],
+            },
+        )
+        response = await ac.post(
+            "/api/v1/search/", json={"query": "python", "deadline_ms": 500}
+        )
+        assert response.status_code == 200
+        assert response.json()["tier"] == "lexical"
+
+        # Fallback results are not given a validator
+        response = await ac.get("/api/v1/search/?query=python&deadline_ms=500")
+        assert response.json()["tier"] == "lexical"
+        assert "ETag" not in response.headers
+
+        # Without a deadline too, the tier says the LLM ranking fell back
+        response = await ac.post("/api/v1/search/", json={"query": "python"})
+        assert response.json()["tier"] == "lexical"
+        response = await ac.get("/api/v1/search/?query=python")
+        assert response.json()["tier"] == "lexical"
+        assert "ETag" not in response.headers
+
+        # Local modes are the ranking asked for
+        response = await ac.get("/api/v1/search/?query=python&mode=lexical")
+        assert response.json()["tier"] == "lexical"
+        assert "ETag" in response.headers
+
+        response = await ac.get("/api/v1/search/?query=python&deadline_ms=0")
+        assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_search_candidates_validation():
+    """Test that out of range candidate counts are rejected."""
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/api/v1/search/?query=python&candidates=0")
+        assert response.status_code == 422
+        response = await ac.post(
+            "/api/v1/search/", json={"query": "python", "candidates": "many"}
+        )
+        assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_health_endpoint():
     """Test that the health endpoint returns healthy status."""
@@ -0,0 +1,94 @@
+"""Tests for coalescing of concurrent identical searches."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.core.singleflight import SingleFlight
+from app.main import app
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+
+    async def work(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    results = await asyncio.gather(
+        *(flight.run(key, lambda key=key: work(key)) for key in "aaab")
+    )
+
+    assert results == ["A", "A", "A", "B"]
+    assert calls == ["a", "b"]
+    assert len(flight) == 0
+    # Finished calls are not reused
+    assert await flight.run("a", lambda: work("a")) == "A"
+    assert calls == ["a", "b", "a"]
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_cancellation_is_not():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise ValueError("boom")
+
+    first = asyncio.ensure_future(flight.run("k", fail))
+    second = asyncio.ensure_future(flight.run("k", fail))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    with pytest.raises(ValueError):
+        await second
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_identical_searches_read_profiles_once():
+    profiles = [
+        {
+            "id": "1",
+            "name": "AI Developer",
+            "bio": "Expert in machine learning",
+            "skills": ["Python"],
+            "interests": [],
+        }
+    ]
+
+    async def slow_list(generation=None):
+        await asyncio.sleep(0.05)
+        return profiles
+
+    with (
+        patch(
+            "app.services.profile_service.ProfileService.search_corpus",
+            new_callable=AsyncMock,
+            side_effect=slow_list,
+        ) as mock_list,
+        patch(
+            "app.services.groq_service.GroqService.get_semantic_search_results",
+            new_callable=AsyncMock,
+            return_value=([dict(profiles[0], score=0.9, match_reason="ML")], "llm"),
+        ) as mock_search,
+    ):
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            responses = await asyncio.gather(
+                *(
+                    ac.post("/api/v1/search/", json={"query": query})
+                    for query in ["machine learning", "Machine  Learning"] * 3
+                ),
+                ac.post("/api/v1/search/", json={"query": "python"}),
+            )
+
+    assert all(response.status_code == 200 for response in responses)
+    assert responses[0].json() == responses[1].json()
+    assert mock_list.call_count == 2
+    assert mock_search.call_count == 2
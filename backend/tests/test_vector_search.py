@@ -0,0 +1,187 @@
+"""Tests for the local vector search."""
+
+import numpy as np
+import pytest
+from app.main import app
+from app.search.ann import IVFIndex
+from app.search.quantization import create_vector_storage
+from app.search.vector import VectorIndex, _SparseRows, truncated_svd
+from httpx import AsyncClient
+
+
+def _sparse(dense: np.ndarray) -> _SparseRows:
+    rows, columns = np.nonzero(dense)
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(dense)))])
+    return _SparseRows(
+        indptr, columns, dense[rows, columns].astype(np.float32), dense.shape[1]
+    )
+
+
+def test_sparse_products_match_dense():
+    rng = np.random.default_rng(0)
+    dense = (rng.random((40, 25)) < 0.2) * rng.random((40, 25))
+    dense[3] = 0  # Empty rows and columns must survive segment sums
+    dense[:, 7] = 0
+    matrix = _sparse(dense)
+    weights = rng.random((25, 4)).astype(np.float32)
+    basis = rng.random((40, 3)).astype(np.float32)
+
+    assert np.allclose(matrix.dot(weights, chunk=5), dense @ weights, atol=1e-5)
+    assert np.allclose(matrix.transpose().dot(basis), dense.T @ basis, atol=1e-5)
+
+
+def test_truncated_svd_finds_dominant_subspace():
+    rng = np.random.default_rng(1)
+    dense = rng.random((60, 3)) @ rng.random((3, 30))
+
+    components = truncated_svd(_sparse(dense), rank=3)
+
+    expected = np.linalg.svd(dense, full_matrices=False)[2][:3]
+    # Same subspace, up to rotation and sign
+    assert np.allclose(np.abs(components @ expected.T).sum(axis=0), 1.0, atol=1e-3)
+
+
+def _profile(profile_id: str, bio: str, skills=()) -> dict:
+    return {
+        "id": profile_id,
+        "name": f"User {profile_id}",
+        "bio": bio,
+        "skills": list(skills),
+        "interests": [],
+    }
+
+
+PROFILES = [
+    _profile("1", "Ships containers", ["Docker", "Kubernetes"]),
+    _profile("2", "Runs clusters", ["Docker", "Kubernetes", "Helm"]),
+    _profile("3", "Orchestrates services", ["Kubernetes"]),
+    _profile("4", "Paints landscapes", ["Watercolor", "Oil"]),
+    _profile("5", "Paints portraits", ["Oil", "Charcoal"]),
+]
+
+
+def test_related_terms_match_without_shared_keywords():
+    index = VectorIndex(dimensions=2)
+    index.sync(PROFILES)
+
+    ranked = dict(index.search("docker"))
+
+    # Profile 3 never mentions Docker, but its skills co-occur with it
+    assert ranked[2] > 0.5
+    assert 3 not in ranked and 4 not in ranked
+    assert index.vectors.flags["C_CONTIGUOUS"]
+    assert np.allclose(np.linalg.norm(index.vectors, axis=1), 1.0, atol=1e-5)
+
+
+def test_sync_adds_incrementally_and_refits_on_growth():
+    index = VectorIndex(dimensions=2, refit_growth=2.0)
+    index.sync(PROFILES[:3])
+    model = index._model
+
+    index.sync(PROFILES[:5])
+    assert index._model is model
+    assert len(index) == 5
+
+    index.sync([*PROFILES, _profile("6", "Paints murals", ["Oil"])])
+    assert index._model is not model
+    assert len(index) == 6
+
+    index.sync(PROFILES[3:])
+    assert len(index) == 2
+
+
+def test_ivf_probe_finds_nearest_neighbours():
+    rng = np.random.default_rng(2)
+    centers = rng.standard_normal((8, 16))
+    vectors = centers[rng.integers(0, 8, 400)] + 0.3 * rng.standard_normal((400, 16))
+    vectors = (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(
+        np.float32
+    )
+
+    index = IVFIndex.train(vectors[:300], lists=8, nprobe=2)
+    for position in range(300, 400):
+        index.add(vectors[position], position)
+
+    assert len(index) == 400
+    # Probing every list is exhaustive
+    assert sorted(index.probe(vectors[0], nprobe=8).tolist()) == list(range(400))
+    for query in vectors[::40]:
+        nearest = np.argsort(-(vectors @ query))[:5]
+        assert set(nearest) <= set(index.probe(query).tolist())
+
+
+def test_vector_index_switches_to_ivf():
+    profiles = PROFILES * 4
+    profiles = [dict(p, id=str(i)) for i, p in enumerate(profiles)]
+    index = VectorIndex(dimensions=2, ann_min_size=10, ann_lists=2, nprobe=2)
+
+    index.sync(profiles[:8])
+    assert index._ann is None
+    index.sync(profiles[:12])
+    assert index._ann is not None and len(index._ann) == 12
+    index.sync(profiles[:15])
+    assert len(index._ann) == 15
+
+    assert index.search("docker") == index.search("docker", exact=True)
+
+
+def test_quantized_storage_approximates_dot_products():
+    rng = np.random.default_rng(3)
+    vectors = rng.standard_normal((20000, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = vectors[0]
+    exact = vectors @ query
+
+    for quantization, ratio, tolerance in (("int8", 4, 0.005), ("pq", 10, 0.1)):
+        storage = create_vector_storage(quantization, 32, subspaces=8)
+        storage.train(vectors[:4000])
+        storage.add(vectors)
+
+        assert len(storage) == 20000
+        assert vectors.nbytes / storage.nbytes > ratio * 0.9
+        scores = storage.scores(query)
+        assert np.abs(scores - exact).mean() < tolerance
+        assert np.allclose(storage.scores(query, np.array([5, 9])), scores[[5, 9]])
+        assert np.allclose(storage.reconstruct() @ query, scores, atol=1e-4)
+
+
+def test_quantized_index_reranks_to_exact_scores():
+    exact = VectorIndex(dimensions=2)
+    exact.sync(PROFILES)
+
+    for quantization in ("int8", "pq"):
+        index = VectorIndex(dimensions=2, quantization=quantization, pq_subspaces=2)
+        index.sync(PROFILES)
+        index.sync([*PROFILES, _profile("6", "Paints murals", ["Oil"])])
+
+        assert len(index) == 6
+        ranked = index.search("docker", limit=2)
+        assert [p for p, _ in ranked] == [p for p, _ in exact.search("docker", 2)]
+        assert np.allclose(
+            [s for _, s in ranked], [s for _, s in exact.search("docker", 2)]
+        )
+
+
+@pytest.mark.asyncio
+async def test_search_modes():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.post(
+            "/api/v1/profiles/",
+            json={"name": "Vector Tester", "bio": "Kubernetes operator"},
+        )
+
+        for mode in ("lexical", "vector"):
+            response = await ac.get(
+                "/api/v1/search/", params={"query": "kubernetes", "mode": mode}
+            )
+            assert response.status_code == 200
+            assert response.json()["matches"]
+
+        response = await ac.get(
+            "/api/v1/search/", params={"query": "kubernetes", "mode": "magic"}
+        )
+        assert response.status_code == 422
+        response = await ac.post(
+            "/api/v1/search/", json={"query": "kubernetes", "mode": "magic"}
+        )
+        assert response.status_code == 400
@@ -51,11 +51,19 @@ def run_search():
                 # Debug info
                 st.info(f"Sending search request to backend: {query}")
 
-                # Execute search
-                results = api_client.search_profiles(query)
-
-                # Display results
-                display_search_results(results)
+                # Show keyword matches at once, then replace them with the
+                # LLM ranking when it arrives
+                placeholder = st.empty()
+                for event, data in api_client.stream_search(query):
+                    if event == "error":
+                        st.error(f"Error during search: {data['detail']}")
+                        continue
+                    if event != "done":
+                        results = data
+                    with placeholder.container():
+                        if event == "lexical":
+                            st.caption("Keyword matches, refining with AI...")
+                        display_search_results(results)
 
             except Exception as e:
                 st.error(f"Error during search: {str(e)}")
@@ -1,4 +1,4 @@
-import time
+import json
 
 import httpx
 import streamlit as st
@@ -6,6 +6,10 @@ from httpx import ConnectError, HTTPStatusError, ReadTimeout
 
 from ..config import BACKEND_API_KEY, settings
 
+# Last ETag and body seen per URL, so expired st.cache_data entries can be
+# revalidated instead of downloaded again
+_validated_responses = {}
+
 
 class APIClient:
     def __init__(self):
@@ -54,11 +58,8 @@ class APIClient:
                 "Searching for profiles... This may take a few seconds for semantic search."
             )
 
-            # Add timestamp to avoid caching issues
-            timestamp = int(time.time())
-
-            # Ensure the URL is correctly formed with no trailing slash
-            search_url = f"{_self.base_url.rstrip('/')}/api/v1/search?t={timestamp}"
+            # The trailing slash matches the route, avoiding a redirect
+            search_url = f"{_self.base_url.rstrip('/')}/api/v1/search/"
             st.write(f"Debug - Search URL: {search_url}")
 
             response = httpx.post(
@@ -93,6 +94,28 @@ class APIClient:
             st.error(f"An unexpected error occurred: {str(e)}")
             return {"matches": []}
 
+    def stream_search(self, query):
+        """Search for profiles, yielding (event, data) pairs as results improve.
+
+        The backend first sends local keyword results ("lexical"), then the
+        LLM ranking ("llm") when it is ready, then "done" or "error".
+        """
+        search_url = f"{self.base_url.rstrip('/')}/api/v1/search/stream"
+        with httpx.stream(
+            "GET",
+            search_url,
+            params={"query": query},
+            headers=self.headers,
+            timeout=30.0,
+        ) as response:
+            response.raise_for_status()
+            event = None
+            for line in response.iter_lines():
+                if line.startswith("event: "):
+                    event = line[len("event: ") :]
+                elif line.startswith("data: "):
+                    yield event, json.loads(line[len("data: ") :])
+
     @st.cache_data(ttl=60)  # Cache for 1 minute
     def get_all_profiles(_self):
         """Get all profiles"""
@@ -101,17 +124,30 @@ class APIClient:
             profiles_url = f"{_self.base_url.rstrip('/')}/api/v1/profiles/"
             st.write(f"Debug - Profiles URL: {profiles_url}")
 
+            headers = dict(_self.headers)
+            cached = _validated_responses.get(profiles_url)
+            if cached:
+                headers["If-None-Match"] = cached[0]
+
             response = httpx.get(
                 profiles_url,
-                headers=_self.headers,
+                headers=headers,
                 timeout=_self.timeout,
             )
 
             # Debug response status
             st.write(f"Debug - Response status: {response.status_code}")
 
-            response.raise_for_status()
-            result = response.json()
+            if response.status_code == 304 and cached:
+                result = cached[1]
+            else:
+                response.raise_for_status()
+                result = response.json()
+                if "etag" in response.headers:
+                    _validated_responses[profiles_url] = (
+                        response.headers["etag"],
+                        result,
+                    )
 
             # If the response doesn't have a 'profiles' key, try to adapt the format
             if "profiles" not in result: